@@ -0,0 +1,48 @@
+"""add product search indexes
+
+Revision ID: 5c1e7a9d2b40
+Revises: 8bef0ef481dd
+Create Date: 2026-10-18 10:12:41.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d2b40'
+down_revision: Union[str, None] = '8bef0ef481dd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_products_active_subcategory_price', 'products', ['subcategory_id', 'price'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_products_active_price', 'products', ['price'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_products_active_color', 'products', ['color'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_products_active_featured', 'products', ['id'], unique=False, postgresql_where=sa.text('is_active AND is_featured'))
+    op.create_index('ix_products_active_width', 'products', ['width'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_products_active_height', 'products', ['height'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_products_active_depth', 'products', ['depth'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_product_images_product_order', 'product_images', ['product_id', 'display_order'], unique=False)
+    op.create_index('ix_product_variations_product_id', 'product_variations', ['product_id'], unique=False)
+    op.create_index('ix_product_variations_material_product', 'product_variations', ['material', 'product_id'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_product_variations_size_product', 'product_variations', ['size', 'product_id'], unique=False, postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_variations_size_product', table_name='product_variations', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_product_variations_material_product', table_name='product_variations', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_product_variations_product_id', table_name='product_variations')
+    op.drop_index('ix_product_images_product_order', table_name='product_images')
+    op.drop_index('ix_products_active_depth', table_name='products', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_products_active_height', table_name='products', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_products_active_width', table_name='products', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_products_active_featured', table_name='products', postgresql_where=sa.text('is_active AND is_featured'))
+    op.drop_index('ix_products_active_color', table_name='products', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_products_active_price', table_name='products', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_products_active_subcategory_price', table_name='products', postgresql_where=sa.text('is_active'))
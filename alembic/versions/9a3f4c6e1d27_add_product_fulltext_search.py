@@ -0,0 +1,101 @@
+"""add product fulltext search
+
+Revision ID: 9a3f4c6e1d27
+Revises: 5c1e7a9d2b40
+Create Date: 2026-10-18 12:04:17.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3f4c6e1d27'
+down_revision: Union[str, None] = '5c1e7a9d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('products', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # search_vector: mahsulot nomi (A), subkategoriya/kategoriya nomi (B), tavsif (C)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION products_search_vector_update() RETURNS trigger AS $$
+        DECLARE
+            catalog_names text;
+        BEGIN
+            SELECT concat_ws(' ', s.name, c.name) INTO catalog_names
+            FROM subcategories s
+            JOIN categories c ON c.id = s.category_id
+            WHERE s.id = NEW.subcategory_id;
+
+            NEW.search_vector :=
+                setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(catalog_names, '')), 'B') ||
+                setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER products_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF name, description, subcategory_id ON products
+        FOR EACH ROW EXECUTE FUNCTION products_search_vector_update()
+    """)
+
+    # Kategoriya/subkategoriya nomi o'zgarsa, tegishli mahsulotlar qayta indekslanadi
+    op.execute("""
+        CREATE OR REPLACE FUNCTION subcategories_search_vector_refresh() RETURNS trigger AS $$
+        BEGIN
+            UPDATE products SET name = name WHERE subcategory_id = NEW.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER subcategories_search_vector_trigger
+        AFTER UPDATE OF name, category_id ON subcategories
+        FOR EACH ROW
+        WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.category_id IS DISTINCT FROM NEW.category_id)
+        EXECUTE FUNCTION subcategories_search_vector_refresh()
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION categories_search_vector_refresh() RETURNS trigger AS $$
+        BEGIN
+            UPDATE products SET name = name
+            WHERE subcategory_id IN (SELECT id FROM subcategories WHERE category_id = NEW.id);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER categories_search_vector_trigger
+        AFTER UPDATE OF name ON categories
+        FOR EACH ROW
+        WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION categories_search_vector_refresh()
+    """)
+
+    op.execute('UPDATE products SET name = name')
+
+    op.create_index('ix_products_search_vector', 'products', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_products_name_trgm', 'products', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_name_trgm', table_name='products', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.drop_index('ix_products_search_vector', table_name='products', postgresql_using='gin')
+    op.execute('DROP TRIGGER IF EXISTS categories_search_vector_trigger ON categories')
+    op.execute('DROP FUNCTION IF EXISTS categories_search_vector_refresh()')
+    op.execute('DROP TRIGGER IF EXISTS subcategories_search_vector_trigger ON subcategories')
+    op.execute('DROP FUNCTION IF EXISTS subcategories_search_vector_refresh()')
+    op.execute('DROP TRIGGER IF EXISTS products_search_vector_trigger ON products')
+    op.execute('DROP FUNCTION IF EXISTS products_search_vector_update()')
+    op.drop_column('products', 'search_vector')
@@ -0,0 +1,77 @@
+"""add subcategory product counts
+
+Revision ID: b7d2e84f6a13
+Revises: 9a3f4c6e1d27
+Create Date: 2026-10-18 13:21:55.610487
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e84f6a13'
+down_revision: Union[str, None] = '9a3f4c6e1d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('subcategory_product_counts',
+    sa.Column('subcategory_id', sa.Integer(), nullable=False),
+    sa.Column('product_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['subcategory_id'], ['subcategories.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('subcategory_id')
+    )
+
+    # Faol mahsulot qo'shilsa/o'chirilsa yoki boshqa subkategoriyaga o'tsa son yangilanadi
+    op.execute("""
+        CREATE OR REPLACE FUNCTION subcategory_product_counts_update() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF coalesce(OLD.is_active, false) THEN
+                    UPDATE subcategory_product_counts
+                    SET product_count = product_count - 1
+                    WHERE subcategory_id = OLD.subcategory_id;
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF coalesce(NEW.is_active, false) THEN
+                    INSERT INTO subcategory_product_counts (subcategory_id, product_count)
+                    VALUES (NEW.subcategory_id, 1)
+                    ON CONFLICT (subcategory_id)
+                    DO UPDATE SET product_count = subcategory_product_counts.product_count + 1;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER subcategory_product_counts_insert_delete
+        AFTER INSERT OR DELETE ON products
+        FOR EACH ROW EXECUTE FUNCTION subcategory_product_counts_update()
+    """)
+    op.execute("""
+        CREATE TRIGGER subcategory_product_counts_update
+        AFTER UPDATE OF is_active, subcategory_id ON products
+        FOR EACH ROW
+        WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active OR OLD.subcategory_id IS DISTINCT FROM NEW.subcategory_id)
+        EXECUTE FUNCTION subcategory_product_counts_update()
+    """)
+
+    op.execute("""
+        INSERT INTO subcategory_product_counts (subcategory_id, product_count)
+        SELECT subcategory_id, count(*) FROM products WHERE is_active GROUP BY subcategory_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS subcategory_product_counts_update ON products')
+    op.execute('DROP TRIGGER IF EXISTS subcategory_product_counts_insert_delete ON products')
+    op.execute('DROP FUNCTION IF EXISTS subcategory_product_counts_update()')
+    op.drop_table('subcategory_product_counts')
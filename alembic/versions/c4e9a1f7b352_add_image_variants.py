@@ -0,0 +1,34 @@
+"""add image variants
+
+Revision ID: c4e9a1f7b352
+Revises: b7d2e84f6a13
+Create Date: 2026-10-18 15:02:41.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e9a1f7b352'
+down_revision: Union[str, None] = 'b7d2e84f6a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('categories', sa.Column('image_variants', sa.JSON(), nullable=True))
+    op.add_column('product_images', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('product_images', sa.Column('height', sa.Integer(), nullable=True))
+    op.add_column('product_images', sa.Column('variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('product_images', 'variants')
+    op.drop_column('product_images', 'height')
+    op.drop_column('product_images', 'width')
+    op.drop_column('categories', 'image_variants')
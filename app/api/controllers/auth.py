@@ -3,9 +3,11 @@ from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.models.user import User
 from app.api.repositories.auth import AuthRepository
-from app.api.schemas.user import CreateUser, Login, ResponseUser
+from app.api.schemas.user import CreateUser, Login, ResponseUser, UpdateUserStatus
 from app.core.settings import get_settings
 from app.api.utils.auth import AuthUtils
+from app.api.utils.revocation import get_revocation_list
+from app.core.cache import get_auth_cache
 
 settings = get_settings()
 
@@ -13,9 +15,10 @@ class AuthController:
     def __init__(
             self, 
             session: AsyncSession,
+            read_session: Optional[AsyncSession] = None,
         ):
         self.session = session
-        self.repository = AuthRepository(session)
+        self.repository = AuthRepository(session, read_session)
 
     async def create_user(self, data: CreateUser) -> User:
         try:
@@ -38,6 +41,22 @@ class AuthController:
         return users
     
     
+    async def update_user_status(self, user_id: int, data: UpdateUserStatus) -> User:
+        user = await self.repository.set_user_active(user_id, data.is_active)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User topilmadi",
+            )
+
+        revocation_list = get_revocation_list()
+        if data.is_active:
+            await revocation_list.restore(user.id)
+        else:
+            await revocation_list.revoke(user.id)
+        await get_auth_cache().invalidate("user-status")
+        return user
+
     async def login(self, data: Login, response: Response) -> dict:
         user = await self.repository.get_user_by_email(data.email)
 
@@ -47,7 +66,7 @@ class AuthController:
                 detail="Email yoki parol xato",
             )
 
-        if not user or not AuthUtils.verify_password(plain_password=data.password, hashed_password=user.password):
+        if not user or not await AuthUtils.verify_password(plain_password=data.password, hashed_password=user.password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email yoki parol xato",
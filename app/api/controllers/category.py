@@ -1,9 +1,13 @@
-from typing import List
-from fastapi import Depends, HTTPException, status
+from typing import List, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, UploadFile, status
 
 
 from app.api.repositories.category import CategoryRepository
-from app.api.schemas.product import CategoryListResponse, CategoryResponse, CategoryCreate, CategoryDetailResponse, CategoryUpdate
+from app.api.utils.bulk_import import run_import
+from app.api.utils.fast_json import JSONPage
+from app.api.utils.images import get_image_processor
+from app.api.utils.uploads import StoredUpload, get_upload_store
+from app.api.schemas.product import ImportResponse, CategoryListResponse, CategoryResponse, CategoryCreate, CategoryDetailResponse, CategoryUpdate
 
 
 class CategoryController:
@@ -14,10 +18,16 @@ class CategoryController:
         self.__category_repository = category_repository
 
     
-    async def get_categories(self, page, size):
-        categories = await self.__category_repository.get_categories(page, size)
+    async def get_categories(self, page, size, cursor: Optional[str] = None, view: str = "full"):
+        categories = await self.__category_repository.get_categories(page, size, cursor, view)
         return categories
     
+    async def get_categories_json(self, page: int, size: int, cursor: Optional[str] = None, view: str = "full") -> JSONPage:
+        return await self.__category_repository.get_categories_json(page, size, cursor, view)
+
+    async def get_category_tree(self) -> Tuple[str, bytes]:
+        return await self.__category_repository.get_category_tree()
+    
     async def get_category_by_id(self, category_id: int) -> CategoryResponse:
         category = await self.__category_repository.get_category_by_id(category_id)
         return category
@@ -28,4 +38,41 @@ class CategoryController:
     
     async def update_category(self, category_id: int, category: CategoryUpdate) -> CategoryResponse:
         category = await self.__category_repository.update_category(category_id, category)
-        return category
\ No newline at end of file
+        return category
+
+    async def upload_category_image(self, category_id: int, file: UploadFile) -> CategoryResponse:
+        await self.__category_repository.ensure_category_exists(category_id)
+        upload = await get_upload_store().receive_file(file)
+        try:
+            return await self.__set_category_image(category_id, upload)
+        finally:
+            await get_upload_store().discard(upload)
+
+    async def stream_category_image(self, category_id: int, request: Request) -> CategoryResponse:
+        await self.__category_repository.ensure_category_exists(category_id)
+        upload = await get_upload_store().receive_request(request)
+        try:
+            return await self.__set_category_image(category_id, upload)
+        finally:
+            await get_upload_store().discard(upload)
+
+    async def attach_category_image(self, category_id: int, upload_id: str) -> CategoryResponse:
+        await self.__category_repository.ensure_category_exists(category_id)
+        # Sessiya faqat rasm saqlangandan keyin yopiladi
+        async with get_upload_store().complete(upload_id) as upload:
+            return await self.__set_category_image(category_id, upload)
+
+    async def __set_category_image(self, category_id: int, upload: StoredUpload) -> CategoryResponse:
+        processor = get_image_processor()
+        processed = await processor.process(upload.path, upload.sha256, "category")
+        return await self.__category_repository.set_category_image(
+            category_id, processor.primary_variant(processed)["path"], processed["variants"]
+        )
+
+    async def import_categories(self, rows, update_existing: bool, chunk_size: int) -> ImportResponse:
+        return await run_import(
+            rows,
+            CategoryCreate,
+            lambda chunk: self.__category_repository.bulk_upsert_categories(chunk, update_existing),
+            chunk_size,
+        )
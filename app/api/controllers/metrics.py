@@ -0,0 +1,82 @@
+import logging
+
+from app.api.utils.images import get_image_processor
+from app.api.utils.media import get_media_files
+from app.api.utils.password import get_password_hasher
+from app.api.utils.token import get_token_verifier
+from app.api.utils.total_count import get_total_counter
+from app.api.utils.uploads import get_upload_store
+from app.core.cache import get_auth_cache, get_catalog_cache
+from app.core.compression import get_compressed_body_cache
+from app.core.datebases.postgres import get_pool_stats
+from app.core.datebases.queries import get_query_metrics
+from app.core.datebases.replicas import get_replica_router
+from app.core.metrics import (
+    PrometheusWriter,
+    get_request_metrics,
+    write_component_stats,
+    write_pool_metrics,
+    write_request_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+# stats() arzon bo'lgan komponentlar; autocomplete indeks butun xotirani aylanib chiqadi, shuning uchun yo'q
+COMPONENTS = (
+    ("catalog_cache", get_catalog_cache),
+    ("auth_cache", get_auth_cache),
+    ("total_counter", get_total_counter),
+    ("token_verifier", get_token_verifier),
+    ("password_hasher", get_password_hasher),
+    ("image_processor", get_image_processor),
+    ("uploads", get_upload_store),
+    ("media", get_media_files),
+    ("compression", get_compressed_body_cache),
+)
+
+
+class MetricsController:
+    def render(self) -> str:
+        writer = PrometheusWriter()
+        write_request_metrics(writer, get_request_metrics())
+
+        # Bitta manba ishlamasa ham qolgan metrikalar beriladi
+        try:
+            write_pool_metrics(writer, get_pool_stats(), {"pool": "primary"})
+        except Exception:
+            logger.exception("Primary pool stats failed")
+        try:
+            replicas = get_replica_router().stats()
+            for replica in replicas["replicas"]:
+                write_pool_metrics(writer, replica["pool"], {"pool": "replica", "host": replica["host"]})
+                writer.sample(
+                    "db_replica_healthy", "gauge", "Replica passed the last health check.",
+                    int(replica["healthy"]), {"host": replica["host"]},
+                )
+            writer.sample(
+                "db_replica_fallbacks_total", "counter", "Reads sent to the primary because no replica was healthy.",
+                replicas["fallbacks"],
+            )
+        except Exception:
+            logger.exception("Replica pool stats failed")
+
+        queries = get_query_metrics()
+        writer.histogram(
+            "db_query_duration_seconds", "SQL statement execution time.", queries.duration.snapshot(),
+        )
+        writer.histogram(
+            "db_queries_per_request", "SQL statements executed per routed request.", queries.per_request.snapshot(),
+        )
+        writer.sample("db_slow_queries_total", "counter", "Statements slower than QUERY_SLOW_SECONDS.", queries.slow)
+        writer.sample(
+            "db_repeated_statements_total", "counter",
+            "Statements repeated QUERY_REPEAT_THRESHOLD+ times in one request (possible N+1).", queries.repeated,
+        )
+
+        for name, getter in COMPONENTS:
+            try:
+                write_component_stats(writer, name, getter().stats())
+            except Exception:
+                logger.exception("Stats for %s failed", name)
+
+        return writer.render()
@@ -0,0 +1,122 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import Depends, HTTPException, Request, UploadFile, status
+
+
+from app.api.repositories.product import ProductRepository, ProductVersion
+from app.api.schemas.product import ProductImageResponse, AutocompleteResponse, AutocompleteSuggestion, ProductListResponse, ProductResponse, ProductSearchFilters, ProductSearchResponse
+from app.api.utils.autocomplete import KINDS, get_autocomplete_index
+from app.api.utils.images import get_image_processor
+from app.api.utils.uploads import StoredUpload, get_upload_store
+
+
+class ProductController:
+    def __init__(
+            self, 
+            product_repository: ProductRepository = Depends()
+        ):
+        self.__product_repository = product_repository
+
+    async def get_products(
+            self,
+            page: int,
+            size: int,
+            cursor: Optional[str] = None,
+            subcategory_id: Optional[int] = None,
+        ) -> ProductListResponse:
+        return await self.__product_repository.get_products(page, size, cursor, subcategory_id)
+
+    async def get_product_by_id(self, product_id: int) -> ProductResponse:
+        product = await self.__product_repository.get_product_by_id(product_id)
+        self.record_view(product_id)
+        return product
+
+    async def upload_product_image(
+            self,
+            product_id: int,
+            file: UploadFile,
+            alt_text: Optional[str] = None,
+            is_primary: bool = False,
+            display_order: int = 0,
+        ) -> ProductImageResponse:
+        # Mahsulot bo'lmasa fayl qabul qilinmaydi va rasm ishlovi boshlanmaydi
+        await self.__product_repository.ensure_product_exists(product_id)
+        upload = await get_upload_store().receive_file(file)
+        try:
+            return await self.__add_product_image(product_id, upload, alt_text, is_primary, display_order)
+        finally:
+            await get_upload_store().discard(upload)
+
+    async def stream_product_image(
+            self,
+            product_id: int,
+            request: Request,
+            alt_text: Optional[str] = None,
+            is_primary: bool = False,
+            display_order: int = 0,
+        ) -> ProductImageResponse:
+        await self.__product_repository.ensure_product_exists(product_id)
+        upload = await get_upload_store().receive_request(request)
+        try:
+            return await self.__add_product_image(product_id, upload, alt_text, is_primary, display_order)
+        finally:
+            await get_upload_store().discard(upload)
+
+    async def attach_product_image(
+            self,
+            product_id: int,
+            upload_id: str,
+            alt_text: Optional[str] = None,
+            is_primary: bool = False,
+            display_order: int = 0,
+        ) -> ProductImageResponse:
+        await self.__product_repository.ensure_product_exists(product_id)
+        # Sessiya faqat rasm saqlangandan keyin yopiladi
+        async with get_upload_store().complete(upload_id) as upload:
+            return await self.__add_product_image(product_id, upload, alt_text, is_primary, display_order)
+
+    async def __add_product_image(
+            self,
+            product_id: int,
+            upload: StoredUpload,
+            alt_text: Optional[str],
+            is_primary: bool,
+            display_order: int,
+        ) -> ProductImageResponse:
+        processor = get_image_processor()
+        processed = await processor.process(upload.path, upload.sha256, "product_image")
+        return await self.__product_repository.add_product_image(
+            product_id,
+            processed,
+            processor.primary_variant(processed)["path"],
+            alt_text,
+            is_primary,
+            display_order,
+        )
+
+    async def get_product_version(self, product_id: int) -> Optional[ProductVersion]:
+        return await self.__product_repository.get_product_version(product_id)
+
+    def product_version(self, product: ProductResponse) -> ProductVersion:
+        return self.__product_repository.product_version(product)
+
+    def record_view(self, product_id: int) -> None:
+        get_autocomplete_index().record_hit("product", product_id)
+
+    async def search_products(self, filters: ProductSearchFilters, page: int, size: int) -> ProductSearchResponse:
+        return await self.__product_repository.search_products(filters, page, size)
+
+    async def autocomplete(self, q: str, limit: int, kinds: Optional[List[str]] = None) -> AutocompleteResponse:
+        if kinds and not set(kinds) <= set(KINDS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"kind faqat {', '.join(KINDS)} bo'lishi mumkin",
+            )
+        suggestions = get_autocomplete_index().search(q, limit, kinds)
+        return AutocompleteResponse(
+            query=q,
+            suggestions=[AutocompleteSuggestion.model_validate(entry) for entry in suggestions],
+        )
+
+    async def autocomplete_stats(self) -> dict:
+        return get_autocomplete_index().stats()
@@ -1,9 +1,11 @@
-from typing import List
+from typing import List, Optional
 from fastapi import Depends, HTTPException, status
 
 
 from app.api.repositories.subcategory import SubcategoryRepository
-from app.api.schemas.product import SubcategoryListResponse, SubcategoryResponse, SubcategoryCreate, SubcategoryDetailResponse, SubcategoryUpdate
+from app.api.utils.bulk_import import run_import
+from app.api.utils.fast_json import JSONPage
+from app.api.schemas.product import ImportResponse, SubcategoryListResponse, SubcategoryResponse, SubcategoryCreate, SubcategoryDetailResponse, SubcategoryUpdate
 
 
 class SubcategoryController:
@@ -13,6 +15,17 @@ class SubcategoryController:
         ):
         self.__category_repository = category_repository
 
-    async def get_subcategories(self, page: int, size: int) -> SubcategoryListResponse:
-        return await self.__category_repository.get_subcategories(page, size)
+    async def get_subcategories(self, page: int, size: int, cursor: Optional[str] = None, view: str = "full") -> SubcategoryListResponse:
+        return await self.__category_repository.get_subcategories(page, size, cursor, view)
+
+    async def get_subcategories_json(self, page: int, size: int, cursor: Optional[str] = None, view: str = "full") -> JSONPage:
+        return await self.__category_repository.get_subcategories_json(page, size, cursor, view)
         
+
+    async def import_subcategories(self, rows, update_existing: bool, chunk_size: int) -> ImportResponse:
+        return await run_import(
+            rows,
+            SubcategoryCreate,
+            lambda chunk: self.__category_repository.bulk_upsert_subcategories(chunk, update_existing),
+            chunk_size,
+        )
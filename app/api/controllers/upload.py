@@ -0,0 +1,24 @@
+from fastapi import Request
+
+from app.api.schemas.upload import UploadCreate, UploadSessionResponse
+from app.api.utils.uploads import get_upload_store
+
+
+class UploadController:
+    def __init__(self):
+        self.__upload_store = get_upload_store()
+
+    async def create_upload(self, upload: UploadCreate) -> UploadSessionResponse:
+        session = await self.__upload_store.create_session(upload.size)
+        return UploadSessionResponse(**session)
+
+    async def get_upload(self, upload_id: str) -> UploadSessionResponse:
+        session = await self.__upload_store.get_session(upload_id)
+        return UploadSessionResponse(**session)
+
+    async def append_upload(self, upload_id: str, offset: int, request: Request) -> UploadSessionResponse:
+        session = await self.__upload_store.append(upload_id, offset, request.stream())
+        return UploadSessionResponse(**session)
+
+    async def delete_upload(self, upload_id: str) -> None:
+        await self.__upload_store.abort(upload_id)
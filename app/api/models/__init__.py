@@ -4,6 +4,7 @@ from app.api.models.user import User
 from app.api.models.product.product import (
     Category,
     Subcategory,
+    SubcategoryProductCount,
     Product,
     ProductImage,
     ProductVariation,
@@ -16,6 +17,7 @@ __all__ = (
     "User",
     "Category",
     "Subcategory",
+    "SubcategoryProductCount",
     "Product",
     "ProductImage",
     "ProductVariation",
@@ -10,8 +10,12 @@ from sqlalchemy import (
     ForeignKey,
     BigInteger,
     UniqueConstraint,
+    Index,
+    JSON,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from app.core.models.base import Base
 
 
@@ -22,6 +26,8 @@ class Category(Base):
     name = Column(String(255), nullable=False)
     slug = Column(String(255), unique=True, index=True)
     image = Column(String(255), nullable=True)
+    # Rasm yuklanganda yaratilgan o'lcham/format variantlari
+    image_variants = Column(JSON, nullable=True)
     description = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True)
 
@@ -55,10 +61,30 @@ class Subcategory(Base):
         return f"<Subcategory id={self.id}, name={self.name}>"
 
 
+class SubcategoryProductCount(Base):
+    """Subkategoriyadagi faol mahsulotlar soni; products triggeri orqali yuritiladi."""
+    __tablename__ = "subcategory_product_counts"
+
+    subcategory_id = Column(Integer, ForeignKey("subcategories.id", ondelete="CASCADE"), primary_key=True)
+    product_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SubcategoryProductCount subcategory_id={self.subcategory_id}, product_count={self.product_count}>"
+
+
 class Product(Base):
     __tablename__ = "products"
     __table_args__ = (
         UniqueConstraint('slug', name='uq_product_slug'),
+        Index('ix_products_active_subcategory_price', 'subcategory_id', 'price', postgresql_where=text('is_active')),
+        Index('ix_products_active_price', 'price', postgresql_where=text('is_active')),
+        Index('ix_products_active_color', 'color', postgresql_where=text('is_active')),
+        Index('ix_products_active_featured', 'id', postgresql_where=text('is_active AND is_featured')),
+        Index('ix_products_active_width', 'width', postgresql_where=text('is_active')),
+        Index('ix_products_active_height', 'height', postgresql_where=text('is_active')),
+        Index('ix_products_active_depth', 'depth', postgresql_where=text('is_active')),
+        Index('ix_products_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_products_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
     )
 
     id = Column(BigInteger, primary_key=True, index=True)
@@ -76,11 +102,14 @@ class Product(Base):
     height = Column(Float, nullable=True)
     depth = Column(Float, nullable=True) 
     color = Column(String(100), nullable=True)
+
+    # Trigger orqali name, description, subcategory va category nomlaridan to'ldiriladi
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     
     subcategory_id = Column(Integer, ForeignKey("subcategories.id", ondelete="CASCADE"), nullable=False)
     
     subcategory = relationship("Subcategory", back_populates="products")
-    images = relationship("ProductImage", back_populates="product", cascade="all, delete-orphan")
+    images = relationship("ProductImage", back_populates="product", cascade="all, delete-orphan", order_by="ProductImage.display_order")
     variations = relationship("ProductVariation", back_populates="product", cascade="all, delete-orphan")
     
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -92,9 +121,16 @@ class Product(Base):
 
 class ProductImage(Base):
     __tablename__ = "product_images"
+    __table_args__ = (
+        Index('ix_product_images_product_order', 'product_id', 'display_order'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     image_path = Column(String(255), nullable=False)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    # [{"path", "width", "height", "format", "size"}, ...]
+    variants = Column(JSON, nullable=True)
     alt_text = Column(String(255), nullable=True)
     is_primary = Column(Boolean, default=False)
     display_order = Column(Integer, default=0)
@@ -112,6 +148,11 @@ class ProductImage(Base):
 
 class ProductVariation(Base):
     __tablename__ = "product_variations"
+    __table_args__ = (
+        Index('ix_product_variations_product_id', 'product_id'),
+        Index('ix_product_variations_material_product', 'material', 'product_id', postgresql_where=text('is_active')),
+        Index('ix_product_variations_size_product', 'size', 'product_id', postgresql_where=text('is_active')),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
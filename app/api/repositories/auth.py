@@ -11,11 +11,13 @@ from sqlalchemy.future import select
 from app.api.models.user import User
 from app.api.schemas.user import CreateUser, ResponseUser
 from app.api.utils.auth import AuthUtils
+from app.api.utils.fast_json import response_columns
 
 
 class AuthRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
         self.session = session
+        self.read_session = read_session or session
 
     async def create_user(self, data: CreateUser) -> User:
         hashed_password = await AuthUtils.get_password_hash(data.password)
@@ -30,11 +32,20 @@ class AuthRepository:
         return user
 
     async def get_users(self) -> List[ResponseUser]:
-        users = await self.session.execute(select(User))
-        result =  users.scalars().all()
-        return result
+        # Faqat javob ustunlari: parol xeshi va ORM obyektlari yuklanmaydi
+        users = await self.read_session.execute(select(*response_columns(User, ResponseUser)).order_by(User.id))
+        return users.all()
     
 
     async def get_user_by_email(self, email: str) -> User:
         user = await self.session.execute(select(User).filter(User.email == email))
-        return user.scalar_one_or_none()
\ No newline at end of file
+        return user.scalar_one_or_none()
+
+    async def set_user_active(self, user_id: int, is_active: bool) -> Optional[User]:
+        user = await self.session.get(User, user_id)
+        if user is None:
+            return None
+        user.is_active = is_active
+        await self.session.commit()
+        await self.session.refresh(user)
+        return user
@@ -1,68 +1,90 @@
-from typing import Optional, Sequence, Any, Coroutine, List
+import hashlib
+from datetime import datetime
+from typing import Optional, Sequence, Any, Coroutine, List, Tuple
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import func
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from pydantic import TypeAdapter
 
+from app.core.cache import get_catalog_cache, register_cache_types
 from app.core.datebases.postgres import get_general_session
+from app.core.datebases.replicas import get_read_session, get_replica_router
+from app.api.utils.autocomplete import get_autocomplete_index
+from app.api.utils.bulk_import import ImportChunk, chunk_results
+from app.api.utils.fast_json import JSONPage, json_page, page_payload, response_columns
+from app.api.utils.pagination import fetch_page
+from app.api.utils.total_count import get_total_counter
+from app.core.settings import get_settings
 
-from app.api.schemas.product import CategoryCreate, CategoryListResponse, CategoryResponse, CategoryDetailResponse, CategoryUpdate
-from app.api.models.product.product import Category, Subcategory
+from app.api.schemas.product import ImportRowResult, CategoryCreate, CategoryListResponse, CategoryResponse, CategorySummaryListResponse, CategorySummaryResponse, CategoryDetailResponse, CategoryTreeResponse, CategoryUpdate, SubcategoryTreeResponse
+from app.api.models.product.product import Category, Subcategory, SubcategoryProductCount
 
 from slugify import slugify
 
+settings = get_settings()
+
+category_tree_adapter = TypeAdapter(List[CategoryTreeResponse])
+
+# "summary" - menyular uchun: description va boshqa og'ir ustunlar o'qilmaydi
+CATEGORY_LIST_VIEWS = {
+    "full": (CategoryResponse, CategoryListResponse),
+    "summary": (CategorySummaryResponse, CategorySummaryListResponse),
+}
+
+register_cache_types(CategoryResponse, CategoryListResponse, CategorySummaryListResponse)
+
+
 class CategoryRepository:
     def __init__(
             self,
-            session: AsyncSession = Depends(get_general_session)
+            session: AsyncSession = Depends(get_general_session),
+            read_session: AsyncSession = Depends(get_read_session),
         ):
         self.__session = session
+        self.__read_session = read_session
 
-    async def get_categories(self, page: int = 1, size: int = 10):
-        count_query = select(func.count()).select_from(Category)
-        total = await self.__session.scalar(count_query)
-        
-        if total is None:
-            total = 0
-        
-        query = select(Category).offset((page - 1) * size).limit(size)
+    async def get_categories(self, page: int = 1, size: int = 10, cursor: Optional[str] = None, view: str = "full"):
+        return await get_catalog_cache().get_or_load(
+            "category",
+            ("list", view, page, size, cursor),
+            lambda: self.__fetch_categories(page, size, cursor, view),
+        )
 
-        result = await self.__session.execute(query)
-        categories = result.scalars().all()\
-        
-        
-        
-        pages = (total + size - 1) // size if total > 0 else 0
-        
-        category_responses = []
-        for cat in categories:
-            category_responses.append(
-                CategoryResponse(
-                    id=cat.id,
-                    name=cat.name,
-                    description=cat.description,
-                    is_active=cat.is_active,
-                    slug=cat.slug,
-                    image=cat.image,
-                    created_at=cat.created_at,
-                    updated_at=cat.updated_at
-                )
-            )
-        
-        list_response = CategoryListResponse(
-            items=category_responses,
-            total=total,
-            page=page,
-            size=size,
-            pages=pages
+    async def get_categories_json(self, page: int = 1, size: int = 10, cursor: Optional[str] = None, view: str = "full") -> JSONPage:
+        return await get_catalog_cache().get_or_load(
+            "category",
+            ("list-json", view, page, size, cursor),
+            lambda: self.__fetch_categories_json(page, size, cursor, view),
         )
-        
-        return list_response
+
+    async def __fetch_categories_payload(self, page: int, size: int, cursor: Optional[str], view: str) -> dict:
+        item_schema, _ = CATEGORY_LIST_VIEWS[view]
+        rows, total = await fetch_page(
+            self.__read_session, Category, response_columns(Category, item_schema), page, size, cursor
+        )
+        return page_payload(rows, item_schema, total, page, size, cursor)
+
+    async def __fetch_categories(self, page: int, size: int, cursor: Optional[str], view: str):
+        _, list_schema = CATEGORY_LIST_VIEWS[view]
+        return list_schema.model_validate(await self.__fetch_categories_payload(page, size, cursor, view))
+
+    async def __fetch_categories_json(self, page: int, size: int, cursor: Optional[str], view: str) -> JSONPage:
+        return json_page(await self.__fetch_categories_payload(page, size, cursor, view))
     
     async def get_category_by_id(self, category_id: int) -> CategoryResponse:
+        return await get_catalog_cache().get_or_load(
+            "category",
+            ("detail", category_id),
+            lambda: self.__fetch_category_by_id(category_id),
+        )
+
+    async def __fetch_category_by_id(self, category_id: int) -> CategoryResponse:
         query = select(Category).where(Category.id == category_id)
-        result = await self.__session.execute(query)
+        result = await self.__read_session.execute(query)
         category = result.scalars().first()
         
         if category is None:
@@ -75,11 +97,69 @@ class CategoryRepository:
             is_active=category.is_active,
             slug=category.slug,
             image=category.image,
+            image_variants=category.image_variants,
             created_at=category.created_at,
             updated_at=category.updated_at
         )
     
 
+    async def get_category_tree(self) -> Tuple[str, bytes]:
+        """Faol kategoriyalar daraxti: (ETag, tayyor JSON baytlari)."""
+        return await get_catalog_cache().get_or_load(
+            "category-tree",
+            "tree",
+            self.__build_category_tree,
+            ttl=settings.CATEGORY_TREE_TTL,
+        )
+
+    async def __build_category_tree(self) -> Tuple[str, bytes]:
+        categories = await self.__read_session.execute(
+            select(Category).where(Category.is_active == True).order_by(Category.id)
+        )
+        subcategories = await self.__read_session.execute(
+            select(Subcategory, func.coalesce(SubcategoryProductCount.product_count, 0))
+            .outerjoin(SubcategoryProductCount, SubcategoryProductCount.subcategory_id == Subcategory.id)
+            .where(Subcategory.is_active == True)
+            .order_by(Subcategory.category_id, Subcategory.id)
+        )
+
+        children = {}
+        for subcategory, product_count in subcategories:
+            children.setdefault(subcategory.category_id, []).append(
+                SubcategoryTreeResponse(
+                    id=subcategory.id,
+                    name=subcategory.name,
+                    description=subcategory.description,
+                    is_active=subcategory.is_active,
+                    slug=subcategory.slug,
+                    category_id=subcategory.category_id,
+                    created_at=subcategory.created_at,
+                    updated_at=subcategory.updated_at,
+                    product_count=product_count,
+                )
+            )
+
+        tree = [
+            CategoryTreeResponse(
+                id=category.id,
+                name=category.name,
+                description=category.description,
+                is_active=category.is_active,
+                slug=category.slug,
+                image=category.image,
+                image_variants=category.image_variants,
+                created_at=category.created_at,
+                updated_at=category.updated_at,
+                subcategories=children.get(category.id, []),
+                product_count=sum(child.product_count for child in children.get(category.id, [])),
+            )
+            for category in categories.scalars()
+        ]
+
+        body = category_tree_adapter.dump_json(tree)
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        return etag, body
+
     async def create_category(self, category: CategoryCreate) -> CategoryResponse:
 
         slug = slugify(category.name)
@@ -94,6 +174,13 @@ class CategoryRepository:
         
         self.__session.add(new_category)
         await self.__session.commit()
+        await get_replica_router().wait_for_replicas()
+        await get_total_counter().invalidate(Category)
+        await get_catalog_cache().invalidate("category")
+        await get_catalog_cache().invalidate("category-tree")
+        await get_autocomplete_index().publish(
+            "category", [(new_category.id, new_category.name, new_category.slug, new_category.is_active)]
+        )
         
         return CategoryResponse(
             id=new_category.id,
@@ -102,6 +189,7 @@ class CategoryRepository:
             is_active=new_category.is_active,
             slug=new_category.slug,
             image=new_category.image,
+            image_variants=new_category.image_variants,
             created_at=new_category.created_at,
             updated_at=new_category.updated_at
         )
@@ -120,7 +208,14 @@ class CategoryRepository:
         
         self.__session.add(category_db)
         await self.__session.commit()
+        await get_replica_router().wait_for_replicas()
+        await get_total_counter().invalidate(Category)
+        await get_catalog_cache().invalidate("category")
+        await get_catalog_cache().invalidate("category-tree")
         await self.__session.refresh(category_db)
+        await get_autocomplete_index().publish(
+            "category", [(category_db.id, category_db.name, category_db.slug, category_db.is_active)]
+        )
         
         return CategoryResponse(
             id=category_db.id,
@@ -129,6 +224,81 @@ class CategoryRepository:
             is_active=category_db.is_active,
             slug=category_db.slug,
             image=category_db.image,
+            image_variants=category_db.image_variants,
             created_at=category_db.created_at,
             updated_at=category_db.updated_at
-        )
\ No newline at end of file
+        )
+
+    async def ensure_category_exists(self, category_id: int) -> None:
+        found = await self.__session.scalar(select(Category.id).where(Category.id == category_id))
+        if found is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+
+    async def set_category_image(self, category_id: int, image_path: str, variants: List[dict]) -> CategoryResponse:
+        category_db = await self.__session.get(Category, category_id)
+        if category_db is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+
+        category_db.image = image_path
+        category_db.image_variants = variants
+        await self.__session.commit()
+        await get_replica_router().wait_for_replicas()
+        await get_catalog_cache().invalidate("category")
+        await get_catalog_cache().invalidate("category-tree")
+        await self.__session.refresh(category_db)
+
+        return CategoryResponse.model_validate(category_db)
+
+    async def bulk_upsert_categories(self, chunk: ImportChunk, update_existing: bool = False) -> List[ImportRowResult]:
+        now = datetime.utcnow()
+        values = [
+            {
+                "name": item.name,
+                "description": item.description,
+                "is_active": item.is_active,
+                "slug": slug,
+                "image": item.image,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _, item, slug in chunk
+        ]
+
+        query = insert(Category).values(values)
+        if update_existing:
+            query = query.on_conflict_do_update(
+                index_elements=[Category.slug],
+                set_={
+                    "name": query.excluded.name,
+                    "description": query.excluded.description,
+                    "is_active": query.excluded.is_active,
+                    "image": query.excluded.image,
+                    "updated_at": query.excluded.updated_at,
+                },
+            )
+        else:
+            query = query.on_conflict_do_nothing(index_elements=[Category.slug])
+        # xmax = 0 faqat yangi qo'shilgan qatorlarda bo'ladi
+        query = query.returning(Category.id, Category.slug, literal_column("xmax = 0").label("inserted"))
+
+        try:
+            result = await self.__session.execute(query)
+            returned = result.all()
+            await self.__session.commit()
+        except SQLAlchemyError:
+            # Keyingi chunklar shu sessiyada davom etadi
+            await self.__session.rollback()
+            raise
+
+        if returned:
+            await get_replica_router().wait_for_replicas()
+            await get_total_counter().invalidate(Category)
+            await get_catalog_cache().invalidate("category")
+            await get_catalog_cache().invalidate("category-tree")
+            items = {slug: item for _, item, slug in chunk}
+            await get_autocomplete_index().publish(
+                "category",
+                [(row.id, items[row.slug].name, row.slug, items[row.slug].is_active) for row in returned],
+            )
+
+        return chunk_results(chunk, returned)
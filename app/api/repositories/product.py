@@ -0,0 +1,363 @@
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import Float, String, cast, exists, false, func, literal, null, or_, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import raiseload, selectinload
+
+from app.core.datebases.postgres import get_general_session
+from app.core.datebases.replicas import get_read_session
+from app.api.utils.http_cache import latest
+from app.api.utils.pagination import decode_cursor, next_cursor
+from app.api.utils.text_search import prefix_tsquery, search_variants
+from app.api.utils.total_count import get_total_counter
+
+from app.api.schemas.product import (
+    FacetValue,
+    PriceFacet,
+    ProductFacets,
+    ProductImageResponse,
+    ProductListResponse,
+    ProductResponse,
+    ProductSearchFilters,
+    ProductSearchResponse,
+)
+from app.api.models.product.product import Product, ProductImage, ProductVariation
+
+class ProductVersion(NamedTuple):
+    """Mahsulot javobining versiyasi: o'chirilgan rasm/variatsiya updated_at'ni o'zgartirmaydi, son esa o'zgaradi."""
+    updated_at: Optional[datetime]
+    images: int
+    variations: int
+
+
+SEARCH_SORTS = {
+    "newest": (Product.id.desc(),),
+    "price_asc": (Product.price.asc(), Product.id.asc()),
+    "price_desc": (Product.price.desc(), Product.id.desc()),
+}
+
+
+class ProductRepository:
+    def __init__(
+            self,
+            session: AsyncSession = Depends(get_general_session),
+            read_session: AsyncSession = Depends(get_read_session),
+        ):
+        self.__session = session
+        self.__read_session = read_session
+
+    @staticmethod
+    def __with_relations(query):
+        # images va variations sahifadagi barcha mahsulotlar uchun bittadan
+        # IN (...) so'rov bilan yuklanadi; boshqa lazy load xato beradi (N+1 yo'q)
+        return query.options(
+            selectinload(Product.images),
+            selectinload(Product.variations),
+            raiseload("*"),
+        )
+
+    async def get_products(
+            self,
+            page: int = 1,
+            size: int = 10,
+            cursor: Optional[str] = None,
+            subcategory_id: Optional[int] = None,
+        ) -> ProductListResponse:
+        # Nofaol mahsulotlar katalogda ko'rinmaydi (qidiruvdagi kabi)
+        query = (
+            self.__with_relations(select(Product))
+            .where(Product.is_active == True)
+            .order_by(Product.id)
+            .limit(size + 1)
+        )
+        if subcategory_id is not None:
+            query = query.where(Product.subcategory_id == subcategory_id)
+        if cursor is not None:
+            query = query.where(Product.id > decode_cursor(cursor))
+        else:
+            query = query.offset((page - 1) * size)
+
+        result = await self.__read_session.execute(query)
+        rows = result.scalars().all()
+        products = rows[:size]
+
+        if subcategory_id is None:
+            total = await get_total_counter().count(self.__read_session, Product, Product.is_active == True)
+        else:
+            count_query = (
+                select(func.count())
+                .select_from(Product)
+                .where(Product.is_active == True, Product.subcategory_id == subcategory_id)
+            )
+            total = await self.__read_session.scalar(count_query) or 0
+
+        pages = (total + size - 1) // size if total > 0 else 0
+
+        return ProductListResponse(
+            items=[ProductResponse.model_validate(product) for product in products],
+            total=total,
+            page=page if cursor is None else None,
+            size=size,
+            pages=pages,
+            next_cursor=next_cursor(rows, size),
+        )
+
+    async def get_product_by_id(self, product_id: int) -> ProductResponse:
+        query = self.__with_relations(select(Product)).where(Product.id == product_id, Product.is_active == True)
+        result = await self.__read_session.execute(query)
+        product = result.scalars().first()
+
+        if product is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+
+        return ProductResponse.model_validate(product)
+
+    async def ensure_product_exists(self, product_id: int) -> None:
+        found = await self.__session.scalar(select(Product.id).where(Product.id == product_id))
+        if found is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+
+    async def add_product_image(
+            self,
+            product_id: int,
+            processed: dict,
+            image_path: str,
+            alt_text: Optional[str] = None,
+            is_primary: bool = False,
+            display_order: int = 0,
+        ) -> ProductImageResponse:
+        await self.ensure_product_exists(product_id)
+        if is_primary:
+            await self.__session.execute(
+                update(ProductImage).where(ProductImage.product_id == product_id).values(is_primary=False)
+            )
+
+        image = ProductImage(
+            product_id=product_id,
+            image_path=image_path,
+            width=processed["width"],
+            height=processed["height"],
+            variants=processed["variants"],
+            alt_text=alt_text,
+            is_primary=is_primary,
+            display_order=display_order,
+        )
+        self.__session.add(image)
+        await self.__session.commit()
+        await self.__session.refresh(image)
+        return ProductImageResponse.model_validate(image)
+
+    async def get_product_version(self, product_id: int) -> Optional[ProductVersion]:
+        """Mahsulot, rasmlar va variatsiyalarning eng so'nggi updated_at qiymati va sonlari (bitta so'rov)."""
+        def child(model, column):
+            return select(column).where(model.product_id == Product.id).scalar_subquery()
+
+        query = select(
+            Product.updated_at,
+            child(ProductImage, func.max(ProductImage.updated_at)),
+            child(ProductImage, func.count(ProductImage.id)),
+            child(ProductVariation, func.max(ProductVariation.updated_at)),
+            child(ProductVariation, func.count(ProductVariation.id)),
+        ).where(Product.id == product_id, Product.is_active == True)
+        row = (await self.__read_session.execute(query)).first()
+        if row is None:
+            return None
+        updated_at, images_updated_at, image_count, variations_updated_at, variation_count = row
+        return ProductVersion(latest(updated_at, images_updated_at, variations_updated_at), image_count, variation_count)
+
+    @staticmethod
+    def product_version(product: ProductResponse) -> ProductVersion:
+        images = product.images or []
+        variations = product.variations or []
+        return ProductVersion(
+            latest(
+                product.updated_at,
+                *(image.updated_at for image in images),
+                *(variation.updated_at for variation in variations),
+            ),
+            len(images),
+            len(variations),
+        )
+
+    async def search_products(self, filters: ProductSearchFilters, page: int = 1, size: int = 20) -> ProductSearchResponse:
+        filters = filters.model_copy(update={"q": (filters.q or "").strip() or None})
+        sort = filters.sort or ("relevance" if filters.q else "newest")
+        if sort not in SEARCH_SORTS and not (sort == "relevance" and filters.q):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Saralash turi noto'g'ri")
+
+        if sort == "relevance":
+            order_by = (self.__text_rank(filters.q).desc(), Product.id.desc())
+        else:
+            order_by = SEARCH_SORTS[sort]
+
+        query = (
+            self.__with_relations(select(Product))
+            .where(*self.__search_conditions(filters))
+            .order_by(*order_by)
+            .offset((page - 1) * size)
+            .limit(size)
+        )
+        result = await self.__read_session.execute(query)
+        products = result.scalars().all()
+
+        total, facets = await self.__search_facets(filters)
+        pages = (total + size - 1) // size if total > 0 else 0
+
+        return ProductSearchResponse(
+            items=[ProductResponse.model_validate(product) for product in products],
+            total=total,
+            page=page,
+            size=size,
+            pages=pages,
+            facets=facets,
+        )
+
+    @staticmethod
+    def __product_conditions(filters: ProductSearchFilters, exclude: Optional[str] = None) -> list:
+        # "= true" ko'rinishi partial indekslardagi "WHERE is_active" bilan mos tushadi
+        conditions = [Product.is_active == True]
+
+        if filters.q:
+            conditions.append(ProductRepository.__text_condition(filters.q))
+        if exclude != "subcategory_id" and filters.subcategory_id:
+            conditions.append(Product.subcategory_id.in_(filters.subcategory_id))
+        if exclude != "color" and filters.color:
+            conditions.append(Product.color.in_(filters.color))
+        if exclude != "is_featured" and filters.is_featured is not None:
+            conditions.append(Product.is_featured == filters.is_featured)
+
+        if exclude != "price":
+            if filters.min_price is not None:
+                conditions.append(Product.price >= filters.min_price)
+            if filters.max_price is not None:
+                conditions.append(Product.price <= filters.max_price)
+
+        for column, low, high in (
+            (Product.width, filters.min_width, filters.max_width),
+            (Product.height, filters.min_height, filters.max_height),
+            (Product.depth, filters.min_depth, filters.max_depth),
+        ):
+            if low is not None:
+                conditions.append(column >= low)
+            if high is not None:
+                conditions.append(column <= high)
+
+        return conditions
+
+    @staticmethod
+    def __text_condition(q: str):
+        # tsvector (GIN) bo'yicha prefiks moslik yoki trigram (GIN) bo'yicha
+        # xatoli yozuvga yaqin nom; ikkalasi ham indeksdan foydalanadi
+        variants = search_variants(q)
+        conditions = []
+        for variant in variants:
+            tsquery = prefix_tsquery(variant)
+            if tsquery:
+                conditions.append(Product.search_vector.op("@@")(func.to_tsquery("simple", tsquery)))
+            conditions.append(literal(variant).op("<%")(Product.name))
+        return or_(*conditions) if conditions else false()
+
+    @staticmethod
+    def __text_rank(q: str):
+        ranks = []
+        for variant in search_variants(q):
+            tsquery = prefix_tsquery(variant)
+            if tsquery:
+                ranks.append(func.ts_rank_cd(Product.search_vector, func.to_tsquery("simple", tsquery)))
+            ranks.append(func.word_similarity(variant, Product.name))
+        if not ranks:
+            return literal(0)
+        return func.greatest(*ranks) if len(ranks) > 1 else ranks[0]
+
+    @staticmethod
+    def __variation_conditions(filters: ProductSearchFilters, exclude: Optional[str] = None) -> list:
+        # material va o'lcham bitta variatsiyaga tegishli bo'lishi kerak
+        conditions = []
+        if exclude != "material" and filters.material:
+            conditions.append(ProductVariation.material.in_(filters.material))
+        if exclude != "variation_size" and filters.variation_size:
+            conditions.append(ProductVariation.size.in_(filters.variation_size))
+        return conditions
+
+    @classmethod
+    def __search_conditions(cls, filters: ProductSearchFilters, exclude: Optional[str] = None) -> list:
+        conditions = cls.__product_conditions(filters, exclude)
+        variation_conditions = cls.__variation_conditions(filters, exclude)
+        if variation_conditions:
+            conditions.append(
+                exists().where(
+                    ProductVariation.product_id == Product.id,
+                    ProductVariation.is_active == True,
+                    *variation_conditions,
+                )
+            )
+        return conditions
+
+    async def __search_facets(self, filters: ProductSearchFilters):
+        """Total va barcha facetlar bitta UNION ALL so'rovida hisoblanadi.
+
+        Har bir facet o'zining filtrisiz, qolgan filtrlar bilan sanaladi, shuning
+        uchun tanlangan qiymat bilan birga boshqa variantlar soni ham ko'rinadi.
+        """
+
+        def row(facet: str, value, count, min_value=None, max_value=None):
+            return (
+                literal(facet).label("facet"),
+                cast(value, String).label("value") if value is not None else null().label("value"),
+                count.label("count"),
+                cast(min_value if min_value is not None else null(), Float).label("min_value"),
+                cast(max_value if max_value is not None else null(), Float).label("max_value"),
+            )
+
+        queries = [
+            select(*row("total", None, func.count())).where(*self.__search_conditions(filters)),
+            select(*row("price", None, func.count(), func.min(Product.price), func.max(Product.price)))
+            .where(*self.__search_conditions(filters, exclude="price")),
+        ]
+
+        for facet, column in (
+            ("subcategory_id", Product.subcategory_id),
+            ("color", Product.color),
+            ("is_featured", Product.is_featured),
+        ):
+            queries.append(
+                select(*row(facet, column, func.count()))
+                .where(*self.__search_conditions(filters, exclude=facet), column.is_not(None))
+                .group_by(column)
+            )
+
+        for facet, column in (
+            ("material", ProductVariation.material),
+            ("variation_size", ProductVariation.size),
+        ):
+            queries.append(
+                select(*row(facet, column, func.count(func.distinct(Product.id))))
+                .select_from(Product)
+                .join(ProductVariation, ProductVariation.product_id == Product.id)
+                .where(
+                    *self.__product_conditions(filters),
+                    ProductVariation.is_active == True,
+                    *self.__variation_conditions(filters, exclude=facet),
+                    column.is_not(None),
+                )
+                .group_by(column)
+            )
+
+        result = await self.__read_session.execute(union_all(*queries))
+
+        total = 0
+        facets = ProductFacets()
+        for facet, value, count, min_value, max_value in result.all():
+            if facet == "total":
+                total = count
+            elif facet == "price":
+                facets.price = PriceFacet(min=min_value, max=max_value, count=count)
+            else:
+                getattr(facets, facet).append(FacetValue(value=value, count=count))
+
+        for facet in ("subcategory_id", "color", "material", "variation_size", "is_featured"):
+            getattr(facets, facet).sort(key=lambda item: -item.count)
+
+        return total, facets
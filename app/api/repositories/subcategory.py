@@ -1,58 +1,138 @@
+from datetime import datetime
 from typing import Optional, Sequence, Any, Coroutine, List
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import func
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import get_catalog_cache, register_cache_types
 from app.core.datebases.postgres import get_general_session
+from app.core.datebases.replicas import get_read_session, get_replica_router
+from app.api.utils.autocomplete import get_autocomplete_index
+from app.api.utils.bulk_import import ImportChunk, chunk_results
+from app.api.utils.fast_json import JSONPage, json_page, page_payload, response_columns
+from app.api.utils.pagination import fetch_page
+from app.api.utils.total_count import get_total_counter
 
-from app.api.schemas.product import SubcategoryBase, SubcategoryCreate, SubcategoryDetailResponse, SubcategoryListResponse, SubcategoryResponse, SubcategoryUpdate
+from app.api.schemas.product import ImportRowResult, SubcategoryBase, SubcategoryCreate, SubcategoryDetailResponse, SubcategoryListResponse, SubcategoryResponse, SubcategorySummaryListResponse, SubcategorySummaryResponse, SubcategoryUpdate
 from app.api.models.product.product import Category, Subcategory
 
 from slugify import slugify
 
 
+# "summary" - menyular uchun: description va boshqa og'ir ustunlar o'qilmaydi
+SUBCATEGORY_LIST_VIEWS = {
+    "full": (SubcategoryResponse, SubcategoryListResponse),
+    "summary": (SubcategorySummaryResponse, SubcategorySummaryListResponse),
+}
+
+register_cache_types(SubcategoryListResponse, SubcategorySummaryListResponse)
+
 
 class SubcategoryRepository:
-    def __init__(self, session: AsyncSession = Depends(get_general_session)):
+    def __init__(
+            self,
+            session: AsyncSession = Depends(get_general_session),
+            read_session: AsyncSession = Depends(get_read_session),
+        ):
         self.__session = session
+        self.__read_session = read_session
 
-    async def get_subcategories(self, page, size):
-        count_query = select(func.count()).select_from(Subcategory)
-        total = await self.__session.scalar(count_query)
-        
-        if total is None:
-            total = 0
-        
-        query = select(Subcategory).offset((page - 1) * size).limit(size)
-
-        result = await self.__session.execute(query)
-        subcategories = result.scalars().all()
-        
-        pages = (total + size - 1) // size if total > 0 else 0
-        
-        subcategory_responses = []
-        for sub in subcategories:
-            subcategory_responses.append(
-                SubcategoryResponse(
-                    id=sub.id,
-                    category_id=sub.category_id,
-                    name=sub.name,
-                    description=sub.description,
-                    is_active=sub.is_active,
-                    slug=sub.slug,
-                    created_at=sub.created_at,
-                    updated_at=sub.updated_at
-                )
-            )
-        
-        list_response = SubcategoryListResponse(
-            items=subcategory_responses,
-            total=total,
-            page=page,
-            size=size,
-            pages=pages
+    async def get_subcategories(self, page: int = 1, size: int = 10, cursor: Optional[str] = None, view: str = "full"):
+        return await get_catalog_cache().get_or_load(
+            "subcategory",
+            ("list", view, page, size, cursor),
+            lambda: self.__fetch_subcategories(page, size, cursor, view),
+        )
+
+    async def get_subcategories_json(self, page: int = 1, size: int = 10, cursor: Optional[str] = None, view: str = "full") -> JSONPage:
+        return await get_catalog_cache().get_or_load(
+            "subcategory",
+            ("list-json", view, page, size, cursor),
+            lambda: self.__fetch_subcategories_json(page, size, cursor, view),
         )
-        
-        return list_response
\ No newline at end of file
+
+    async def __fetch_subcategories_payload(self, page: int, size: int, cursor: Optional[str], view: str) -> dict:
+        item_schema, _ = SUBCATEGORY_LIST_VIEWS[view]
+        rows, total = await fetch_page(
+            self.__read_session, Subcategory, response_columns(Subcategory, item_schema), page, size, cursor
+        )
+        return page_payload(rows, item_schema, total, page, size, cursor)
+
+    async def __fetch_subcategories(self, page: int, size: int, cursor: Optional[str], view: str):
+        _, list_schema = SUBCATEGORY_LIST_VIEWS[view]
+        return list_schema.model_validate(await self.__fetch_subcategories_payload(page, size, cursor, view))
+
+    async def __fetch_subcategories_json(self, page: int, size: int, cursor: Optional[str], view: str) -> JSONPage:
+        return json_page(await self.__fetch_subcategories_payload(page, size, cursor, view))
+
+    async def bulk_upsert_subcategories(self, chunk: ImportChunk, update_existing: bool = False) -> List[ImportRowResult]:
+        category_ids = {item.category_id for _, item, _ in chunk}
+        result = await self.__session.execute(select(Category.id).where(Category.id.in_(category_ids)))
+        existing_ids = set(result.scalars().all())
+
+        results = []
+        valid = []
+        for index, item, slug in chunk:
+            if item.category_id in existing_ids:
+                valid.append((index, item, slug))
+            else:
+                results.append(ImportRowResult(index=index, status="error", slug=slug, detail="Category topilmadi"))
+        if not valid:
+            return results
+
+        now = datetime.utcnow()
+        values = [
+            {
+                "name": item.name,
+                "description": item.description,
+                "is_active": item.is_active,
+                "slug": slug,
+                "category_id": item.category_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _, item, slug in valid
+        ]
+
+        query = insert(Subcategory).values(values)
+        if update_existing:
+            query = query.on_conflict_do_update(
+                index_elements=[Subcategory.slug],
+                set_={
+                    "name": query.excluded.name,
+                    "description": query.excluded.description,
+                    "is_active": query.excluded.is_active,
+                    "category_id": query.excluded.category_id,
+                    "updated_at": query.excluded.updated_at,
+                },
+            )
+        else:
+            query = query.on_conflict_do_nothing(index_elements=[Subcategory.slug])
+        # xmax = 0 faqat yangi qo'shilgan qatorlarda bo'ladi
+        query = query.returning(Subcategory.id, Subcategory.slug, literal_column("xmax = 0").label("inserted"))
+
+        try:
+            result = await self.__session.execute(query)
+            returned = result.all()
+            await self.__session.commit()
+        except SQLAlchemyError:
+            # Keyingi chunklar shu sessiyada davom etadi
+            await self.__session.rollback()
+            raise
+
+        if returned:
+            await get_replica_router().wait_for_replicas()
+            await get_total_counter().invalidate(Subcategory)
+            await get_catalog_cache().invalidate("subcategory")
+            await get_catalog_cache().invalidate("category-tree")
+            items = {slug: item for _, item, slug in valid}
+            await get_autocomplete_index().publish(
+                "subcategory",
+                [(row.id, items[row.slug].name, row.slug, items[row.slug].is_active) for row in returned],
+            )
+
+        return results + chunk_results(valid, returned)
@@ -18,7 +18,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.controllers.auth import AuthController
 from app.core.datebases.postgres import get_general_session
-from app.api.schemas.user import Login, ResponseUser, CreateUser
+from app.core.datebases.replicas import get_read_session
+from app.api.models.user import User
+from app.api.schemas.user import Login, ResponseUser, CreateUser, UpdateUserStatus
+from app.api.utils.auth import AuthUtils
 
 router = APIRouter()
 
@@ -43,15 +46,37 @@ async def create_user(
 )
 async def get_users(
     session: AsyncSession = Depends(get_general_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ) -> List[ResponseUser]:
     
-    controller = AuthController(session)
+    controller = AuthController(session, read_session)
 
     users = await controller.get_users()
 
     return users
 
 
+@router.patch(
+    "/users/{user_id}/status",
+    response_model=ResponseUser,
+)
+async def update_user_status(
+    user_id: int,
+    data: UpdateUserStatus,
+    session: AsyncSession = Depends(get_general_session),
+    current_user: User = Depends(AuthUtils.get_current_admin_user),
+) -> ResponseUser:
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    controller = AuthController(session)
+
+    return await controller.update_user_status(user_id, data)
+
+
 @router.post(
     "/login",
     response_model=dict,
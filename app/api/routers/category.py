@@ -1,10 +1,12 @@
 from datetime import datetime
-from typing import Sequence, List, Optional, Any, Coroutine
+from typing import Sequence, List, Literal, Optional, Any, Coroutine, Union
 from fastapi import (
     APIRouter,
     Depends,
     Header,
     Query,
+    Request,
+    Response,
     status,
     HTTPException,
     Form,
@@ -16,27 +18,59 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.controllers.category import CategoryController
 from app.api.models.user import User
-from app.api.schemas.product import CategoryCreate, CategoryResponse, CategoryUpdate, SubcategoryCreate, ProductCreate, CategoryListResponse
+from app.api.schemas.product import ImportResponse, CategoryCreate, CategoryTreeResponse, CategoryResponse, CategoryUpdate, SubcategoryCreate, ProductCreate, CategoryListResponse, CategorySummaryListResponse
 
 from app.core.datebases.postgres import get_general_session
 from app.api.utils.auth import AuthUtils
+from app.api.utils.bulk_import import iter_import_rows
+from app.api.utils.http_cache import Validators, conditional_response, json_bytes_response, make_validators
+from app.core.settings import get_settings
+
+settings = get_settings()
 
 router = APIRouter()
 
 @router.get("/",
-    response_model=CategoryListResponse, 
+    response_model=Union[CategoryListResponse, CategorySummaryListResponse], 
     status_code=status.HTTP_200_OK
 )
 async def get_categories(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(None, description="Oldingi javobdagi next_cursor; berilsa page e'tiborga olinmaydi"),
+    view: Literal["full", "summary"] = Query("full", description="summary - description va vaqt maydonlarisiz qisqa ro'yxat"),
     controller: CategoryController = Depends(),
     session: AsyncSession = Depends(get_general_session),
     # current_user: User = Depends(AuthUtils.get_current_admin_user), 
     ):
     
+    if settings.CATALOG_FAST_JSON:
+        page_json = await controller.get_categories_json(page, size, cursor, view)
+        return json_bytes_response(request, page_json.body, page_json.validators, settings.CACHE_CONTROL_CATALOG_LIST)
+
+    categories = await controller.get_categories(page, size, cursor, view)
+    validators = make_validators(
+        ((category.id, category.updated_at) for category in categories.items),
+        categories.total, categories.page, categories.size, categories.next_cursor,
+    )
+    not_modified = conditional_response(request, response, validators, settings.CACHE_CONTROL_CATALOG_LIST)
+    if not_modified is not None:
+        return not_modified
+    return categories
+
+@router.get("/tree",
+    response_class=Response,
+    responses={status.HTTP_200_OK: {"model": List[CategoryTreeResponse]}, status.HTTP_304_NOT_MODIFIED: {}},
+)
+async def get_category_tree(
+    request: Request,
+    controller: CategoryController = Depends(),
+    ) -> Response:
     
-    return await controller.get_categories(page, size)
+    etag, body = await controller.get_category_tree()
+    return json_bytes_response(request, body, Validators(etag=etag), settings.CACHE_CONTROL_CATEGORY_TREE)
 
 @router.get("/{category_id}",
     response_model=CategoryResponse, 
@@ -44,13 +78,19 @@ async def get_categories(
 )
 async def get_category_by_id(
     category_id: int,
+    request: Request,
+    response: Response,
     controller: CategoryController = Depends(),
     session: AsyncSession = Depends(get_general_session),
     # current_user: User = Depends(AuthUtils.get_current_admin_user), 
     ) -> CategoryResponse:
     
-    
-    return await controller.get_category_by_id(category_id)
+    category = await controller.get_category_by_id(category_id)
+    validators = make_validators([(category.id, category.updated_at)])
+    not_modified = conditional_response(request, response, validators, settings.CACHE_CONTROL_CATALOG_DETAIL)
+    if not_modified is not None:
+        return not_modified
+    return category
 
 
 @router.post("/",
@@ -91,4 +131,101 @@ async def update_category(
             detail="You are not authorized to perform this action"
         )
 
-    return await controller.update_category(category_id, category)
\ No newline at end of file
+    return await controller.update_category(category_id, category)
+
+@router.post("/{category_id}/image",
+    response_model=CategoryResponse, 
+    status_code=status.HTTP_200_OK,
+    description=(
+        "Multipart tana handlerdan oldin to'liq qabul qilinadi (bufer). "
+        "Katta fayllar uchun /image/stream yoki /image/uploads ishlating."
+    ),
+)
+async def upload_category_image(
+    category_id: int,
+    file: UploadFile = File(...),
+    controller: CategoryController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> CategoryResponse:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    return await controller.upload_category_image(category_id, file)
+
+@router.post("/{category_id}/image/stream",
+    response_model=CategoryResponse, 
+    status_code=status.HTTP_200_OK,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"image/*": {"schema": {"type": "string", "format": "binary"}}},
+        },
+    },
+)
+async def stream_category_image(
+    category_id: int,
+    request: Request,
+    controller: CategoryController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> CategoryResponse:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    return await controller.stream_category_image(category_id, request)
+
+@router.post("/{category_id}/image/uploads/{upload_id}",
+    response_model=CategoryResponse, 
+    status_code=status.HTTP_200_OK
+)
+async def attach_category_image(
+    category_id: int,
+    upload_id: str,
+    controller: CategoryController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> CategoryResponse:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    return await controller.attach_category_image(category_id, upload_id)
+
+@router.post("/import",
+    response_model=ImportResponse,
+    status_code=status.HTTP_200_OK,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        },
+    },
+)
+async def import_categories(
+    request: Request,
+    update_existing: bool = Query(False, description="Slug mavjud bo'lsa yozuvni yangilash"),
+    chunk_size: int = Query(settings.BULK_IMPORT_CHUNK_SIZE, ge=1, le=2000),
+    controller: CategoryController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> ImportResponse:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    return await controller.import_categories(iter_import_rows(request), update_existing, chunk_size)
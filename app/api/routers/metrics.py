@@ -0,0 +1,32 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Response, status, HTTPException
+
+from app.api.controllers.metrics import MetricsController
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("",
+    status_code=status.HTTP_200_OK,
+    include_in_schema=False,
+)
+async def metrics(
+    authorization: Optional[str] = Header(None),
+    controller: MetricsController = Depends(),
+    ) -> Response:
+
+    expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+    if not hmac.compare_digest((authorization or "").encode(), expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+        )
+
+    return Response(controller.render(), media_type=PROMETHEUS_CONTENT_TYPE)
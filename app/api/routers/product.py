@@ -5,6 +5,8 @@ from fastapi import (
     Depends,
     Header,
     Query,
+    Request,
+    Response,
     status,
     HTTPException,
     Form,
@@ -15,6 +17,230 @@ from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.models.product.product import Product
+from app.api.models.user import User
 
 from app.core.datebases.postgres import get_general_session
 
+from app.api.controllers.product import ProductController
+from app.api.utils.auth import AuthUtils
+from app.api.utils.http_cache import cache_headers, conditional_response, is_conditional, is_not_modified, make_validators
+from app.core.settings import get_settings
+from app.api.schemas.product import AutocompleteResponse, ProductImageResponse, ProductListResponse, ProductResponse, ProductSearchFilters, ProductSearchResponse
+
+settings = get_settings()
+
+router = APIRouter()
+
+@router.get("/",
+    response_model=ProductListResponse, 
+    status_code=status.HTTP_200_OK
+)
+async def get_products(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Oldingi javobdagi next_cursor; berilsa page e'tiborga olinmaydi"),
+    subcategory_id: Optional[int] = Query(None),
+    controller: ProductController = Depends(),
+    ) -> ProductListResponse:
+    
+    products = await controller.get_products(page, size, cursor, subcategory_id)
+    versions = [(product.id, controller.product_version(product)) for product in products.items]
+    # Rasm/variatsiya sonlari: o'chirish updated_at'ni o'zgartirmaydi
+    validators = make_validators(
+        ((id, version.updated_at) for id, version in versions),
+        products.total, products.page, products.size, products.next_cursor,
+        [(version.images, version.variations) for _, version in versions],
+    )
+    not_modified = conditional_response(request, response, validators, settings.CACHE_CONTROL_CATALOG_LIST)
+    if not_modified is not None:
+        return not_modified
+    return products
+
+
+@router.get("/search",
+    response_model=ProductSearchResponse, 
+    status_code=status.HTTP_200_OK
+)
+async def search_products(
+    q: Optional[str] = Query(None, max_length=200, description="Nom, tavsif va kategoriya nomlari bo'yicha qidiruv"),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    subcategory_id: Optional[List[int]] = Query(None),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    min_width: Optional[float] = Query(None, ge=0),
+    max_width: Optional[float] = Query(None, ge=0),
+    min_height: Optional[float] = Query(None, ge=0),
+    max_height: Optional[float] = Query(None, ge=0),
+    min_depth: Optional[float] = Query(None, ge=0),
+    max_depth: Optional[float] = Query(None, ge=0),
+    color: Optional[List[str]] = Query(None),
+    material: Optional[List[str]] = Query(None),
+    variation_size: Optional[List[str]] = Query(None),
+    is_featured: Optional[bool] = Query(None),
+    sort: Optional[str] = Query(None, description="relevance (q bo'lsa standart), newest, price_asc yoki price_desc"),
+    controller: ProductController = Depends(),
+    ) -> ProductSearchResponse:
+    
+    filters = ProductSearchFilters(
+        q=q,
+        subcategory_id=subcategory_id,
+        min_price=min_price,
+        max_price=max_price,
+        min_width=min_width,
+        max_width=max_width,
+        min_height=min_height,
+        max_height=max_height,
+        min_depth=min_depth,
+        max_depth=max_depth,
+        color=color,
+        material=material,
+        variation_size=variation_size,
+        is_featured=is_featured,
+        sort=sort,
+    )
+    return await controller.search_products(filters, page, size)
+
+
+@router.get("/autocomplete",
+    response_model=AutocompleteResponse, 
+    status_code=status.HTTP_200_OK
+)
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+    kind: Optional[List[str]] = Query(None, description="category, subcategory yoki product"),
+    controller: ProductController = Depends(),
+    ) -> AutocompleteResponse:
+    
+    return await controller.autocomplete(q, limit, kind)
+
+
+@router.get("/autocomplete/stats",
+    status_code=status.HTTP_200_OK
+)
+async def autocomplete_stats(
+    controller: ProductController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> dict:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    return await controller.autocomplete_stats()
+
+
+@router.post("/{product_id}/images",
+    response_model=ProductImageResponse,
+    status_code=status.HTTP_201_CREATED,
+    description=(
+        "Multipart tana handlerdan oldin to'liq qabul qilinadi (bufer). "
+        "Katta fayllar uchun /images/stream yoki /images/uploads ishlating."
+    ),
+)
+async def upload_product_image(
+    product_id: int,
+    file: UploadFile = File(...),
+    alt_text: Optional[str] = Form(None),
+    is_primary: bool = Form(False),
+    display_order: int = Form(0),
+    controller: ProductController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> ProductImageResponse:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    return await controller.upload_product_image(product_id, file, alt_text, is_primary, display_order)
+
+
+@router.post("/{product_id}/images/stream",
+    response_model=ProductImageResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"image/*": {"schema": {"type": "string", "format": "binary"}}},
+        },
+    },
+)
+async def stream_product_image(
+    product_id: int,
+    request: Request,
+    alt_text: Optional[str] = Query(None),
+    is_primary: bool = Query(False),
+    display_order: int = Query(0),
+    controller: ProductController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> ProductImageResponse:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    return await controller.stream_product_image(product_id, request, alt_text, is_primary, display_order)
+
+
+@router.post("/{product_id}/images/uploads/{upload_id}",
+    response_model=ProductImageResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def attach_product_image(
+    product_id: int,
+    upload_id: str,
+    alt_text: Optional[str] = Query(None),
+    is_primary: bool = Query(False),
+    display_order: int = Query(0),
+    controller: ProductController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> ProductImageResponse:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    return await controller.attach_product_image(product_id, upload_id, alt_text, is_primary, display_order)
+
+
+@router.get("/{product_id}",
+    response_model=ProductResponse, 
+    status_code=status.HTTP_200_OK
+)
+async def get_product_by_id(
+    product_id: int,
+    request: Request,
+    response: Response,
+    controller: ProductController = Depends(),
+    ) -> ProductResponse:
+    
+    # Shartli so'rovda avval faqat versiya o'qiladi; o'zgarmagan bo'lsa rasmlar va variatsiyalar yuklanmaydi
+    if is_conditional(request):
+        version = await controller.get_product_version(product_id)
+        if version is not None:
+            validators = make_validators([(product_id, version.updated_at)], version.images, version.variations)
+            if is_not_modified(request, validators):
+                controller.record_view(product_id)
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers=cache_headers(validators, settings.CACHE_CONTROL_CATALOG_DETAIL),
+                )
+
+    product = await controller.get_product_by_id(product_id)
+    version = controller.product_version(product)
+    validators = make_validators([(product.id, version.updated_at)], version.images, version.variations)
+    not_modified = conditional_response(request, response, validators, settings.CACHE_CONTROL_CATALOG_DETAIL)
+    if not_modified is not None:
+        return not_modified
+    return product
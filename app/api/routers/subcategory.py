@@ -1,10 +1,12 @@
 from datetime import datetime
-from typing import Sequence, List, Optional, Any, Coroutine
+from typing import Sequence, List, Literal, Optional, Any, Coroutine, Union
 from fastapi import (
     APIRouter,
     Depends,
     Header,
     Query,
+    Request,
+    Response,
     status,
     HTTPException,
     Form,
@@ -16,24 +18,74 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.controllers.subcategory import SubcategoryController
 from app.api.models.user import User
-from app.api.schemas.product import SubcategoryBase, SubcategoryCreate, SubcategoryListResponse, SubcategoryResponse, SubcategoryUpdate
+from app.api.schemas.product import ImportResponse, SubcategoryBase, SubcategoryCreate, SubcategoryListResponse, SubcategorySummaryListResponse, SubcategoryResponse, SubcategoryUpdate
 
 from app.core.datebases.postgres import get_general_session
 from app.api.utils.auth import AuthUtils
+from app.api.utils.bulk_import import iter_import_rows
+from app.api.utils.http_cache import conditional_response, json_bytes_response, make_validators
+from app.core.settings import get_settings
+
+settings = get_settings()
 
 router = APIRouter()
 
 @router.get("/",
-    response_model=SubcategoryListResponse, 
+    response_model=Union[SubcategoryListResponse, SubcategorySummaryListResponse], 
     status_code=status.HTTP_200_OK
 )
 async def get_subcategories(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(None, description="Oldingi javobdagi next_cursor; berilsa page e'tiborga olinmaydi"),
+    view: Literal["full", "summary"] = Query("full", description="summary - description va vaqt maydonlarisiz qisqa ro'yxat"),
     controller: SubcategoryController = Depends(),
     session: AsyncSession = Depends(get_general_session),
     # current_user: User = Depends(AuthUtils.get_current_admin_user), 
     ):
     
+    if settings.CATALOG_FAST_JSON:
+        page_json = await controller.get_subcategories_json(page, size, cursor, view)
+        return json_bytes_response(request, page_json.body, page_json.validators, settings.CACHE_CONTROL_CATALOG_LIST)
+
+    subcategories = await controller.get_subcategories(page, size, cursor, view)
+    validators = make_validators(
+        ((subcategory.id, subcategory.updated_at) for subcategory in subcategories.items),
+        subcategories.total, subcategories.page, subcategories.size, subcategories.next_cursor,
+    )
+    not_modified = conditional_response(request, response, validators, settings.CACHE_CONTROL_CATALOG_LIST)
+    if not_modified is not None:
+        return not_modified
+    return subcategories
+
+@router.post("/import",
+    response_model=ImportResponse,
+    status_code=status.HTTP_200_OK,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        },
+    },
+)
+async def import_subcategories(
+    request: Request,
+    update_existing: bool = Query(False, description="Slug mavjud bo'lsa yozuvni yangilash"),
+    chunk_size: int = Query(settings.BULK_IMPORT_CHUNK_SIZE, ge=1, le=2000),
+    controller: SubcategoryController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> ImportResponse:
     
-    return await controller.get_subcategories(page, size)
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    return await controller.import_subcategories(iter_import_rows(request), update_existing, chunk_size)
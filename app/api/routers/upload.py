@@ -0,0 +1,108 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    Request,
+    Response,
+    status,
+    HTTPException,
+)
+
+from app.api.controllers.upload import UploadController
+from app.api.models.user import User
+from app.api.schemas.upload import UploadCreate, UploadSessionResponse
+from app.api.utils.auth import AuthUtils
+
+
+router = APIRouter()
+
+
+@router.post("/",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_upload(
+    upload: UploadCreate,
+    controller: UploadController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> UploadSessionResponse:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    return await controller.create_upload(upload)
+
+
+@router.get("/{upload_id}",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_upload(
+    upload_id: str,
+    response: Response,
+    controller: UploadController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> UploadSessionResponse:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    session = await controller.get_upload(upload_id)
+    # Uzilgan yuklash shu offsetdan davom ettiriladi
+    response.headers["Upload-Offset"] = str(session.offset)
+    response.headers["Cache-Control"] = "no-store"
+    return session
+
+
+@router.patch("/{upload_id}",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_200_OK,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/offset+octet-stream": {"schema": {"type": "string", "format": "binary"}}},
+        },
+    },
+)
+async def append_upload(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., ge=0, description="Bo'lak boshlanadigan joriy offset"),
+    controller: UploadController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> UploadSessionResponse:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    session = await controller.append_upload(upload_id, upload_offset, request)
+    response.headers["Upload-Offset"] = str(session.offset)
+    return session
+
+
+@router.delete("/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def delete_upload(
+    upload_id: str,
+    controller: UploadController = Depends(),
+    current_user: User = Depends(AuthUtils.get_current_admin_user), 
+    ) -> None:
+    
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to perform this action"
+        )
+
+    await controller.delete_upload(upload_id)
@@ -4,15 +4,24 @@ from pydantic import BaseModel, Field, validator
 from fastapi import Query
 
 
+class ImageVariant(BaseModel):
+    path: str
+    width: int
+    height: int
+    format: str
+    size: int
+
+
 class CategoryBase(BaseModel):
-    name: str
+    # Uzunliklar ustunlarga mos (String(255)): import qatori bazada emas, shu yerda rad etiladi
+    name: str = Field(..., max_length=255)
     description: Optional[str] = None
     is_active: bool = True
-    slug: Optional[str] = None
+    slug: Optional[str] = Field(None, max_length=255)
 
 
 class SubcategoryBase(BaseModel):
-    name: str
+    name: str = Field(..., max_length=255)
     description: Optional[str] = None
     is_active: bool = True
     category_id: int
@@ -55,7 +64,7 @@ class ProductVariationBase(BaseModel):
 
 
 class CategoryCreate(CategoryBase):
-    image: Optional[str] = None
+    image: Optional[str] = Field(None, max_length=255)
 
 
 class SubcategoryCreate(SubcategoryBase):
@@ -127,6 +136,7 @@ class CategoryResponse(CategoryBase):
     id: int
     slug: str
     image: Optional[str] = None
+    image_variants: Optional[List[ImageVariant]] = None
     created_at: datetime
     updated_at: datetime
 
@@ -147,6 +157,9 @@ class SubcategoryResponse(SubcategoryBase):
 class ProductImageResponse(ProductImageBase):
     id: int
     product_id: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: Optional[List[ImageVariant]] = None
     created_at: datetime
     updated_at: datetime
 
@@ -183,6 +196,15 @@ class CategoryDetailResponse(CategoryResponse):
         from_attributes = True
 
 
+class SubcategoryTreeResponse(SubcategoryResponse):
+    product_count: int = 0
+
+
+class CategoryTreeResponse(CategoryDetailResponse):
+    product_count: int = 0
+    subcategories: List[SubcategoryTreeResponse] = []
+
+
 class SubcategoryDetailResponse(SubcategoryResponse):
     category: CategoryResponse
     products: List[ProductResponse] = []
@@ -194,9 +216,10 @@ class SubcategoryDetailResponse(SubcategoryResponse):
 class CategoryListResponse(BaseModel):
     items: List[CategoryResponse]
     total: int
-    page: int
+    page: Optional[int] = None
     size: int
     pages: int
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -205,25 +228,147 @@ class CategoryListResponse(BaseModel):
 class SubcategoryListResponse(BaseModel):
     items: List[SubcategoryResponse]
     total: int
-    page: int
+    page: Optional[int] = None
     size: int
     pages: int
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
+class CategorySummaryResponse(BaseModel):
+    id: int
+    name: str
+    slug: str
+    image: Optional[str] = None
+    image_variants: Optional[List[ImageVariant]] = None
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SubcategorySummaryResponse(BaseModel):
+    id: int
+    name: str
+    slug: str
+    category_id: int
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CategorySummaryListResponse(BaseModel):
+    items: List[CategorySummaryResponse]
+    total: int
+    page: Optional[int] = None
+    size: int
+    pages: int
+    next_cursor: Optional[str] = None
+
+
+class SubcategorySummaryListResponse(BaseModel):
+    items: List[SubcategorySummaryResponse]
+    total: int
+    page: Optional[int] = None
+    size: int
+    pages: int
+    next_cursor: Optional[str] = None
+
+
 class ProductListResponse(BaseModel):
+    items: List[ProductResponse]
+    total: int
+    page: Optional[int] = None
+    size: int
+    pages: int
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ProductSearchFilters(BaseModel):
+    q: Optional[str] = None
+    subcategory_id: Optional[List[int]] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_width: Optional[float] = None
+    max_width: Optional[float] = None
+    min_height: Optional[float] = None
+    max_height: Optional[float] = None
+    min_depth: Optional[float] = None
+    max_depth: Optional[float] = None
+    color: Optional[List[str]] = None
+    material: Optional[List[str]] = None
+    variation_size: Optional[List[str]] = None
+    is_featured: Optional[bool] = None
+    sort: Optional[str] = None
+
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+
+class PriceFacet(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    count: int = 0
+
+
+class ProductFacets(BaseModel):
+    subcategory_id: List[FacetValue] = []
+    color: List[FacetValue] = []
+    material: List[FacetValue] = []
+    variation_size: List[FacetValue] = []
+    is_featured: List[FacetValue] = []
+    price: PriceFacet = PriceFacet()
+
+
+class ProductSearchResponse(BaseModel):
     items: List[ProductResponse]
     total: int
     page: int
     size: int
     pages: int
+    facets: ProductFacets
+
+
+class AutocompleteSuggestion(BaseModel):
+    kind: str
+    id: int
+    name: str
+    slug: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
+class AutocompleteResponse(BaseModel):
+    query: str
+    suggestions: List[AutocompleteSuggestion]
+
+
+class ImportRowResult(BaseModel):
+    index: int
+    status: str
+    id: Optional[int] = None
+    slug: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class ImportResponse(BaseModel):
+    total: int
+    created: int
+    updated: int
+    skipped: int
+    failed: int
+    results: List[ImportRowResult]
+
+
 class PaginationParams(BaseModel):
     page: int = Query(1, ge=1, description="Page number")
     size: int = Query(10, ge=1, le=100, description="Items per page")
\ No newline at end of file
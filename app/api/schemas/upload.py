@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+
+class UploadCreate(BaseModel):
+    size: int = Field(..., gt=0, description="Faylning to'liq hajmi (bayt)")
+
+class UploadSessionResponse(BaseModel):
+    upload_id: str
+    size: int
+    offset: int
+    created_at: float
@@ -25,4 +25,7 @@ class ResponseUser(BaseModel):
 
 class Login(BaseModel):
     email: str
-    password: str
\ No newline at end of file
+    password: str
+
+class UpdateUserStatus(BaseModel):
+    is_active: bool
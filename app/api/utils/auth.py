@@ -1,27 +1,27 @@
-import bcrypt
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
 import jwt
 from app.api.models.user import User
+from app.api.utils.password import get_password_hasher
+from app.api.utils.revocation import get_revocation_list
+from app.api.utils.token import get_token_verifier
+from app.core.cache import get_auth_cache
 from app.core.datebases.postgres import get_general_session
-from app.core.settings import Settings
+from app.core.settings import get_settings
 from sqlalchemy.ext.asyncio import AsyncSession
 
-settings = Settings()
+settings = get_settings()
 
 
 class AuthUtils:
     @classmethod
     async def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
-        )
+        return await get_password_hasher().verify(plain_password, hashed_password)
 
     @classmethod
     async def get_password_hash(cls, password: str) -> str:
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        return await get_password_hasher().hash(password)
 
     @classmethod
     async def create_access_token(cls, data: dict, expired_minute: int = 1440) -> str:
@@ -43,11 +43,8 @@ class AuthUtils:
         token: str = Depends(OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")),
     ) -> dict:
         try:
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=settings.ALGORITHM
-            )
-            return payload
-        except JWTError:
+            return get_token_verifier().verify(token)
+        except jwt.PyJWTError:
             raise HTTPException(
                 status_code=401, detail="Could not validate credentials"
             )
@@ -57,11 +54,8 @@ class AuthUtils:
         token: str,
     ) -> dict:
         try:
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=settings.ALGORITHM
-            )
-            return payload
-        except JWTError:
+            return get_token_verifier().verify(token)
+        except jwt.PyJWTError:
             raise HTTPException(
                 status_code=401, detail="Could not validate credentials"
             )
@@ -77,13 +71,10 @@ class AuthUtils:
                 status_code=401, detail="Access token not found")
 
         try:
-            payload = jwt.decode(
-                access_token, settings.SECRET_KEY, algorithms=settings.ALGORITHM
-            )
-            return payload
-        except JWTError:
+            return get_token_verifier().verify(access_token)
+        except jwt.PyJWTError:
             raise HTTPException(
-                status_code=401, detail="Could not validate credentials {e}"
+                status_code=401, detail="Could not validate credentials"
             )
 
     # @staticmethod
@@ -132,16 +123,57 @@ class AuthUtils:
         request: Request,
         session: AsyncSession = Depends(get_general_session),
     ) -> User:
+        payload = await cls.get_current_user_from_cookie(request)
         try:
-            payload = await cls.get_current_user_from_cookie(request)
-
             admin_id = int(payload["sub"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=401, detail="Could not validate credentials"
+            )
+
+        if settings.AUTH_ADMIN_MODE == "database":
             admin = await session.get(User, admin_id)
             if not admin:
                 raise HTTPException(status_code=404, detail="Admin not found")
-
+            if not admin.is_active:
+                raise HTTPException(status_code=401, detail="Foydalanuvchi bloklangan")
             return admin
-        except JWTError:
-            raise HTTPException(
-                status_code=401, detail="Could not validate credentials"
+
+        if await get_revocation_list().is_revoked(admin_id):
+            raise HTTPException(status_code=401, detail="Foydalanuvchi bloklangan")
+
+        if settings.AUTH_USER_STATUS_TTL > 0:
+            user_status = await get_auth_cache().get_or_load(
+                "user-status",
+                admin_id,
+                lambda: cls._load_user_status(session, admin_id),
             )
+            if not user_status:
+                raise HTTPException(status_code=404, detail="Admin not found")
+        else:
+            user_status = {
+                "id": admin_id,
+                "email": payload.get("email"),
+                "full_name": payload.get("full_name"),
+                "is_admin": bool(payload.get("is_admin")),
+                "is_active": bool(payload.get("is_active")),
+            }
+
+        if not user_status["is_active"]:
+            raise HTTPException(status_code=401, detail="Foydalanuvchi bloklangan")
+
+        # Sessiyaga qo'shilmagan User: routerlar faqat is_admin va id ni o'qiydi
+        return User(**user_status)
+
+    @staticmethod
+    async def _load_user_status(session: AsyncSession, user_id: int) -> dict:
+        user = await session.get(User, user_id)
+        if user is None:
+            return {}
+        return {
+            "id": user.id,
+            "email": user.email,
+            "full_name": user.full_name,
+            "is_admin": user.is_admin,
+            "is_active": user.is_active,
+        }
@@ -0,0 +1,361 @@
+import asyncio
+import heapq
+import json
+import logging
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+
+from app.api.models.product.product import Category, Product, Subcategory
+from app.api.utils.text_search import WORD, normalize, to_latin
+from app.core.cache import CacheBackend, get_cache_backend
+from app.core.datebases.replicas import get_replica_router
+from app.core.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+KINDS = ("category", "subcategory", "product")
+
+# Tanlangan (featured) mahsulotlar boshlang'ich reytingi
+FEATURED_POPULARITY = 10.0
+
+# Prefiks shuncha terminidan ko'p bo'lsa, diapazon o'rniga reyting tartibida qidiriladi
+DENSE_RANGE = 2000
+
+# Har bir upsert saralangan ro'yxatlarni siljitadi (memmove), qayta qurish esa
+# har bir yozuvni Python darajasida qayta ishlaydi; taxminan shuncha qatordan
+# ko'p yangilanishni bitta qayta qurish bilan qo'llash arzonroq
+BULK_REBUILD_ROWS = 1000
+
+
+@dataclass(slots=True)
+class Suggestion:
+    kind: str
+    id: int
+    name: str
+    slug: Optional[str]
+    popularity: float
+    terms: Tuple[str, ...] = ()
+    # Reyting bali (popularity + ko'rishlar): yozuv indeksga qo'yilganda qotiriladi
+    score: float = 0.0
+
+
+def index_terms(name: str) -> Tuple[str, ...]:
+    """Nomning har bir so'zidan boshlanadigan qismlari (lotin yozuvida).
+
+    "Yumshoq divan" -> ("yumshoq divan", "divan"), shuning uchun "div" ham,
+    "yumshoq d" ham topadi.
+    """
+    words = WORD.findall(to_latin(normalize(name)))
+    return tuple(dict.fromkeys(" ".join(words[position:]) for position in range(len(words))))
+
+
+def query_term(query: str) -> str:
+    return " ".join(WORD.findall(to_latin(normalize(query))))
+
+
+class AutocompleteIndex:
+    """Mahsulot, kategoriya va subkategoriya nomlari bo'yicha xotiradagi prefiks indeks.
+
+    Terminlar saralangan ro'yxatda (yonida yozuvning o'ziga havola bilan)
+    saqlanadi va prefiks diapazoni bisect bilan topiladi. Tor diapazonda
+    barcha moslar ko'rib chiqiladi; "d" kabi keng prefikslarda esa yozuvlar
+    reyting tartibida ko'riladi va limit to'lganda to'xtaydi.
+    Bir xil terminlar (kind, id) tartibida, _ranked esa yagona reyting kaliti
+    bo'yicha saralangan, shuning uchun yozuvni qo'shish va olib tashlash ham
+    ro'yxatni ko'rib chiqmasdan bisect bilan bajariladi.
+    Startupda bazadan quriladi, create/update/import paytida yozuvlar
+    yangilanadi va backend pub/sub orqali boshqa workerlarga tarqatiladi;
+    BULK_REBUILD_ROWS'dan ko'p qatorli xabar bitta qayta qurish bilan qo'llanadi.
+    API'dan tashqari o'zgarishlar refresh_interval sayin qayta qurish bilan
+    olinadi. Ko'rishlar soni (record_hit) faqat shu workerda hisoblanadi va
+    reytingga qayta qurishda (yoki yozuv yangilanganda) qo'shiladi: _ranked
+    doim saralangan qoladi.
+    """
+
+    def __init__(
+            self,
+            backend: CacheBackend,
+            channel: str,
+            refresh_interval: float,
+            result_cache_size: int,
+            result_cache_ttl: float,
+        ):
+        self.backend = backend
+        self.channel = channel
+        self.refresh_interval = refresh_interval
+        self.result_cache_size = result_cache_size
+        self.result_cache_ttl = result_cache_ttl
+
+        self._entries: Dict[Tuple[str, int], Suggestion] = {}
+        self._terms: List[str] = []
+        self._refs: List[Suggestion] = []
+        self._hits: Dict[Tuple[str, int], int] = {}
+        self._ranked: List[Suggestion] = []
+        self._results: "OrderedDict[tuple, Tuple[float, List[Suggestion]]]" = OrderedDict()
+
+        self._subscribed = False
+        self._refresher: Optional[asyncio.Task] = None
+        self.built_at: Optional[float] = None
+        self.build_seconds = 0.0
+        self.lookups = 0
+        self.result_cache_hits = 0
+
+    async def start(self) -> None:
+        if not self._subscribed:
+            await self.backend.subscribe(self.channel, self._on_message)
+            self._subscribed = True
+        try:
+            await self.rebuild()
+        except Exception:
+            # Baza hali tayyor bo'lmasa ilova baribir ishga tushadi, indeks keyin quriladi
+            logger.exception("Autocomplete index build failed")
+        if self.refresh_interval > 0 and self._refresher is None:
+            self._refresher = asyncio.create_task(self._run_refresh())
+
+    async def stop(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+
+    async def _run_refresh(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Autocomplete index refresh failed")
+
+    async def rebuild(self) -> None:
+        started = time.perf_counter()
+        async with get_replica_router().session_maker()() as session:
+            entries = await self._load(session)
+        self.load(entries)
+        self.build_seconds = time.perf_counter() - started
+
+    @staticmethod
+    async def _load(session) -> List[Suggestion]:
+        products = await session.execute(
+            select(Product.id, Product.name, Product.slug, Product.is_featured)
+            .where(Product.is_active == True)
+        )
+        subcategories = await session.execute(
+            select(Subcategory.id, Subcategory.name, Subcategory.slug, func.count(Product.id))
+            .outerjoin(Product, (Product.subcategory_id == Subcategory.id) & (Product.is_active == True))
+            .where(Subcategory.is_active == True)
+            .group_by(Subcategory.id)
+        )
+        categories = await session.execute(
+            select(Category.id, Category.name, Category.slug, func.count(Product.id))
+            .outerjoin(Subcategory, Subcategory.category_id == Category.id)
+            .outerjoin(Product, (Product.subcategory_id == Subcategory.id) & (Product.is_active == True))
+            .where(Category.is_active == True)
+            .group_by(Category.id)
+        )
+
+        entries = [
+            Suggestion("product", id, name, slug, FEATURED_POPULARITY if is_featured else 0.0)
+            for id, name, slug, is_featured in products
+        ]
+        # Kategoriyalar ichidagi faol mahsulotlar soni bo'yicha reytinglanadi
+        entries += [Suggestion("subcategory", *row) for row in subcategories]
+        entries += [Suggestion("category", *row) for row in categories]
+        return entries
+
+    def load(self, entries: Iterable[Suggestion]) -> None:
+        new_entries: Dict[Tuple[str, int], Suggestion] = {}
+        pairs: List[Tuple[str, int]] = []
+        for entry in entries:
+            entry.popularity = float(entry.popularity or 0)
+            entry.terms = index_terms(entry.name)
+            entry.score = self._score(entry)
+            new_entries[(entry.kind, entry.id)] = entry
+        # Bir xil terminlar ichida (kind, id) tartibi: upsert/remove shunga tayanadi
+        refs = sorted(new_entries.values(), key=self._entry_key)
+        for position, entry in enumerate(refs):
+            pairs.extend((term, position) for term in entry.terms)
+        pairs.sort()
+
+        self._entries = new_entries
+        self._terms = [term for term, _ in pairs]
+        self._refs = [refs[position] for _, position in pairs]
+        # Ko'rishlar hisobga olingan tartib; keyingi ko'rishlar qayta qurishda qo'shiladi
+        self._ranked = sorted(refs, key=self._rank_key)
+        self._results.clear()
+        self.built_at = time.time()
+
+    def upsert(self, kind: str, id: int, name: str, slug: Optional[str], popularity: Optional[float] = None) -> None:
+        key = (kind, id)
+        current = self._entries.get(key)
+        if popularity is None:
+            popularity = current.popularity if current is not None else 0.0
+        if current is not None:
+            self._remove_entry(current)
+
+        entry = Suggestion(kind, id, name, slug, float(popularity), index_terms(name))
+        entry.score = self._score(entry)
+        self._entries[key] = entry
+        for term in entry.terms:
+            position = self._term_position(term, entry)
+            self._terms.insert(position, term)
+            self._refs.insert(position, entry)
+        self._ranked.insert(bisect_left(self._ranked, self._rank_key(entry), key=self._rank_key), entry)
+        self._results.clear()
+
+    def remove(self, kind: str, id: int) -> None:
+        entry = self._entries.pop((kind, id), None)
+        if entry is not None:
+            self._remove_entry(entry)
+            self._results.clear()
+
+    def _remove_entry(self, entry: Suggestion) -> None:
+        # entry.score indeksda turgan paytda o'zgarmaydi, shuning uchun kalit joyini aniq ko'rsatadi
+        position = bisect_left(self._ranked, self._rank_key(entry), key=self._rank_key)
+        if position < len(self._ranked) and self._ranked[position] is entry:
+            del self._ranked[position]
+        for term in entry.terms:
+            position = self._term_position(term, entry)
+            if position < len(self._refs) and self._refs[position] is entry:
+                del self._terms[position]
+                del self._refs[position]
+
+    def _term_position(self, term: str, entry: Suggestion) -> int:
+        low = bisect_left(self._terms, term)
+        high = bisect_right(self._terms, term, low)
+        return bisect_left(self._refs, self._entry_key(entry), low, high, key=self._entry_key)
+
+    def record_hit(self, kind: str, id: int) -> None:
+        key = (kind, id)
+        self._hits[key] = self._hits.get(key, 0) + 1
+
+    def _score(self, entry: Suggestion) -> float:
+        return entry.popularity + self._hits.get((entry.kind, entry.id), 0)
+
+    @staticmethod
+    def _entry_key(entry: Suggestion) -> Tuple[str, int]:
+        return entry.kind, entry.id
+
+    @staticmethod
+    def _rank_key(entry: Suggestion) -> Tuple[float, int, str, int]:
+        # O'sish tartibida saralash uchun: avval eng ommabop, keyin eng qisqa nom;
+        # (kind, id) kalitni yagona qiladi
+        return -entry.score, len(entry.name), entry.kind, entry.id
+
+    def search(self, query: str, limit: int = 8, kinds: Optional[Sequence[str]] = None) -> List[Suggestion]:
+        self.lookups += 1
+        prefix = query_term(query)
+        if not prefix:
+            return []
+
+        cache_key = (prefix, limit, tuple(sorted(kinds)) if kinds else None)
+        cached = self._results.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < self.result_cache_ttl:
+            self._results.move_to_end(cache_key)
+            self.result_cache_hits += 1
+            return cached[1]
+
+        start = bisect_left(self._terms, prefix)
+        end = bisect_left(self._terms, prefix + "\uffff", start)
+        if end - start > DENSE_RANGE:
+            result = []
+            for entry in self._ranked:
+                if (not kinds or entry.kind in kinds) and any(term.startswith(prefix) for term in entry.terms):
+                    result.append(entry)
+                    if len(result) == limit:
+                        break
+        else:
+            matched = {id(entry): entry for entry in self._refs[start:end] if not kinds or entry.kind in kinds}
+            result = heapq.nsmallest(limit, matched.values(), key=self._rank_key)
+
+        self._results[cache_key] = (time.monotonic(), result)
+        if len(self._results) > self.result_cache_size:
+            self._results.popitem(last=False)
+        return result
+
+    async def publish(self, kind: str, rows: Iterable[Tuple[int, str, Optional[str], bool]]) -> None:
+        """Yozuvlarni lokal indeksga qo'llaydi va boshqa workerlarga yuboradi.
+
+        rows: (id, name, slug, is_active); nofaol yozuvlar indeksdan olib tashlanadi.
+        """
+        rows = [list(row) for row in rows]
+        if not rows:
+            return
+        message = json.dumps({"kind": kind, "rows": rows})
+        self._on_message(message)
+        try:
+            await self.backend.publish(self.channel, message)
+        except Exception:
+            logger.exception("Autocomplete update publish failed")
+
+    def _on_message(self, message: str) -> None:
+        payload = json.loads(message)
+        kind = payload["kind"]
+        if len(payload["rows"]) > BULK_REBUILD_ROWS:
+            self._apply_bulk(kind, payload["rows"])
+            return
+        for id, name, slug, is_active in payload["rows"]:
+            if is_active:
+                current = self._entries.get((kind, id))
+                if current is None or current.name != name or current.slug != slug:
+                    self.upsert(kind, id, name, slug)
+            else:
+                self.remove(kind, id)
+
+    def _apply_bulk(self, kind: str, rows: List[list]) -> None:
+        entries = dict(self._entries)
+        for id, name, slug, is_active in rows:
+            current = entries.pop((kind, id), None)
+            if is_active:
+                popularity = current.popularity if current is not None else 0.0
+                entries[(kind, id)] = Suggestion(kind, id, name, slug, popularity)
+        built_at = self.built_at
+        self.load(entries.values())
+        # Bazadan to'liq qurilish vaqti o'zgarmaydi
+        self.built_at = built_at
+
+    def memory_bytes(self) -> int:
+        """Taxminiy hajm: ro'yxatlar, tuplelar, satrlar va yozuv obyektlari."""
+        size = sum(
+            sys.getsizeof(container)
+            for container in (self._terms, self._refs, self._entries, self._hits, self._ranked)
+        )
+        for term in self._terms:
+            size += sys.getsizeof(term)
+        for entry in self._entries.values():
+            size += sys.getsizeof(entry) + sys.getsizeof(entry.name) + sys.getsizeof(entry.terms)
+            if entry.slug is not None:
+                size += sys.getsizeof(entry.slug)
+        return size
+
+    def stats(self) -> dict:
+        counts = {kind: 0 for kind in KINDS}
+        for kind, _ in self._entries:
+            counts[kind] = counts.get(kind, 0) + 1
+        return {
+            "entries": counts,
+            "terms": len(self._terms),
+            "memory_bytes": self.memory_bytes(),
+            "built_at": self.built_at,
+            "build_seconds": round(self.build_seconds, 4),
+            "lookups": self.lookups,
+            "result_cache_hits": self.result_cache_hits,
+            "result_cache_size": len(self._results),
+        }
+
+
+@cache
+def get_autocomplete_index() -> AutocompleteIndex:
+    return AutocompleteIndex(
+        backend=get_cache_backend(),
+        channel=f"{settings.CACHE_KEY_PREFIX}:autocomplete",
+        refresh_interval=settings.AUTOCOMPLETE_REFRESH_INTERVAL,
+        result_cache_size=settings.AUTOCOMPLETE_RESULT_CACHE_SIZE,
+        result_cache_ttl=settings.AUTOCOMPLETE_RESULT_CACHE_TTL,
+    )
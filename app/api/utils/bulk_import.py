@@ -0,0 +1,194 @@
+import codecs
+import csv
+import io
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from slugify import slugify
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api.schemas.product import ImportResponse, ImportRowResult
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+CSV_TYPES = ("text/csv", "application/csv")
+
+ImportChunk = List[Tuple[int, BaseModel, str]]
+
+# Category.slug va Subcategory.slug ustunlari uzunligi
+SLUG_MAX_LENGTH = 255
+
+logger = logging.getLogger(__name__)
+
+
+async def iter_import_rows(request: Request) -> AsyncIterator[Tuple[Optional[dict], Optional[str]]]:
+    """So'rov tanasidan qatorlarni (row, error) ko'rinishida qaytaradi.
+
+    NDJSON va CSV oqim sifatida o'qiladi, butun fayl xotiraga yuklanmaydi;
+    JSON massiv esa bir martada o'qiladi.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in NDJSON_TYPES:
+        async for line in _iter_lines(request):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield None, "JSON qatori noto'g'ri"
+                continue
+            if isinstance(row, dict):
+                yield row, None
+            else:
+                yield None, "Qator obyekt bo'lishi kerak"
+
+    elif content_type in CSV_TYPES:
+        header = None
+        async for record in _iter_csv_records(request):
+            if header is None:
+                header = [column.strip() for column in record]
+                continue
+            if not any(value.strip() for value in record):
+                continue
+            if len(record) != len(header):
+                yield None, "Ustunlar soni sarlavhaga mos emas"
+                continue
+            yield {key: (value if value != "" else None) for key, value in zip(header, record)}, None
+
+    elif content_type == "application/json":
+        try:
+            rows = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="JSON noto'g'ri")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="JSON massiv kutilgan")
+        for row in rows:
+            if isinstance(row, dict):
+                yield row, None
+            else:
+                yield None, "Qator obyekt bo'lishi kerak"
+
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="application/json, application/x-ndjson yoki text/csv kutilgan",
+        )
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _iter_csv_records(request: Request) -> AsyncIterator[List[str]]:
+    # Qo'shtirnoq ichidagi yangi qator yozuvni bo'lmasligi uchun qo'shtirnoqlar
+    # soni juft bo'lguncha qatorlar yig'iladi ("" ham juftlikni buzmaydi)
+    buffer = ""
+    async for line in _iter_lines(request):
+        buffer = f"{buffer}\n{line}" if buffer else line
+        if buffer.count('"') % 2:
+            continue
+        yield next(csv.reader(io.StringIO(buffer)), [])
+        buffer = ""
+    if buffer:
+        yield next(csv.reader(io.StringIO(buffer)), [])
+
+
+async def run_import(
+        rows: AsyncIterator[Tuple[Optional[dict], Optional[str]]],
+        schema: Type[BaseModel],
+        write_chunk: Callable[[ImportChunk], Awaitable[List[ImportRowResult]]],
+        chunk_size: int,
+    ) -> ImportResponse:
+    results: List[ImportRowResult] = []
+    seen_slugs = set()
+    chunk: ImportChunk = []
+
+    index = 0
+    async for raw, error in rows:
+        if error is None:
+            try:
+                item = schema.model_validate(raw)
+            except ValidationError as e:
+                first = e.errors()[0]
+                error = f"{'.'.join(map(str, first['loc']))}: {first['msg']}"
+
+        if error is None:
+            slug = slugify(getattr(item, "slug", None) or item.name, max_length=SLUG_MAX_LENGTH)
+            if not slug:
+                error = "Nomidan slug hosil bo'lmadi"
+            elif slug in seen_slugs:
+                results.append(ImportRowResult(index=index, status="skipped", slug=slug, detail="Importda takrorlangan slug"))
+            else:
+                seen_slugs.add(slug)
+                chunk.append((index, item, slug))
+
+        if error is not None:
+            results.append(ImportRowResult(index=index, status="error", detail=error))
+
+        index += 1
+        if len(chunk) >= chunk_size:
+            results.extend(await _write_chunk(write_chunk, chunk))
+            chunk = []
+
+    if chunk:
+        results.extend(await _write_chunk(write_chunk, chunk))
+
+    results.sort(key=lambda result: result.index)
+    counts = {"created": 0, "updated": 0, "skipped": 0, "error": 0}
+    for result in results:
+        counts[result.status] += 1
+
+    return ImportResponse(
+        total=len(results),
+        created=counts["created"],
+        updated=counts["updated"],
+        skipped=counts["skipped"],
+        failed=counts["error"],
+        results=results,
+    )
+
+
+async def _write_chunk(
+        write_chunk: Callable[[ImportChunk], Awaitable[List[ImportRowResult]]],
+        chunk: ImportChunk,
+    ) -> List[ImportRowResult]:
+    # Oldingi chunklar allaqachon commit qilingan: xato faqat shu chunk qatorlariga yoziladi
+    try:
+        return await write_chunk(chunk)
+    except SQLAlchemyError:
+        logger.exception("Import chunk of %d rows failed", len(chunk))
+        return [
+            ImportRowResult(index=index, status="error", slug=slug, detail="Bazaga yozishda xato")
+            for index, _, slug in chunk
+        ]
+
+
+def chunk_results(chunk: ImportChunk, returned) -> List[ImportRowResult]:
+    """INSERT ... RETURNING id, slug, inserted natijasini qatorlarga moslaydi."""
+    by_slug = {row.slug: row for row in returned}
+    results = []
+    for index, _, slug in chunk:
+        row = by_slug.get(slug)
+        if row is None:
+            results.append(ImportRowResult(index=index, status="skipped", slug=slug, detail="Bu slug bazada mavjud"))
+        else:
+            results.append(ImportRowResult(
+                index=index,
+                status="created" if row.inserted else "updated",
+                id=row.id,
+                slug=slug,
+            ))
+    return results
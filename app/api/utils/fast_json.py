@@ -0,0 +1,55 @@
+from typing import Any, List, NamedTuple, Optional, Type
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from app.api.utils.http_cache import Validators, make_validators
+from app.core.cache import register_cache_types
+from app.api.utils.pagination import next_cursor
+
+try:
+    import orjson
+except ImportError:  # orjson ixtiyoriy; bo'lmasa pydantic_core serializatori ishlatiladi
+    orjson = None
+
+
+class JSONPage(NamedTuple):
+    body: bytes
+    validators: Validators
+
+
+register_cache_types(JSONPage, Validators)
+
+
+def dumps(value: Any) -> bytes:
+    # Ikkalasi ham FastAPI bilan bir xil ko'rinishda yozadi: naive datetime ISO 8601, bo'sh joysiz
+    if orjson is not None:
+        return orjson.dumps(value)
+    return to_json(value)
+
+
+def response_columns(model, schema: Type[BaseModel]) -> list:
+    """Sxema maydonlari tartibida ORM ustunlari: qatorlar to'g'ridan-to'g'ri dict bo'ladi."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def page_payload(rows: list, schema: Type[BaseModel], total: int, page: int, size: int, cursor: Optional[str]) -> dict:
+    """*ListResponse bilan bir xil tuzilmadagi dict; Pydantic obyektlari yaratilmaydi."""
+    # zip qo'shimcha ustunlarni (masalan, total oynasi) tashlab yuboradi
+    fields = tuple(schema.model_fields)
+    return {
+        "items": [dict(zip(fields, row)) for row in rows[:size]],
+        "total": total,
+        "page": page if cursor is None else None,
+        "size": size,
+        "pages": (total + size - 1) // size if total > 0 else 0,
+        "next_cursor": next_cursor(rows, size),
+    }
+
+
+def json_page(payload: dict) -> JSONPage:
+    validators = make_validators(
+        ((item["id"], item["updated_at"]) for item in payload["items"]),
+        payload["total"], payload["page"], payload["size"], payload["next_cursor"],
+    )
+    return JSONPage(body=dumps(payload), validators=validators)
@@ -0,0 +1,113 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response, status
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match sarlavhasi berilgan ETag bilan mos keladimi (zaif taqqoslash)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag.removeprefix("W/") for candidate in candidates)
+
+
+def latest(*values: Optional[datetime]) -> Optional[datetime]:
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+def make_validators(versions: Iterable[Tuple[Any, Optional[datetime]]], *extra: Any) -> Validators:
+    """(id, updated_at) juftlari va javobga ta'sir qiluvchi boshqa qiymatlardan validatorlar.
+
+    Ro'yxatlar uchun extra'ga total/page/next_cursor beriladi: yozuv o'chirilsa
+    updated_at'lar o'zgarmasa ham ETag o'zgaradi. Bunday o'zgarish eng so'nggi
+    updated_at'da ko'rinmaydi, shuning uchun extra berilganda Last-Modified
+    qo'yilmaydi va If-Modified-Since bo'yicha 304 qaytarilmaydi (faqat ETag).
+    """
+    versions = list(versions)
+    digest = hashlib.blake2b(digest_size=16)
+    for id, updated_at in versions:
+        digest.update(f"{id}:{updated_at.isoformat() if updated_at else ''};".encode())
+    digest.update(repr(extra).encode())
+    return Validators(
+        etag=f'W/"{digest.hexdigest()}"',
+        last_modified=None if extra else latest(*(updated_at for _, updated_at in versions)),
+    )
+
+
+def http_date(value: datetime) -> str:
+    # updated_at ustunlari datetime.utcnow() bilan yoziladi (naive UTC)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    # If-None-Match bo'lsa If-Modified-Since e'tiborga olinmaydi (RFC 9110, 13.1.3)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, validators.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or validators.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    last_modified = validators.last_modified
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP-date soniya aniqligida
+    return last_modified.replace(microsecond=0) <= since
+
+
+def cache_headers(validators: Validators, cache_control: str) -> dict:
+    headers = {"ETag": validators.etag, "Cache-Control": cache_control}
+    if validators.last_modified is not None:
+        headers["Last-Modified"] = http_date(validators.last_modified)
+    return headers
+
+
+def conditional_response(
+        request: Request,
+        response: Response,
+        validators: Validators,
+        cache_control: str,
+    ) -> Optional[Response]:
+    """Validator sarlavhalarini qo'yadi; klientdagi nusxa eskirmagan bo'lsa 304 qaytaradi."""
+    headers = cache_headers(validators, cache_control)
+    if is_not_modified(request, validators):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def json_bytes_response(
+        request: Request,
+        body: bytes,
+        validators: Validators,
+        cache_control: str,
+    ) -> Response:
+    """Oldindan serializatsiya qilingan JSON uchun javob (response_model qayta tekshirilmaydi)."""
+    headers = cache_headers(validators, cache_control)
+    if is_not_modified(request, validators):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
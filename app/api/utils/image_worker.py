@@ -0,0 +1,112 @@
+"""Alohida processda bajariladigan rasm ishlovi.
+
+Modul faqat Pillow va stdlib'ni import qiladi: spawn qilingan worker ilova
+sozlamalari va bazaga ulanmaydi.
+"""
+import json
+import os
+import warnings
+from typing import Dict, Sequence
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+PIL_FORMATS = {"webp": "WEBP", "avif": "AVIF", "jpeg": "JPEG"}
+
+# JPEG shaffoflikni saqlamaydi: alfa kanal shu rang ustiga yotqiziladi
+JPEG_BACKGROUND = (255, 255, 255)
+
+
+def flatten(image: Image.Image) -> Image.Image:
+    background = Image.new("RGB", image.size, JPEG_BACKGROUND)
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+
+def save_options(fmt: str, quality: int) -> dict:
+    if fmt == "webp":
+        return {"quality": quality, "method": 4}
+    if fmt == "avif":
+        return {"quality": quality, "speed": 6}
+    return {"quality": quality, "optimize": True, "progressive": True}
+
+
+def manifest_path(directory: str, digest: str) -> str:
+    return os.path.join(directory, f"{digest[:24]}.json")
+
+
+def process_image(
+        source: str,
+        digest: str,
+        directory: str,
+        widths: Sequence[int],
+        formats: Sequence[str],
+        qualities: Dict[str, int],
+        max_pixels: int,
+    ) -> dict:
+    """Diskdagi rasmni kengliklar bo'yicha kichraytiradi va har bir formatda saqlaydi.
+
+    EXIF orientatsiyasi piksellarga qo'llanadi, EXIF/ICC/XMP esa yozilmaydi.
+    Shaffof rasm JPEG'da oq fon ustiga yotqizilib saqlanadi.
+    Fayl nomlari yuklash paytida hisoblangan sha256 (digest) dan olinadi;
+    natija manifest sifatida yoziladi va bir xil rasm qayta yuklansa
+    dekodlanmasdan o'sha manifest qaytariladi. Rasm ochilmasa ValueError.
+    """
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            with Image.open(source) as opened:
+                image = ImageOps.exif_transpose(opened)
+                image.load()
+    except UnidentifiedImageError:
+        raise ValueError("Rasm formati aniqlanmadi") from None
+    except (Image.DecompressionBombWarning, Image.DecompressionBombError):
+        raise ValueError(f"Rasm {max_pixels} pikseldan katta bo'lmasligi kerak") from None
+    except OSError as exc:
+        raise ValueError(f"Rasm buzilgan: {exc}") from None
+
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+    image.info = {}
+
+    width, height = image.size
+    name = digest[:24]
+    os.makedirs(directory, exist_ok=True)
+
+    variants = []
+    # Asl o'lchamdan katta kengliklar kattalashtirilmaydi
+    for target in sorted({min(value, width) for value in widths}):
+        if target == width:
+            resized = image
+        else:
+            resized = image.resize((target, max(1, round(height * target / width))), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            path = os.path.join(directory, f"{name}-{target}.{fmt}")
+            if not os.path.exists(path):
+                output = flatten(resized) if fmt == "jpeg" and has_alpha else resized
+                temporary = f"{path}.{os.getpid()}.tmp"
+                output.save(temporary, format=PIL_FORMATS[fmt], **save_options(fmt, qualities.get(fmt, 80)))
+                os.replace(temporary, path)
+            variants.append({
+                "path": path,
+                "width": resized.width,
+                "height": resized.height,
+                "format": fmt,
+                "size": os.path.getsize(path),
+            })
+
+    result = {
+        "width": width,
+        "height": height,
+        "source_size": os.path.getsize(source),
+        "widths": list(widths),
+        "formats": list(formats),
+        "variants": variants,
+    }
+    # Manifest oxirida yoziladi: u mavjud bo'lsa barcha variantlar tayyor
+    manifest = manifest_path(directory, digest)
+    temporary = f"{manifest}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(result, file)
+    os.replace(temporary, manifest)
+    return result
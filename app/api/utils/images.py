@@ -0,0 +1,199 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from PIL import features
+
+from app.api.utils.image_worker import PIL_FORMATS, manifest_path, process_image
+from app.core.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+MEDIA_ROOT = "media"
+
+
+def supported_formats(formats: Sequence[str]) -> List[str]:
+    result = []
+    for fmt in formats:
+        if fmt not in PIL_FORMATS:
+            raise ValueError(f"Unknown image format: {fmt}")
+        if fmt in ("webp", "avif") and not features.check(fmt):
+            logger.warning("Pillow %s formatini qo'llab-quvvatlamaydi, o'tkazib yuboriladi", fmt)
+            continue
+        result.append(fmt)
+    # Hech bo'lmasa bitta format bo'lishi kerak: JPEG har doim mavjud
+    return result or ["jpeg"]
+
+
+class ImageProcessor:
+    """Yuklangan rasmlarni alohida process poolda qayta ishlaydi (event loop bloklanmaydi).
+
+    Pool birinchi yuklashda ishga tushadi. Navbat to'lsa yoki kutish
+    queue_timeout'dan oshsa 503 qaytariladi. Shu kontent (sha256) shu
+    sozlamalar bilan avval ishlangan bo'lsa natija manifestdan olinadi.
+    """
+
+    def __init__(
+            self,
+            max_workers: int,
+            max_queue: int,
+            queue_timeout: float,
+            widths: Sequence[int],
+            formats: Sequence[str],
+            qualities: Dict[str, int],
+            max_pixels: int,
+        ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.widths = tuple(sorted(widths))
+        self.formats = tuple(supported_formats(formats))
+        self.qualities = dict(qualities)
+        self.max_pixels = max_pixels
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore = asyncio.Semaphore(max_workers)
+
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.deduplicated = 0
+        self.total_seconds = 0.0
+        self.source_bytes = 0
+        self.output_bytes = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # fork event loop va DB ulanishlarini nusxalaydi, shuning uchun spawn
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _read_manifest(self, path: str) -> Optional[dict]:
+        try:
+            with open(path) as file:
+                result = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if tuple(result.get("widths", ())) != self.widths or tuple(result.get("formats", ())) != self.formats:
+            return None
+        return result
+
+    async def process(self, source: str, digest: str, folder: str) -> dict:
+        """source: yuklangan faylning diskdagi yo'li, digest: uning sha256 hex qiymati."""
+        directory = os.path.join(MEDIA_ROOT, folder)
+        loop = asyncio.get_running_loop()
+        existing = await loop.run_in_executor(None, self._read_manifest, manifest_path(directory, digest))
+        if existing is not None:
+            self.deduplicated += 1
+            return existing
+
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise self._busy()
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise self._busy()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(
+                self._get_executor(),
+                process_image,
+                source,
+                digest,
+                directory,
+                self.widths,
+                self.formats,
+                self.qualities,
+                self.max_pixels,
+            )
+        except ValueError as exc:
+            self.failed += 1
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+        self.completed += 1
+        self.total_seconds += time.perf_counter() - started
+        self.source_bytes += result["source_size"]
+        self.output_bytes += sum(variant["size"] for variant in result["variants"])
+        return result
+
+    @staticmethod
+    def primary_variant(result: dict) -> dict:
+        """image_path uchun: birinchi formatdagi eng katta variant."""
+        if not result["variants"]:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Rasmdan birorta variant yaratilmadi")
+        preferred = result["variants"][0]["format"]
+        return max(
+            (variant for variant in result["variants"] if variant["format"] == preferred),
+            key=lambda variant: variant["width"],
+        )
+
+    @staticmethod
+    def _busy() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server band, birozdan keyin qayta urinib ko'ring",
+            headers={"Retry-After": "5"},
+        )
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "widths": self.widths,
+            "formats": self.formats,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "deduplicated": self.deduplicated,
+            "total_seconds": self.total_seconds,
+            "source_bytes": self.source_bytes,
+            "output_bytes": self.output_bytes,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+@cache
+def get_image_processor() -> ImageProcessor:
+    return ImageProcessor(
+        max_workers=settings.IMAGE_WORKERS,
+        max_queue=settings.IMAGE_MAX_QUEUE,
+        queue_timeout=settings.IMAGE_QUEUE_TIMEOUT,
+        widths=[int(width) for width in settings.IMAGE_WIDTHS.split(",") if width.strip()],
+        formats=[fmt.strip() for fmt in settings.IMAGE_FORMATS.split(",") if fmt.strip()],
+        qualities={
+            "webp": settings.IMAGE_WEBP_QUALITY,
+            "avif": settings.IMAGE_AVIF_QUALITY,
+            "jpeg": settings.IMAGE_JPEG_QUALITY,
+        },
+        max_pixels=settings.IMAGE_MAX_PIXELS,
+    )
+
@@ -0,0 +1,165 @@
+import os
+import re
+from collections import OrderedDict
+from functools import cache
+from typing import NamedTuple, Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.api.utils.images import MEDIA_ROOT
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+# process_image nomlari: {sha256[:24]}-{kenglik}.{format} va {sha256[:24]}.json manifest.
+# Kontent o'zgarsa nom ham o'zgaradi, shuning uchun bunday fayllar immutable.
+HASHED_NAME = re.compile(r"^[0-9a-f]{24}(-\d+)?\.[a-z0-9]+$")
+
+# Tugallanmagan yuklashlar (UploadStore) tashqariga berilmaydi
+PRIVATE_DIRS = ("uploads",)
+
+
+def is_immutable(path: str) -> bool:
+    name = os.path.basename(path)
+    # {digest}.json manifest o'lchamlar/formatlar o'zgarsa qayta yoziladi
+    return not name.endswith(".json") and HASHED_NAME.match(name) is not None
+
+
+class CachedFile(NamedTuple):
+    body: bytes
+    headers: Headers
+
+
+class MediaFiles(StaticFiles):
+    """/media uchun StaticFiles: kesh sarlavhalari, kichik fayllar keshi va nginx offload.
+
+    Kontent xeshli nomlar "immutable" Cache-Control va nomdan olingan ETag
+    bilan beriladi (mtime'ga bog'liq emas, barcha serverlarda bir xil).
+    Shunday fayllardan memory_cache_max_file'dan kichiklari (thumbnaillar)
+    xotirada LRU bo'yicha saqlanadi va stat/thread poolsiz qaytariladi.
+    Range, If-Range va http.response.pathsend (server qo'llasa) FileResponse
+    orqali ishlaydi. accel_redirect berilsa fayl tanasini nginx yuboradi
+    (X-Accel-Redirect, sendfile), ilova faqat sarlavhalarni hisoblaydi.
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            cache_control: str,
+            immutable_cache_control: str,
+            memory_cache_bytes: int,
+            memory_cache_max_file: int,
+            accel_redirect: Optional[str] = None,
+        ):
+        super().__init__(directory=directory)
+        self.cache_control = cache_control
+        self.immutable_cache_control = immutable_cache_control
+        self.memory_cache_bytes = memory_cache_bytes
+        self.memory_cache_max_file = memory_cache_max_file
+        self.accel_redirect = accel_redirect.rstrip("/") + "/" if accel_redirect else None
+
+        self._memory: "OrderedDict[str, CachedFile]" = OrderedDict()
+        self._memory_size = 0
+        self.memory_hits = 0
+        self.memory_misses = 0
+        self.not_modified = 0
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if path.split(os.sep, 1)[0] in PRIVATE_DIRS:
+            raise HTTPException(status_code=404)
+
+        request_headers = Headers(scope=scope)
+        cacheable = (
+            self.memory_cache_bytes > 0
+            and scope["method"] in ("GET", "HEAD")
+            and "range" not in request_headers
+            and is_immutable(path)
+        )
+        if cacheable:
+            cached = self._memory.get(path)
+            if cached is not None:
+                self._memory.move_to_end(path)
+                self.memory_hits += 1
+                if self.is_not_modified(cached.headers, request_headers):
+                    self.not_modified += 1
+                    return NotModifiedResponse(cached.headers)
+                return Response(cached.body, headers=dict(cached.headers))
+
+        response = await super().get_response(path, scope)
+
+        if (
+            cacheable
+            and isinstance(response, FileResponse)
+            and response.stat_result is not None
+            and response.stat_result.st_size <= self.memory_cache_max_file
+        ):
+            self.memory_misses += 1
+            body = await anyio.Path(response.path).read_bytes()
+            self._remember(path, CachedFile(body, Headers(raw=response.raw_headers)))
+        return response
+
+    def _remember(self, path: str, cached: CachedFile) -> None:
+        previous = self._memory.pop(path, None)
+        if previous is not None:
+            self._memory_size -= len(previous.body)
+        self._memory[path] = cached
+        self._memory_size += len(cached.body)
+        while self._memory_size > self.memory_cache_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted.body)
+
+    def file_response(
+            self,
+            full_path,
+            stat_result: os.stat_result,
+            scope: Scope,
+            status_code: int = 200,
+        ) -> Response:
+        request_headers = Headers(scope=scope)
+        name = os.path.basename(full_path)
+        if is_immutable(name):
+            headers = {"Cache-Control": self.immutable_cache_control, "ETag": f'"{name}"'}
+        else:
+            headers = {"Cache-Control": self.cache_control}
+
+        response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, request_headers):
+            self.not_modified += 1
+            return NotModifiedResponse(response.headers)
+
+        if self.accel_redirect is not None:
+            relative = os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, "/")
+            accel_headers = {
+                key: value for key, value in response.headers.items()
+                if key in ("cache-control", "etag", "last-modified", "content-type")
+            }
+            accel_headers["X-Accel-Redirect"] = self.accel_redirect + relative
+            # Tana, Content-Length va Range'ni nginx o'zi beradi
+            return Response(status_code=status_code, headers=accel_headers)
+        return response
+
+    def stats(self) -> dict:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_size,
+            "memory_hits": self.memory_hits,
+            "memory_misses": self.memory_misses,
+            "not_modified": self.not_modified,
+        }
+
+
+@cache
+def get_media_files() -> MediaFiles:
+    return MediaFiles(
+        directory=MEDIA_ROOT,
+        cache_control=settings.MEDIA_CACHE_CONTROL,
+        immutable_cache_control=settings.MEDIA_IMMUTABLE_CACHE_CONTROL,
+        memory_cache_bytes=settings.MEDIA_MEMORY_CACHE_BYTES,
+        memory_cache_max_file=settings.MEDIA_MEMORY_CACHE_MAX_FILE,
+        accel_redirect=settings.MEDIA_ACCEL_REDIRECT,
+    )
@@ -0,0 +1,55 @@
+import base64
+import json
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.utils.total_count import get_total_counter
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor noto'g'ri",
+        )
+
+
+def next_cursor(rows: list, size: int) -> Optional[str]:
+    # So'rov size + 1 qator bilan yuboriladi: ortiqcha qator keyingi sahifa borligini bildiradi
+    if len(rows) <= size:
+        return None
+    return encode_cursor(rows[size - 1].id)
+
+
+async def fetch_page(session: AsyncSession, model, columns: list, page: int, size: int, cursor: Optional[str]) -> Tuple[list, int]:
+    """id bo'yicha sahifa (size + 1 qator) va umumiy son; faqat berilgan ustunlar o'qiladi."""
+    query = select(*columns).order_by(model.id).limit(size + 1)
+    if cursor is not None:
+        query = query.where(model.id > decode_cursor(cursor))
+    else:
+        query = query.offset((page - 1) * size)
+
+    total_counter = get_total_counter()
+    use_window = total_counter.use_window and cursor is None
+    if use_window:
+        query = query.add_columns(func.count().over().label("total"))
+
+    rows = (await session.execute(query)).all()
+    if use_window and rows:
+        total = rows[0].total
+        await total_counter.store(model, total)
+    else:
+        total = await total_counter.count(session, model)
+    return rows, total
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Optional
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+
+class PasswordHasher:
+    """bcrypt ishlarini event loopdan tashqarida, cheklangan thread poolda bajaradi.
+
+    Slot thread ishi haqiqatan tugaganda bo'shaydi: klient uzilib so'rov bekor
+    qilinsa ham bcrypt davom etayotgan bo'lsa, u concurrency chegarasida
+    hisoblanadi. Pool birinchi ishda yaratiladi va shutdown'dan keyin qayta
+    yaratiladi (bir processda bir nechta create_app).
+    """
+
+    def __init__(
+            self,
+            max_workers: int,
+            max_concurrency: int,
+            max_queue: int,
+            queue_timeout: float,
+        ):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_waiting_seen = 0
+        self.total_wait_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt())
+        return hashed.decode("utf-8")
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            bcrypt.checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
+
+    async def _run(self, func, *args):
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise self._busy()
+
+        self.waiting += 1
+        self.max_waiting_seen = max(self.max_waiting_seen, self.waiting)
+        started = time.perf_counter()
+        semaphore = self._semaphore
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise self._busy()
+        finally:
+            self.waiting -= 1
+        self.total_wait_seconds += time.perf_counter() - started
+
+        self.in_flight += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._finish(semaphore)
+            raise
+        future.add_done_callback(lambda _: self._finish_threadsafe(loop, semaphore))
+        # Bekor qilinsa boshlanmagan ish navbatdan olinadi, boshlangani esa oxirigacha slotni band qiladi
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    def _finish_threadsafe(self, loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore) -> None:
+        try:
+            loop.call_soon_threadsafe(self._finish, semaphore)
+        except RuntimeError:
+            # Event loop yopilgan (shutdown): hisoblagichlar endi kerak emas
+            pass
+
+    def _finish(self, semaphore: asyncio.Semaphore) -> None:
+        self.in_flight -= 1
+        self.completed += 1
+        semaphore.release()
+
+    @staticmethod
+    def _busy() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server band, birozdan keyin qayta urinib ko'ring",
+            headers={"Retry-After": "1"},
+        )
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_waiting_seen": self.max_waiting_seen,
+            "total_wait_seconds": self.total_wait_seconds,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        # Semaphore oldingi event loopga bog'langan bo'lishi mumkin
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+
+@cache
+def get_password_hasher() -> PasswordHasher:
+    return PasswordHasher(
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+        max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+        queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+    )
@@ -0,0 +1,97 @@
+import logging
+import time
+from functools import cache
+from typing import Dict
+
+from app.core.cache import CacheBackend, get_cache_backend
+from app.core.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """Bloklangan foydalanuvchilar ro'yxati; token claimlariga ishonilganda tekshiriladi.
+
+    Ro'yxat backendda tartiblangan to'plam (a'zo - user id, ball - muddat
+    tugash vaqti) sifatida saqlanadi: bloklash va tiklash ZADD/ZREM bilan
+    atomar, shuning uchun bir vaqtda yozayotgan workerlar bir-birining
+    o'zgarishini yo'qotmaydi. Har bir workerda lokal nusxa bor: tekshirish
+    bazaga ham, backendga ham bormaydi. O'zgarishlar pub/sub orqali darhol
+    tarqaladi, lokal nusxa esa refresh_interval sayin backenddan to'liq
+    almashtiriladi (xabar yo'qolsa yoki worker keyin ishga tushsa). Backend
+    ishlamay qolsa oxirgi lokal nusxa bilan ishlash davom etadi.
+    """
+
+    def __init__(self, backend: CacheBackend, prefix: str, ttl: float, refresh_interval: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.key = f"{prefix}:revoked-users"
+        self.channel = f"{prefix}:revoked-users"
+
+        self._revoked: Dict[int, float] = {}
+        self._refreshed_at = 0.0
+        self._subscribed = False
+
+        self.errors = 0
+
+    async def start(self) -> None:
+        if not self._subscribed:
+            await self.backend.subscribe(self.channel, self._on_message)
+            self._subscribed = True
+        await self.refresh()
+
+    def _on_message(self, message: str) -> None:
+        action, _, user_id = message.partition(":")
+        if action == "revoke":
+            self._revoked[int(user_id)] = time.time() + self.ttl
+        else:
+            self._revoked.pop(int(user_id), None)
+
+    async def refresh(self) -> None:
+        stored = await self.backend.zrangebyscore(self.key, time.time())
+        self._revoked = {int(user_id): expires for user_id, expires in stored.items()}
+        self._refreshed_at = time.monotonic()
+
+    async def is_revoked(self, user_id: int) -> bool:
+        if time.monotonic() - self._refreshed_at > self.refresh_interval:
+            try:
+                await self.refresh()
+            except Exception:
+                # Keyingi urinish refresh_interval'dan keyin; hozircha lokal nusxa
+                self.errors += 1
+                self._refreshed_at = time.monotonic()
+                logger.exception("Revocation list refresh failed, using the local copy")
+        expires = self._revoked.get(user_id)
+        return expires is not None and expires > time.time()
+
+    async def revoke(self, user_id: int) -> None:
+        now = time.time()
+        expires = now + self.ttl
+        await self.backend.zadd(self.key, str(user_id), expires)
+        await self.backend.zremrangebyscore(self.key, now)
+        self._revoked[user_id] = expires
+        await self.backend.publish(self.channel, f"revoke:{user_id}")
+
+    async def restore(self, user_id: int) -> None:
+        await self.backend.zrem(self.key, str(user_id))
+        self._revoked.pop(user_id, None)
+        await self.backend.publish(self.channel, f"restore:{user_id}")
+
+    def stats(self) -> dict:
+        return {"revoked": len(self._revoked), "errors": self.errors}
+
+
+@cache
+def get_revocation_list() -> RevocationList:
+    return RevocationList(
+        backend=get_cache_backend(),
+        prefix=settings.CACHE_KEY_PREFIX,
+        # Refresh token ham shu kalit bilan imzolanadi, shuning uchun eng uzoq muddat olinadi
+        ttl=max(
+            settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+        ),
+        refresh_interval=settings.AUTH_REVOCATION_REFRESH_INTERVAL,
+    )
@@ -0,0 +1,80 @@
+import time
+from typing import Any, Mapping
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import get_request_metrics
+
+# Hech bir route'ga mos kelmagan so'rovlar (404, skanerlar) bitta label ostida:
+# aks holda har bir tasodifiy yo'l yangi vaqt qatori yaratadi
+UNMATCHED_ROUTE = "unmatched"
+
+# Boshqa metodlar "OTHER" deb yoziladi (label soni cheklangan qoladi)
+HTTP_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+
+def route_template(path_format: str, path: str, path_params: Mapping[str, Any]) -> str:
+    """To'liq route shabloni, masalan "/api/v1/product/{product_id}".
+
+    Router prefiksi route.path_format'ga qo'shilmagan bo'lishi mumkin, shuning
+    uchun prefiks haqiqiy yo'ldan (shablonning path_params bilan to'ldirilgan
+    ko'rinishini olib tashlab) tiklanadi.
+    """
+    try:
+        concrete = path_format.format(**path_params)
+    except (KeyError, IndexError, ValueError):
+        return path_format
+    if path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + path_format
+    return path_format
+
+
+def route_label(scope: Scope, root_path: str) -> str:
+    """So'rov bajarilgandan keyingi scope bo'yicha route label'i."""
+    route = scope.get("route")
+    if route is not None:
+        return route_template(route.path_format, scope["path"], scope.get("path_params", {}))
+    # Mount (masalan /media) scope["route"] qo'ymaydi, faqat root_path'ni uzaytiradi
+    mounted = scope.get("root_path", "")
+    if mounted != root_path and mounted.startswith(root_path):
+        return mounted[len(root_path):] + "/{path}"
+    return UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """Har bir HTTP so'rov uchun status va davomiylikni RouteMetrics'ga yozadi.
+
+    Eng tashqi middleware sifatida ulanadi: 404, /media, CORS rad etgan
+    so'rovlar va ilova xatolari ham hisobga olinadi. Route label'i so'rov
+    tugagandan keyin scope["route"]dan olinadi; route oldindan ma'lum
+    bo'lmagani uchun in-flight bitta umumiy gauge.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.registry = get_request_metrics()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        root_path = scope.get("root_path", "")
+        # Javob boshlanmasdan chiqqan xato ServerErrorMiddleware'dagi kabi 500
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.registry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.in_flight -= 1
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+            metrics = self.registry.route(method, route_label(scope, root_path))
+            metrics.finish(status_code, time.perf_counter() - started)
@@ -0,0 +1,67 @@
+import re
+from typing import List, Optional
+
+# Kirill -> lotin (o'zbek lotin alifbosi asosida, rus harflari ham qo'shilgan)
+CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo",
+    "ж": "j", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "x", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "",
+    "ы": "i", "ь": "", "э": "e", "ю": "yu", "я": "ya", "ў": "o'", "қ": "q",
+    "ғ": "g'", "ҳ": "h",
+}
+
+# Lotin -> kirill; ikki harfli birikmalar birinchi tekshiriladi
+LATIN_TO_CYRILLIC = [
+    ("o'", "ў"), ("g'", "ғ"), ("sh", "ш"), ("ch", "ч"), ("yo", "ё"), ("yu", "ю"),
+    ("ya", "я"), ("ts", "ц"),
+    ("a", "а"), ("b", "б"), ("v", "в"), ("g", "г"), ("d", "д"), ("e", "е"),
+    ("j", "ж"), ("z", "з"), ("i", "и"), ("y", "й"), ("k", "к"), ("l", "л"),
+    ("m", "м"), ("n", "н"), ("o", "о"), ("p", "п"), ("r", "р"), ("s", "с"),
+    ("t", "т"), ("u", "у"), ("f", "ф"), ("x", "х"), ("q", "қ"), ("h", "ҳ"),
+    ("c", "к"), ("w", "в"),
+]
+
+APOSTROPHES = re.compile(r"[ʻʼ‘’`´]")
+WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    return APOSTROPHES.sub("'", text.lower()).strip()
+
+
+def to_latin(text: str) -> str:
+    return "".join(CYRILLIC_TO_LATIN.get(char, char) for char in text)
+
+
+def to_cyrillic(text: str) -> str:
+    result = []
+    position = 0
+    while position < len(text):
+        for latin, cyrillic in LATIN_TO_CYRILLIC:
+            if text.startswith(latin, position):
+                result.append(cyrillic)
+                position += len(latin)
+                break
+        else:
+            result.append(text[position])
+            position += 1
+    return "".join(result)
+
+
+def search_variants(query: str) -> List[str]:
+    """So'rovning o'zi va uning boshqa yozuvdagi (lotin/kirill) ko'rinishlari."""
+    normalized = normalize(query)
+    variants = []
+    for variant in (normalized, to_latin(normalized), to_cyrillic(normalized)):
+        if variant and variant not in variants:
+            variants.append(variant)
+    return variants
+
+
+def prefix_tsquery(text: str) -> Optional[str]:
+    """to_tsquery uchun xavfsiz ifoda: har bir so'z prefiks sifatida, AND bilan."""
+    words = WORD.findall(text)
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
@@ -0,0 +1,73 @@
+import hashlib
+import time
+from collections import OrderedDict
+from functools import cache
+
+import jwt
+
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+
+class TokenVerifier:
+    """JWT tekshiruvchi: kalit va algoritm bir marta tayyorlanadi, tekshirilgan
+    payloadlar esa token hashi bo'yicha uning exp vaqtigacha keshlanadi."""
+
+    def __init__(self, secret_key: str, algorithm: str, maxsize: int):
+        self.algorithm = algorithm
+        self.maxsize = maxsize
+        self._algorithms = [algorithm]
+        # Noto'g'ri ALGORITHM ishga tushishdayoq xato beradi
+        self._key = jwt.get_algorithm_by_name(algorithm).prepare_key(secret_key)
+        self._jwt = jwt.PyJWT()
+        self._cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.evictions = 0
+
+    def verify(self, token: str) -> dict:
+        cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+        entry = self._cache.get(cache_key)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._cache.move_to_end(cache_key)
+                self.hits += 1
+                return dict(entry[1])
+            del self._cache[cache_key]
+
+        self.misses += 1
+        try:
+            payload = self._jwt.decode(token, self._key, algorithms=self._algorithms)
+        except jwt.PyJWTError:
+            self.failures += 1
+            raise
+
+        expires = payload.get("exp")
+        if expires is not None:
+            self._cache[cache_key] = (float(expires), payload)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        return dict(payload)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "failures": self.failures,
+            "evictions": self.evictions,
+        }
+
+
+@cache
+def get_token_verifier() -> TokenVerifier:
+    return TokenVerifier(
+        secret_key=settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+        maxsize=settings.AUTH_TOKEN_CACHE_SIZE,
+    )
@@ -0,0 +1,111 @@
+import logging
+from functools import cache
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import VersionedCache, get_catalog_cache
+from app.core.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+TOTAL_STRATEGIES = ("exact", "cached", "estimate", "window")
+
+
+class TotalCounter:
+    """Ro'yxat endpointlari uchun umumiy sonni (total) hisoblash strategiyasi.
+
+    exact    - har so'rovda COUNT(*)
+    cached   - COUNT(*) natijasi TTL davomida katalog keshida saqlanadi
+    estimate - katta jadvallar uchun pg_class.reltuples bahosi
+    window   - total sahifa so'rovining o'zida COUNT(*) OVER () bilan olinadi
+
+    Katalog keshi o'chirilgan bo'lsa cached amalda exact bo'ladi: bu
+    yaratilishda log qilinadi va stats()'da ko'rinadi.
+
+    count()'ga berilgan shartlar (masalan, faqat faol qatorlar) exact va
+    cached sanashga qo'shiladi; estimate bahosi esa butun jadval bo'yicha.
+    Bitta model uchun shartlar har doim bir xil bo'lishi kerak: kesh kaliti
+    modelga bog'langan.
+    """
+
+    def __init__(self, strategy: str, ttl: float, estimate_threshold: int, cache: VersionedCache):
+        if strategy not in TOTAL_STRATEGIES:
+            raise ValueError(f"Unknown total count strategy: {strategy}")
+        self.strategy = strategy
+        self.ttl = ttl
+        self.estimate_threshold = estimate_threshold
+        self.cache = cache
+        self.effective_strategy = strategy
+        if strategy == "cached" and not cache.enabled:
+            self.effective_strategy = "exact"
+            logger.warning(
+                "LIST_TOTAL_STRATEGY=cached needs CATALOG_CACHE_ENABLED; totals use an exact COUNT(*) on every request"
+            )
+
+    @property
+    def use_window(self) -> bool:
+        return self.strategy == "window"
+
+    def _namespace(self, model) -> str:
+        return f"total:{model.__tablename__}"
+
+    async def count(self, session: AsyncSession, model, *conditions) -> int:
+        if self.effective_strategy == "exact":
+            return await self._exact(session, model, *conditions)
+        return await self.cache.get_or_load(
+            self._namespace(model),
+            "count",
+            lambda: self._load(session, model, *conditions),
+            ttl=self.ttl,
+        )
+
+    async def _load(self, session: AsyncSession, model, *conditions) -> int:
+        total = None
+        if self.strategy == "estimate":
+            total = await self._estimate(session, model.__tablename__)
+        if total is None:
+            total = await self._exact(session, model, *conditions)
+        return total
+
+    async def store(self, model, total: int) -> None:
+        if self.effective_strategy != "exact":
+            await self.cache.set(self._namespace(model), "count", total, ttl=self.ttl)
+
+    async def invalidate(self, *models) -> None:
+        if self.effective_strategy != "exact":
+            for model in models:
+                await self.cache.invalidate(self._namespace(model))
+
+    async def _exact(self, session: AsyncSession, model, *conditions) -> int:
+        total = await session.scalar(select(func.count()).select_from(model).where(*conditions))
+        return total or 0
+
+    async def _estimate(self, session: AsyncSession, table: str):
+        # reltuples ANALYZE/VACUUMdan keyin yangilanadi; kichik yoki hali tahlil
+        # qilinmagan jadvallarda aniq COUNT(*) arzon, shuning uchun unga qaytamiz
+        estimate = await session.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": table},
+        )
+        if estimate is None or estimate < self.estimate_threshold:
+            return None
+        return int(estimate)
+
+    def stats(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "effective_strategy": self.effective_strategy,
+            "fallback_to_exact": self.effective_strategy != self.strategy,
+        }
+
+
+@cache
+def get_total_counter() -> TotalCounter:
+    return TotalCounter(
+        strategy=settings.LIST_TOTAL_STRATEGY,
+        ttl=settings.LIST_TOTAL_CACHE_TTL,
+        estimate_threshold=settings.LIST_TOTAL_ESTIMATE_THRESHOLD,
+        cache=get_catalog_cache(),
+    )
@@ -0,0 +1,332 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager
+from functools import cache
+from typing import AsyncIterable, AsyncIterator, BinaryIO, NamedTuple, Optional
+
+from fastapi import HTTPException, Request, UploadFile, status
+
+from app.api.utils.images import MEDIA_ROOT
+from app.core.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+UPLOAD_ROOT = os.path.join(MEDIA_ROOT, "uploads")
+UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# sha256 tugallangan sessiya faylidan shu hajmdagi bo'laklar bilan hisoblanadi
+HASH_READ_SIZE = 1024 * 1024
+
+
+class StoredUpload(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+
+
+def _write_chunk(file: BinaryIO, digest: Optional["hashlib._Hash"], data: bytes) -> None:
+    # Thread poolda bajariladi; hashlib katta buferlarda GIL'ni bo'shatadi
+    if digest is not None:
+        digest.update(data)
+    file.write(data)
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(HASH_READ_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _open_locked(part: str) -> BinaryIO:
+    """Sessiya faylini ochib flock bilan qulflaydi; qulf fayl yopilganda bo'shaydi."""
+    try:
+        # O_CREAT yo'q: o'chirilgan sessiya qayta yaratilmaydi
+        fd = os.open(part, os.O_WRONLY | os.O_APPEND)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found") from None
+    file = os.fdopen(fd, "ab")
+    try:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        file.close()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Yuklash boshqa so'rovda ishlanmoqda",
+        ) from None
+    return file
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def iter_upload_file(file: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+class UploadStore:
+    """Yuklanayotgan fayllarni xotirada to'plamasdan media/uploads ga yozadi.
+
+    Tana bo'laklari write_buffer hajmigacha yig'ilib thread poolda diskka
+    yoziladi, sha256 shu paytning o'zida hisoblanadi va hajm chegarasi har
+    bo'lakda tekshiriladi (oshsa 413, yarim fayl o'chiriladi).
+
+    Katta fayllar uchun davom ettiriladigan yuklash: sessiya ochiladi,
+    bo'laklar Upload-Offset bilan ketma-ket yuboriladi, uzilishda klient
+    joriy offsetni so'rab qolgan joyidan davom ettiradi. Holat diskda
+    ({id}.part va {id}.json), shuning uchun har qanday worker davom ettira oladi;
+    bir sessiyaga parallel so'rovlar .part faylidagi flock bilan ajratiladi
+    (band bo'lsa 409).
+
+    Multipart (UploadFile) yo'llarida tana Starlette tomonidan handlerdan oldin
+    to'liq qabul qilinadi (1 MB dan kattasi vaqtinchalik faylga), shuning uchun
+    u yerda oqim va hajm chegarasi keyin ishlaydi. Katta fayllar uchun tanani
+    to'g'ridan-to'g'ri yozadigan /stream yoki davom ettiriladigan yuklash ishlatiladi.
+    """
+
+    def __init__(self, root: str, max_bytes: int, write_buffer: int, session_ttl: float):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.write_buffer = write_buffer
+        self.session_ttl = session_ttl
+
+        self._purger: Optional[asyncio.Task] = None
+
+        self.received = 0
+        self.received_bytes = 0
+        self.rejected = 0
+
+    async def start(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        if self.session_ttl > 0 and self._purger is None:
+            self._purger = asyncio.create_task(self._run_purge())
+
+    async def stop(self) -> None:
+        if self._purger is not None:
+            self._purger.cancel()
+            self._purger = None
+
+    async def _run_purge(self) -> None:
+        while True:
+            try:
+                await self._run(self.purge_stale)
+            except Exception:
+                logger.exception("Upload cleanup failed")
+            await asyncio.sleep(min(self.session_ttl, 3600))
+
+    @staticmethod
+    async def _run(func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _too_large(self, limit: int) -> HTTPException:
+        self.rejected += 1
+        return HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Fayl hajmi {limit} baytdan oshmasligi kerak",
+        )
+
+    async def _copy(
+            self,
+            chunks: AsyncIterable[bytes],
+            file: BinaryIO,
+            limit: int,
+            digest: Optional["hashlib._Hash"] = None,
+        ) -> int:
+        written = 0
+        buffer = bytearray()
+        async for chunk in chunks:
+            written += len(chunk)
+            if written > limit:
+                raise self._too_large(limit)
+            buffer += chunk
+            if len(buffer) >= self.write_buffer:
+                await self._run(_write_chunk, file, digest, bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await self._run(_write_chunk, file, digest, bytes(buffer))
+        return written
+
+    async def receive(self, chunks: AsyncIterable[bytes]) -> StoredUpload:
+        """Bo'laklarni vaqtinchalik faylga yozadi; ishlatib bo'lingach discard() chaqiriladi."""
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, f"{uuid.uuid4().hex}.tmp")
+        digest = hashlib.sha256()
+        file = await self._run(open, path, "wb")
+        try:
+            size = await self._copy(chunks, file, self.max_bytes, digest)
+        except BaseException:
+            await self._run(file.close)
+            await self._run(_remove, path)
+            raise
+        await self._run(file.close)
+
+        if size == 0:
+            await self._run(_remove, path)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Fayl bo'sh")
+        self.received += 1
+        self.received_bytes += size
+        return StoredUpload(path, size, digest.hexdigest())
+
+    async def receive_request(self, request: Request) -> StoredUpload:
+        """So'rov tanasini (Content-Type: image/*) oqim sifatida qabul qiladi."""
+        content_length = request.headers.get("content-length")
+        # Content-Length ma'lum bo'lsa tana o'qilmasdan rad etiladi
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            raise self._too_large(self.max_bytes)
+        return await self.receive(request.stream())
+
+    async def receive_file(self, file: UploadFile) -> StoredUpload:
+        # Multipart tana allaqachon qabul qilingan: hajm ma'lum bo'lsa nusxalashdan oldin tekshiriladi
+        if file.size is not None and file.size > self.max_bytes:
+            raise self._too_large(self.max_bytes)
+        return await self.receive(iter_upload_file(file, self.write_buffer))
+
+    async def discard(self, upload: StoredUpload) -> None:
+        await self._run(_remove, upload.path)
+
+    def _session_paths(self, upload_id: str):
+        if not UPLOAD_ID.match(upload_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+        base = os.path.join(self.root, upload_id)
+        return f"{base}.part", f"{base}.json"
+
+    @staticmethod
+    def _read_session(part: str, meta: str) -> Optional[dict]:
+        try:
+            with open(meta) as file:
+                session = json.load(file)
+            session["offset"] = os.path.getsize(part)
+        except (OSError, ValueError):
+            return None
+        return session
+
+    @staticmethod
+    def _write_session(part: str, meta: str, session: dict) -> None:
+        open(part, "wb").close()
+        with open(meta, "w") as file:
+            json.dump(session, file)
+
+    async def create_session(self, size: int) -> dict:
+        if size > self.max_bytes:
+            raise self._too_large(self.max_bytes)
+        os.makedirs(self.root, exist_ok=True)
+        upload_id = uuid.uuid4().hex
+        session = {"upload_id": upload_id, "size": size, "created_at": time.time()}
+        await self._run(self._write_session, *self._session_paths(upload_id), session)
+        return {**session, "offset": 0}
+
+    async def get_session(self, upload_id: str) -> dict:
+        session = await self._run(self._read_session, *self._session_paths(upload_id))
+        if session is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+        return session
+
+    @asynccontextmanager
+    async def _locked(self, part: str) -> AsyncIterator[BinaryIO]:
+        file = await self._run(_open_locked, part)
+        try:
+            yield file
+        finally:
+            await self._run(file.close)
+
+    async def append(self, upload_id: str, offset: int, chunks: AsyncIterable[bytes]) -> dict:
+        """Bo'lakni offset'dan boshlab qo'shadi; offset mos kelmasa 409 va joriy Upload-Offset."""
+        part, _ = self._session_paths(upload_id)
+        async with self._locked(part) as file:
+            # Qulf olingandan keyin o'qiladi: sessiya shu orada yopilgan bo'lishi mumkin
+            session = await self.get_session(upload_id)
+            if offset != session["offset"]:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Upload-Offset joriy holatga mos emas",
+                    headers={"Upload-Offset": str(session["offset"])},
+                )
+            # Uzilishda yozilgan qism saqlanadi, klient shu joydan davom ettiradi
+            written = await self._copy(chunks, file, session["size"] - offset)
+        self.received_bytes += written
+        return {**session, "offset": offset + written}
+
+    @asynccontextmanager
+    async def complete(self, upload_id: str) -> AsyncIterator[StoredUpload]:
+        """To'liq yuklangan sessiyani StoredUpload sifatida beradi.
+
+        Sessiya blok ichidagi ishlov muvaffaqiyatli tugagandagina o'chiriladi:
+        xato bo'lsa klient shu upload_id bilan qayta urinishi mumkin. Blok
+        davomida sessiya qulflangan, parallel append/complete 409 oladi.
+        """
+        part, meta = self._session_paths(upload_id)
+        async with self._locked(part):
+            session = await self.get_session(upload_id)
+            if session["offset"] != session["size"]:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Yuklash hali tugallanmagan",
+                    headers={"Upload-Offset": str(session["offset"])},
+                )
+            if session["size"] == 0:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Fayl bo'sh")
+            # Hash holatini so'rovlar (va workerlar) orasida saqlab bo'lmaydi, shuning uchun oxirida hisoblanadi
+            sha256 = await self._run(_hash_file, part)
+            yield StoredUpload(part, session["size"], sha256)
+            await self._run(_remove, meta)
+            await self._run(_remove, part)
+        self.received += 1
+
+    async def abort(self, upload_id: str) -> None:
+        part, meta = self._session_paths(upload_id)
+        async with self._locked(part):
+            await self.get_session(upload_id)
+            await self._run(_remove, meta)
+            await self._run(_remove, part)
+
+    def purge_stale(self) -> int:
+        """session_ttl'dan eski sessiyalar va tashlab ketilgan vaqtinchalik fayllarni o'chiradi."""
+        if not os.path.isdir(self.root):
+            return 0
+        deadline = time.time() - self.session_ttl
+        removed = 0
+        for entry in os.scandir(self.root):
+            if not entry.is_file():
+                continue
+            modified = entry.stat().st_mtime
+            if entry.name.endswith(".json"):
+                # Sessiya oxirgi bo'lak yozilgan vaqtdan hisoblanadi
+                try:
+                    modified = max(modified, os.path.getmtime(entry.path[:-len(".json")] + ".part"))
+                except OSError:
+                    pass
+            if modified < deadline:
+                _remove(entry.path)
+                removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "received_bytes": self.received_bytes,
+            "rejected": self.rejected,
+        }
+
+
+@cache
+def get_upload_store() -> UploadStore:
+    return UploadStore(
+        root=UPLOAD_ROOT,
+        max_bytes=settings.IMAGE_MAX_UPLOAD_BYTES,
+        write_buffer=settings.UPLOAD_WRITE_BUFFER,
+        session_ttl=settings.UPLOAD_SESSION_TTL,
+    )
@@ -0,0 +1,49 @@
+from functools import cache
+
+from app.core.settings import get_settings
+from app.core.cache.codec import register_cache_types
+from app.core.cache.backends import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from app.core.cache.versioned import VersionedCache
+
+settings = get_settings()
+
+
+@cache
+def get_cache_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_REDIS_URL)
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(maxsize=settings.CACHE_MEMORY_MAXSIZE)
+    raise ValueError(f"Unknown cache backend: {settings.CACHE_BACKEND}")
+
+
+@cache
+def get_catalog_cache() -> VersionedCache:
+    return VersionedCache(
+        backend=get_cache_backend(),
+        ttl=settings.CATALOG_CACHE_TTL,
+        prefix=settings.CACHE_KEY_PREFIX,
+        enabled=settings.CATALOG_CACHE_ENABLED,
+    )
+
+
+@cache
+def get_auth_cache() -> VersionedCache:
+    return VersionedCache(
+        backend=get_cache_backend(),
+        ttl=settings.AUTH_USER_STATUS_TTL,
+        prefix=f"{settings.CACHE_KEY_PREFIX}:auth",
+        enabled=settings.AUTH_USER_STATUS_TTL > 0,
+    )
+
+
+__all__ = (
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "VersionedCache",
+    "get_auth_cache",
+    "get_cache_backend",
+    "get_catalog_cache",
+    "register_cache_types",
+)
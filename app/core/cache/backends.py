@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.cache import codec
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str], Any]
+
+
+class CacheBackend:
+    """Kesh saqlovchisi uchun umumiy interfeys.
+
+    Qiymatlar Python obyektlari; tarmoq orqali ishlaydigan backendlar ularni
+    codec (teglangan JSON) bilan serializatsiya qiladi, shuning uchun model va
+    NamedTuple turlari register_cache_types bilan ro'yxatga olinishi kerak. publish/subscribe workerlar orasida
+    invalidatsiya xabarlarini tarqatish uchun ishlatiladi.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def get_counter(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def zadd(self, key: str, member: str, score: float) -> None:
+        """Tartiblangan to'plamga a'zo qo'shadi (bor bo'lsa balini yangilaydi)."""
+        raise NotImplementedError
+
+    async def zrem(self, key: str, member: str) -> None:
+        raise NotImplementedError
+
+    async def zremrangebyscore(self, key: str, max_score: float) -> None:
+        """Bali max_score'dan oshmaydigan a'zolarni o'chiradi."""
+        raise NotImplementedError
+
+    async def zrangebyscore(self, key: str, min_score: float) -> Dict[str, float]:
+        """Bali min_score'dan katta a'zolar va ularning ballari."""
+        raise NotImplementedError
+
+    async def publish(self, channel: str, message: str) -> None:
+        raise NotImplementedError
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Bitta process ichidagi LRU + TTL backend (ko'p workerli deploy uchun emas)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        # Tartiblangan to'plamlar LRU'dan tashqarida: a'zolar faqat zrem/zremrangebyscore bilan chiqadi
+        self._sorted_sets: Dict[str, Dict[str, float]] = {}
+        self._handlers: Dict[str, List[MessageHandler]] = {}
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def zadd(self, key: str, member: str, score: float) -> None:
+        self._sorted_sets.setdefault(key, {})[member] = score
+
+    async def zrem(self, key: str, member: str) -> None:
+        self._sorted_sets.get(key, {}).pop(member, None)
+
+    async def zremrangebyscore(self, key: str, max_score: float) -> None:
+        members = self._sorted_sets.get(key, {})
+        for member in [member for member, score in members.items() if score <= max_score]:
+            del members[member]
+
+    async def zrangebyscore(self, key: str, min_score: float) -> Dict[str, float]:
+        return {member: score for member, score in self._sorted_sets.get(key, {}).items() if score > min_score}
+
+    async def publish(self, channel: str, message: str) -> None:
+        for handler in self._handlers.get(channel, []):
+            handler(message)
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "evictions": self.evictions,
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis protokolidagi server (Redis, Valkey, KeyDB, fakeredis) ustidagi backend."""
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis uchun 'redis' paketi o'rnatilishi kerak") from e
+
+        self.url = url
+        self._client = aioredis.from_url(url)
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._handlers: Dict[str, List[MessageHandler]] = {}
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(key)
+        if raw is None:
+            return None
+        return codec.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._client.set(
+            key,
+            codec.dumps(value),
+            px=max(1, int(ttl * 1000)),
+        )
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def get_counter(self, key: str) -> int:
+        raw = await self._client.get(key)
+        return int(raw) if raw is not None else 0
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+    async def zadd(self, key: str, member: str, score: float) -> None:
+        await self._client.zadd(key, {member: score})
+
+    async def zrem(self, key: str, member: str) -> None:
+        await self._client.zrem(key, member)
+
+    async def zremrangebyscore(self, key: str, max_score: float) -> None:
+        await self._client.zremrangebyscore(key, "-inf", max_score)
+
+    async def zrangebyscore(self, key: str, min_score: float) -> Dict[str, float]:
+        members = await self._client.zrangebyscore(key, f"({min_score}", "+inf", withscores=True)
+        return {member.decode("utf-8"): score for member, score in members}
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._client.publish(channel, message)
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        if self._pubsub is None:
+            self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(channel)
+        self._handlers.setdefault(channel, []).append(handler)
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception("Redis pub/sub listener error")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None:
+                continue
+            channel = message["channel"].decode("utf-8")
+            data = message["data"].decode("utf-8")
+            for handler in self._handlers.get(channel, []):
+                handler(data)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self._client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "subscriptions": list(self._handlers),
+            "errors": self.errors,
+        }
@@ -0,0 +1,95 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson ixtiyoriy; bo'lmasa standart json
+    orjson = None
+
+# Teglangan qiymat: {"__t": tur, "v": qiymat[, "n": ro'yxatdagi nom]}
+TAG = "__t"
+
+_types: Dict[str, type] = {}
+
+
+def register_cache_types(*types: type) -> None:
+    """Tarmoq keshida saqlanadigan Pydantic model va NamedTuple turlarini ro'yxatga oladi.
+
+    Dekodlashda faqat shu ro'yxatdagi turlar yaratiladi: Redis'ga yozish
+    huquqi bo'lgan kishi ham ixtiyoriy kod ishga tushira olmaydi.
+    """
+    for type_ in types:
+        _types[type_.__name__] = type_
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, BaseModel):
+        return {TAG: "model", "n": _registered(type(value)), "v": value.model_dump_json()}
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return {TAG: "namedtuple", "n": _registered(type(value)), "v": [_encode(item) for item in value]}
+    if isinstance(value, tuple):
+        return {TAG: "tuple", "v": [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _encode(item) for key, item in value.items()}
+    if isinstance(value, bytes):
+        return {TAG: "bytes", "v": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, datetime):
+        return {TAG: "datetime", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {TAG: "date", "v": value.isoformat()}
+    raise TypeError(f"Cache codec does not support {type(value).__name__}")
+
+
+def _registered(type_: type) -> str:
+    if _types.get(type_.__name__) is not type_:
+        raise TypeError(f"{type_.__name__} is not registered with register_cache_types")
+    return type_.__name__
+
+
+def _lookup(name: str) -> Type:
+    try:
+        return _types[name]
+    except KeyError:
+        raise ValueError(f"Unknown cached type: {name}") from None
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    tag = value.get(TAG)
+    if tag is None:
+        return {key: _decode(item) for key, item in value.items()}
+    if tag == "model":
+        return _lookup(value["n"]).model_validate_json(value["v"])
+    if tag == "namedtuple":
+        return _lookup(value["n"])(*[_decode(item) for item in value["v"]])
+    if tag == "tuple":
+        return tuple(_decode(item) for item in value["v"])
+    if tag == "bytes":
+        return base64.b64decode(value["v"])
+    if tag == "datetime":
+        return datetime.fromisoformat(value["v"])
+    if tag == "date":
+        return date.fromisoformat(value["v"])
+    raise ValueError(f"Unknown cache tag: {tag}")
+
+
+def dumps(value: Any) -> bytes:
+    encoded = _encode(value)
+    if orjson is not None:
+        return orjson.dumps(encoded)
+    return json.dumps(encoded, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(raw: bytes) -> Any:
+    return _decode(orjson.loads(raw) if orjson is not None else json.loads(raw))
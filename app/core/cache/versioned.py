@@ -0,0 +1,133 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.core.cache.backends import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedCache:
+    """Namespace versiyalari bilan ishlaydigan read-through kesh.
+
+    Kalitga namespace versiyasi qo'shiladi, shuning uchun invalidate() faqat
+    versiyani oshiradi: eski yozuvlar endi topilmaydi va backend LRU/TTL orqali
+    chiqib ketadi. Invalidatsiyadan oldin boshlangan o'qish natijasi eski versiya
+    kaliti ostida saqlanadi va yangi o'qishlarga ko'rinmaydi.
+
+    Versiya backendda saqlanadi va pub/sub orqali boshqa workerlarga tarqatiladi.
+    start() chaqirilmagan bo'lsa (masalan, skriptlarda) versiya har safar
+    backenddan o'qiladi.
+    """
+
+    def __init__(
+            self,
+            backend: CacheBackend,
+            ttl: float,
+            prefix: str,
+            enabled: bool = True,
+        ):
+        self.backend = backend
+        self.ttl = ttl
+        self.prefix = prefix
+        self.enabled = enabled
+        self.channel = f"{prefix}:invalidate"
+
+        self._versions: Dict[str, int] = {}
+        self._subscribed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        if not self._subscribed:
+            await self.backend.subscribe(self.channel, self._on_invalidate)
+            self._subscribed = True
+
+    def _on_invalidate(self, message: str) -> None:
+        namespace, _, version = message.rpartition(":")
+        self._versions[namespace] = max(self._versions.get(namespace, 0), int(version))
+
+    def _version_key(self, namespace: str) -> str:
+        return f"{self.prefix}:version:{namespace}"
+
+    def _key(self, namespace: str, version: int, key: Hashable) -> str:
+        if isinstance(key, tuple):
+            key = ":".join(map(str, key))
+        return f"{self.prefix}:{namespace}:v{version}:{key}"
+
+    async def version(self, namespace: str) -> int:
+        version = self._versions.get(namespace)
+        if version is None or not self._subscribed:
+            version = await self.backend.get_counter(self._version_key(namespace))
+            self._versions[namespace] = version
+        return version
+
+    async def get_or_load(
+            self,
+            namespace: str,
+            key: Hashable,
+            loader: Callable[[], Awaitable[Any]],
+            ttl: Optional[float] = None,
+        ) -> Any:
+        if not self.enabled:
+            self.misses += 1
+            return await loader()
+
+        # Backend ishlamay qolsa kesh chetlab o'tiladi, so'rov bazadan bajariladi
+        try:
+            version = await self.version(namespace)
+            full_key = self._key(namespace, version, key)
+            value = await self.backend.get(full_key)
+        except Exception:
+            self.errors += 1
+            logger.exception("Cache read failed for %s", namespace)
+            return await loader()
+
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = await loader()
+        await self._store(full_key, value, ttl)
+        return value
+
+    async def set(self, namespace: str, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        try:
+            version = await self.version(namespace)
+        except Exception:
+            self.errors += 1
+            logger.exception("Cache read failed for %s", namespace)
+            return
+        await self._store(self._key(namespace, version, key), value, ttl)
+
+    async def _store(self, full_key: str, value: Any, ttl: Optional[float]) -> None:
+        try:
+            await self.backend.set(full_key, value, ttl if ttl is not None else self.ttl)
+        except Exception:
+            self.errors += 1
+            logger.exception("Cache write failed for %s", full_key)
+
+    async def invalidate(self, namespace: str) -> None:
+        try:
+            version = await self.backend.incr(self._version_key(namespace))
+            self._versions[namespace] = version
+            await self.backend.publish(self.channel, f"{namespace}:{version}")
+        except Exception:
+            # Boshqa workerlar yozuvlarni TTL tugaguncha eski holda ko'radi
+            self.errors += 1
+            self._versions.pop(namespace, None)
+            logger.exception("Cache invalidation failed for %s", namespace)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "versions": dict(self._versions),
+            "backend": self.backend.stats(),
+        }
@@ -0,0 +1,274 @@
+import zlib
+from collections import OrderedDict
+from functools import cache
+from typing import Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.settings import get_settings
+
+try:
+    import brotli
+except ImportError:  # brotli ixtiyoriy; bo'lmasa faqat gzip
+    brotli = None
+
+settings = get_settings()
+
+# Bu Cache-Control qiymatlari bilan siqilgan tana keshlanmaydi
+UNCACHEABLE = ("no-store", "private")
+
+
+def parse_accept_encoding(value: str) -> dict:
+    encodings = {}
+    for part in value.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name] = quality
+    return encodings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Klient qabul qiladigan eng yaxshi kodlash: br (mavjud bo'lsa), keyin gzip."""
+    encodings = parse_accept_encoding(accept_encoding)
+    wildcard = encodings.get("*", 0.0)
+    candidates = (("br", "gzip") if brotli is not None else ("gzip",))
+    best, best_quality = None, 0.0
+    for name in candidates:
+        quality = encodings.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressedBodyCache:
+    """ETag bo'yicha siqilgan tanalar keshi (hajm bo'yicha chegaralangan LRU).
+
+    Kalitga URL ham kiradi: turli endpointlarning ETaglari mos tushib qolsa
+    ham tanalar aralashmaydi.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._bodies: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        # Middleware bo'yicha umumiy hisob (kesh va keshsiz siqishlar)
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        body = self._bodies.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._bodies.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def set(self, key: tuple, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        previous = self._bodies.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._bodies[key] = body
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, evicted = self._bodies.popitem(last=False)
+            self._size -= len(evicted)
+
+    def record(self, bytes_in: int, bytes_out: int, finished: bool = True) -> None:
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        if finished:
+            self.compressed += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._bodies),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "compressed": self.compressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+
+@cache
+def get_compressed_body_cache() -> CompressedBodyCache:
+    return CompressedBodyCache(settings.COMPRESSION_CACHE_BYTES)
+
+
+class CompressionMiddleware:
+    """Javoblarni gzip yoki brotli bilan siqadi.
+
+    Faqat content_types'dagi turlar va minimum_size'dan katta 200 javoblar
+    siqiladi; rasm, 206/304 va allaqachon kodlangan javoblar o'zgarmaydi.
+    Bir bo'lakli javob ETag bilan kelsa va keshlanadigan bo'lsa, siqilgan
+    tana CompressedBodyCache'dan olinadi. Oqimli javoblar bo'laklab siqiladi.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            minimum_size: int,
+            content_types: Iterable[str],
+            gzip_level: int,
+            brotli_quality: int,
+        ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = frozenset(content_types)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = get_compressed_body_cache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def compressor(self, encoding: str):
+        if encoding == "br":
+            return brotli.Compressor(quality=self.brotli_quality)
+        # wbits=31: gzip sarlavhasi va CRC bilan
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        compressor = self.compressor(encoding)
+        return compressor.compress(body) + compressor.flush()
+
+    def is_compressible(self, headers: Headers, status: int) -> bool:
+        if status != 200 or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.content_types
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: Optional[str]):
+        self.middleware = middleware
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.start: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if not self.middleware.is_compressible(headers, message["status"]):
+                self.passthrough = True
+                await self._send(message)
+                return
+            message["headers"] = list(message.get("headers", []))
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            if self.start is not None and self.compressor is None:
+                # Tana o'rniga boshqa xabar (masalan http.response.pathsend): start o'zgarishsiz ketadi
+                self.passthrough = True
+                await self._send(self.start)
+            await self._send(message)
+            return
+
+        if self.start is None:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start["headers"])
+
+        if self.compressor is None and not more_body:
+            await self._send_whole(headers, body)
+            return
+
+        if self.compressor is None:
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoding is None:
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+            self.compressor = self.middleware.compressor(self.encoding)
+            self._set_encoding(headers)
+            del headers["content-length"]
+            await self._send(self.start)
+
+        chunk = self._stream_chunk(body, more_body)
+        self.middleware.cache.record(len(body), len(chunk), finished=not more_body)
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _stream_chunk(self, body: bytes, more_body: bool) -> bytes:
+        if self.encoding == "br":
+            chunk = self.compressor.process(body)
+            return chunk + (self.compressor.finish() if not more_body else self.compressor.flush())
+        chunk = self.compressor.compress(body)
+        return chunk + self.compressor.flush(zlib.Z_FINISH if not more_body else zlib.Z_SYNC_FLUSH)
+
+    async def _send_whole(self, headers: MutableHeaders, body: bytes) -> None:
+        if len(body) < self.middleware.minimum_size:
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None:
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        key = self._cache_key(headers, len(body))
+        compressed = self.middleware.cache.get(key) if key is not None else None
+        if compressed is None:
+            compressed = self.middleware.compress(self.encoding, body)
+            if key is not None:
+                self.middleware.cache.set(key, compressed)
+
+        self.middleware.cache.record(len(body), len(compressed))
+        self._set_encoding(headers)
+        headers["content-length"] = str(len(compressed))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _cache_key(self, headers: MutableHeaders, size: int) -> Optional[Tuple]:
+        etag = headers.get("etag")
+        cache_control = headers.get("cache-control", "").lower()
+        if not etag or any(directive in cache_control for directive in UNCACHEABLE):
+            return None
+        return (self.scope["path"], self.scope.get("query_string", b""), etag, self.encoding, size)
+
+    def _set_encoding(self, headers: MutableHeaders) -> None:
+        headers["content-encoding"] = self.encoding
+        # Kuchli ETag kodlashga qarab farq qilishi kerak; zaif ETag o'zgarmaydi
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+
+
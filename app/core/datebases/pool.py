@@ -0,0 +1,61 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.wait = Histogram()
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Ulanish olishni kutish vaqti, overflow va timeoutlarni yozib boradigan pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.wait.observe(time.perf_counter() - started)
+
+        self.metrics.checkouts += 1
+        return connection
+
+    def _inc_overflow(self):
+        # Ulanish ochish await bilan boshqa so'rovlar bilan aralashadi, shuning
+        # uchun overflow shu yerda, hisoblagich oshirilgan zahoti aniqlanadi
+        acquired = super()._inc_overflow()
+        if acquired and self._overflow > 0:
+            self.metrics.overflow_events += 1
+        return acquired
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.metrics.checkouts,
+            "overflow_events": self.metrics.overflow_events,
+            "timeouts": self.metrics.timeouts,
+            "wait_seconds": self.metrics.wait.snapshot(),
+        }
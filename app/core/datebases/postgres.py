@@ -2,11 +2,14 @@ from contextlib import asynccontextmanager
 from functools import cache
 from typing import AsyncGenerator
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     async_sessionmaker,
 )
+from app.core.datebases.pool import InstrumentedAsyncQueuePool
+from app.core.datebases.queries import instrument_engine
 from app.core.settings import get_settings
 
 settings = get_settings()
@@ -14,15 +17,35 @@ settings = get_settings()
 postgres_url = f"{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DATABASE}"
 
 
-@cache
-def get_async_engine():
-    return create_async_engine(
-        "postgresql+asyncpg://" + postgres_url,
-        pool_size=3,
-        max_overflow=5,
+def create_pooled_engine(url: str):
+    # url o'zida query parametrlari (sslmode va h.k.) bilan kelishi mumkin
+    full_url = make_url("postgresql+asyncpg://" + url).update_query_dict(
+        {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+    )
+    engine = create_async_engine(
+        full_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
         future=True,
         echo=False,
     )
+    if settings.QUERY_INSTRUMENTATION:
+        instrument_engine(engine)
+    return engine
+
+
+@cache
+def get_async_engine():
+    return create_pooled_engine(postgres_url)
+
+
+def get_pool_stats() -> dict:
+    return get_async_engine().pool.stats()
 
 
 @cache
@@ -46,10 +69,7 @@ async def get_general_session() -> AsyncGenerator[AsyncSession, None]:
 
 @asynccontextmanager
 async def get_session_without_depends() -> AsyncGenerator[AsyncSession, None]:
-    engine = get_async_engine()
-    session_maker = async_sessionmaker(
-        bind=engine, autoflush=False, autocommit=False, expire_on_commit=False
-    )
+    session_maker = get_general_session_maker()
     async with session_maker() as session:
         try:
             yield session
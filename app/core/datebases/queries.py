@@ -0,0 +1,172 @@
+import logging
+import re
+import time
+from contextvars import ContextVar
+from functools import cache, lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Histogram
+from app.core.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+QUERIES_PER_REQUEST_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+|\?")
+# IN (?, ?, ?) ro'yxati uzunligidan qat'i nazar bitta shaklga keltiriladi
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """Parametr va literallarni "?" bilan almashtiradi: bir xil so'rov shakli bitta kalit bo'ladi."""
+    statement = _SPACE.sub(" ", statement).strip()
+    statement = _STRING.sub("?", statement)
+    statement = _PARAM.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    return _PARAM_LIST.sub("(?)", statement)
+
+
+class RequestQueries:
+    """Bitta so'rov davomidagi SQL statistikasi (ContextVar orqali)."""
+
+    __slots__ = ("count", "seconds", "statements", "slow")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Dict[str, int] = {}
+        self.slow: List[Tuple[float, str]] = []
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.items() if count >= threshold]
+
+
+current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+
+class QueryMetrics:
+    """Barcha so'rovlar bo'yicha umumiy SQL statistikasi (/metrics uchun)."""
+
+    def __init__(self, slow_seconds: float, repeat_threshold: int):
+        self.slow_seconds = slow_seconds
+        self.repeat_threshold = repeat_threshold
+        self.duration = Histogram()
+        self.per_request = Histogram(QUERIES_PER_REQUEST_BUCKETS)
+        self.statements = 0
+        self.slow = 0
+        self.repeated = 0
+
+    def observe(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.duration.observe(seconds)
+        queries = current_queries.get()
+        if queries is not None:
+            normalized = normalize_sql(statement)
+            queries.count += 1
+            queries.seconds += seconds
+            queries.statements[normalized] = queries.statements.get(normalized, 0) + 1
+            if seconds >= self.slow_seconds:
+                queries.slow.append((seconds, normalized))
+        elif seconds >= self.slow_seconds:
+            # So'rovdan tashqari (fon vazifalari, startup)
+            self.slow += 1
+            logger.warning("Slow query %.3fs: %s", seconds, normalize_sql(statement))
+
+    def finish_request(self, queries: RequestQueries, method: str, path: str, routed: bool = True) -> None:
+        # Route'siz so'rovlar (/media, 404) taqsimotni nolga siljitmasin
+        if routed:
+            self.per_request.observe(queries.count)
+        for seconds, statement in queries.slow:
+            self.slow += 1
+            logger.warning("Slow query %.3fs in %s %s: %s", seconds, method, path, statement)
+        for statement, count in queries.repeated(self.repeat_threshold):
+            self.repeated += 1
+            logger.warning("Possible N+1 in %s %s: %d x %s", method, path, count, statement)
+
+    def stats(self) -> dict:
+        return {
+            "statements": self.statements,
+            "slow": self.slow,
+            "repeated": self.repeated,
+            "duration_seconds": self.duration.snapshot(),
+            "queries_per_request": self.per_request.snapshot(),
+        }
+
+
+@cache
+def get_query_metrics() -> QueryMetrics:
+    return QueryMetrics(
+        slow_seconds=settings.QUERY_SLOW_SECONDS,
+        repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+    )
+
+
+def instrument_engine(engine) -> None:
+    """AsyncEngine (yoki sync Engine) cursor hodisalariga vaqt o'lchovini ulaydi."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    metrics = get_query_metrics()
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        metrics.observe(statement, time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        # Xato bilan tugagan statement vaqti yozilmaydi, lekin stek tozalanadi
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+
+class QueryStatsMiddleware:
+    """Har bir HTTP so'rov uchun RequestQueries ochadi va oxirida yakunlaydi.
+
+    server_timing yoqilganda (DEBUG) javobga "Server-Timing: db;dur=..;desc=..,
+    app;dur=.." qo'shiladi: sarlavha yuborilgan paytgacha bo'lgan so'rovlar.
+    Takrorlanuvchi statementlar (ehtimoliy N+1) va sekin so'rovlar loglanadi.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool):
+        self.app = app
+        self.server_timing = server_timing
+        self.metrics = get_query_metrics()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = current_queries.set(queries)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                elapsed = (time.perf_counter() - started) * 1000
+                repeated = queries.repeated(self.metrics.repeat_threshold)
+                desc = f"{queries.count} queries"
+                if repeated:
+                    desc += f", {len(repeated)} repeated"
+                headers.append("Server-Timing", f'db;dur={queries.seconds * 1000:.1f};desc="{desc}", app;dur={elapsed:.1f}')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing if self.server_timing else send)
+        finally:
+            current_queries.reset(token)
+            self.metrics.finish_request(queries, scope["method"], scope["path"], scope.get("route") is not None)
@@ -0,0 +1,158 @@
+import asyncio
+import itertools
+import logging
+import time
+from functools import cache
+from typing import AsyncGenerator, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.datebases.postgres import create_pooled_engine, get_async_engine, get_general_session_maker
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class ReplicaRouter:
+    """Faqat o'qiydigan so'rovlarni sog'lom replikalar orasida navbatma-navbat taqsimlaydi.
+
+    Replikalar fon vazifasida SELECT 1 bilan tekshiriladi; birorta ham sog'lom
+    replika qolmasa sessiyalar primary bazaga ochiladi.
+
+    Yozuvchi repository metodlari commitdan keyin, katalog keshi versiyalarini
+    oshirishdan oldin wait_for_replicas()ni bir marta chaqiradi: aks holda
+    invalidatsiyadan keyingi o'qish orqada qolgan replikadan eski qatorlarni
+    olib, ularni yangi versiya ostida keshlab qo'yishi mumkin.
+    """
+
+    def __init__(self, urls: List[str], check_interval: float, check_timeout: float, catchup_timeout: float):
+        self.urls = urls
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.catchup_timeout = catchup_timeout
+
+        self._engines = [create_pooled_engine(url) for url in urls]
+        self._session_makers = [
+            async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+            for engine in self._engines
+        ]
+        self._healthy = [True] * len(urls)
+        self._counter = itertools.count()
+        self._task: asyncio.Task = None
+
+        self.fallbacks = 0
+        self.lagging = 0
+
+    def session_maker(self) -> async_sessionmaker[AsyncSession]:
+        healthy = [index for index, ok in enumerate(self._healthy) if ok]
+        if not healthy:
+            if self._engines:
+                self.fallbacks += 1
+            return get_general_session_maker()
+        return self._session_makers[healthy[next(self._counter) % len(healthy)]]
+
+    @staticmethod
+    async def _ping(engine) -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def check(self) -> None:
+        for index, engine in enumerate(self._engines):
+            try:
+                # Ulanish ham timeout ichida: paketlarni tashlab yuboradigan replika tsiklni to'xtatmaydi
+                await asyncio.wait_for(self._ping(engine), timeout=self.check_timeout)
+                healthy = True
+            except Exception:
+                healthy = False
+
+            if healthy != self._healthy[index]:
+                logger.warning(
+                    "Replica %s:%s is now %s",
+                    engine.url.host,
+                    engine.url.port,
+                    "healthy" if healthy else "unhealthy",
+                )
+            self._healthy[index] = healthy
+
+    @staticmethod
+    async def _wait_replay(engine, lsn: str) -> None:
+        # Replika bo'lmagan server (recovery'da emas) uchun NULL - kutish shart emas
+        query = text("SELECT coalesce(pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn), true)")
+        async with engine.connect() as connection:
+            while not (await connection.execute(query, {"lsn": lsn})).scalar():
+                await asyncio.sleep(0.02)
+
+    async def wait_for_replicas(self) -> None:
+        """Sog'lom replikalar primary'ning joriy WAL pozitsiyasigacha yetib olishini kutadi.
+
+        catchup_timeout ichida yetib olmagan replika keyingi tekshiruvgacha
+        sog'lom emas deb belgilanadi va o'qishlar unga yuborilmaydi.
+        """
+        healthy = [index for index, ok in enumerate(self._healthy) if ok]
+        if not healthy:
+            return
+        try:
+            async with get_async_engine().connect() as connection:
+                lsn = (await connection.execute(text("SELECT pg_current_wal_lsn()::text"))).scalar()
+        except Exception:
+            logger.exception("Could not read primary WAL position")
+            return
+
+        deadline = time.monotonic() + self.catchup_timeout
+        for index in healthy:
+            engine = self._engines[index]
+            try:
+                await asyncio.wait_for(self._wait_replay(engine, lsn), timeout=max(0.0, deadline - time.monotonic()))
+            except Exception:
+                self.lagging += 1
+                self._healthy[index] = False
+                logger.warning("Replica %s:%s did not reach %s, skipping it until the next check", engine.url.host, engine.url.port, lsn)
+
+    async def _run_checks(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+    async def start(self) -> None:
+        if self._engines and self._task is None:
+            self._task = asyncio.create_task(self._run_checks())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for engine in self._engines:
+            await engine.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {"host": f"{engine.url.host}:{engine.url.port}", "healthy": healthy, "pool": engine.pool.stats()}
+                for engine, healthy in zip(self._engines, self._healthy)
+            ],
+            "fallbacks": self.fallbacks,
+            "lagging": self.lagging,
+        }
+
+
+@cache
+def get_replica_router() -> ReplicaRouter:
+    urls = [url.strip() for url in settings.POSTGRES_REPLICA_URLS.split(",") if url.strip()]
+    return ReplicaRouter(
+        urls=urls,
+        check_interval=settings.DB_REPLICA_CHECK_INTERVAL,
+        check_timeout=settings.DB_REPLICA_CHECK_TIMEOUT,
+        catchup_timeout=settings.DB_REPLICA_CATCHUP_TIMEOUT,
+    )
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    session_maker = get_replica_router().session_maker()
+    async with session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
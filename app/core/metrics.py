@@ -0,0 +1,164 @@
+import bisect
+from functools import cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Oldindan belgilangan chegaralar bo'yicha kuzatuvlarni sanaydi (Prometheus uslubida)."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list:
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {str(bound): count for bound, count in self.cumulative()},
+        }
+
+
+class RouteMetrics:
+    """Bitta (metod, route shabloni) uchun hisoblagichlar; birinchi so'rovda bir marta quriladi."""
+
+    __slots__ = ("method", "route", "latency", "statuses")
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.latency = Histogram()
+        self.statuses: Dict[int, int] = {}
+
+    def finish(self, status: int, seconds: float) -> None:
+        self.latency.observe(seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+
+class RequestMetrics:
+    """(method, route shabloni) bo'yicha RouteMetrics reyestri.
+
+    Hisoblagichlar oddiy int: barcha o'zgarishlar event loop threadida,
+    shuning uchun lock kerak emas. Har bir worker process o'z qiymatlarini
+    beradi.
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self.in_flight = 0
+
+    def route(self, method: str, route: str) -> RouteMetrics:
+        key = (method, route)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics(method, route)
+        return metrics
+
+
+@cache
+def get_request_metrics() -> RequestMetrics:
+    return RequestMetrics()
+
+
+def escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+class PrometheusWriter:
+    """Prometheus text formati (0.0.4): bir metrikaning barcha qatorlari HELP/TYPE ostida bitta guruhda."""
+
+    def __init__(self):
+        self._families: Dict[str, List[str]] = {}
+
+    def _family(self, name: str, kind: str, help: str) -> List[str]:
+        lines = self._families.get(name)
+        if lines is None:
+            lines = self._families[name] = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+        return lines
+
+    def sample(self, name: str, kind: str, help: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        self._family(name, kind, help).append(f"{name}{format_labels(labels or {})} {float(value)!r}")
+
+    def histogram(self, name: str, help: str, snapshot: dict, labels: Optional[Dict[str, Any]] = None) -> None:
+        """snapshot: Histogram.snapshot() natijasi (kumulyativ bucketlar)."""
+        lines = self._family(name, "histogram", help)
+        labels = labels or {}
+        for bound, count in snapshot["buckets"].items():
+            le = "+Inf" if bound == "inf" else bound
+            lines.append(f"{name}_bucket{format_labels({**labels, 'le': le})} {count}")
+        lines.append(f"{name}_sum{format_labels(labels)} {float(snapshot['sum'])!r}")
+        lines.append(f"{name}_count{format_labels(labels)} {snapshot['count']}")
+
+    def render(self) -> str:
+        return "\n".join(line for lines in self._families.values() for line in lines) + "\n"
+
+
+def write_request_metrics(writer: PrometheusWriter, registry: RequestMetrics) -> None:
+    writer.sample("http_requests_in_flight", "gauge", "Requests currently being handled.", registry.in_flight)
+    for metrics in list(registry.routes.values()):
+        labels = {"method": metrics.method, "route": metrics.route}
+        for status, count in sorted(metrics.statuses.items()):
+            writer.sample(
+                "http_requests_total", "counter", "Handled requests by route and status.",
+                count, {**labels, "status": status},
+            )
+        writer.histogram(
+            "http_request_duration_seconds", "Request handling time by route.", metrics.latency.snapshot(), labels,
+        )
+
+
+def write_pool_metrics(writer: PrometheusWriter, stats: dict, labels: Dict[str, Any]) -> None:
+    """InstrumentedAsyncQueuePool.stats() natijasini yozadi."""
+    for key in ("size", "checked_out", "checked_in", "overflow", "max_overflow"):
+        writer.sample(f"db_pool_{key}", "gauge", f"Connection pool {key.replace('_', ' ')}.", stats[key], labels)
+    for key in ("checkouts", "overflow_events", "timeouts"):
+        writer.sample(f"db_pool_{key}_total", "counter", f"Connection pool {key.replace('_', ' ')}.", stats[key], labels)
+    writer.histogram(
+        "db_pool_wait_seconds", "Time spent waiting for a pooled connection.", stats["wait_seconds"], labels,
+    )
+
+
+def write_component_stats(writer: PrometheusWriter, component: str, stats: dict) -> None:
+    """Komponent stats() lug'atidagi sonli qiymatlar (ichma-ich kalitlar '_' bilan qo'shiladi)."""
+    for key, value in flatten_stats(stats):
+        writer.sample(
+            "app_component_stat", "untyped", "Numeric values from component stats().",
+            value, {"component": component, "stat": key},
+        )
+
+
+def flatten_stats(stats: dict, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, bool):
+            yield name, int(value)
+        elif isinstance(value, (int, float)):
+            yield name, value
+        elif isinstance(value, dict):
+            yield from flatten_stats(value, f"{name}_")
@@ -16,12 +16,111 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: str
     POSTGRES_DATABASE: str
+    # Vergul bilan ajratilgan "user:password@host:port/database" ro'yxati
+    POSTGRES_REPLICA_URLS: str = ""
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0
+    DB_REPLICA_CHECK_TIMEOUT: float = 2.0
+    # Katalog keshi invalidatsiyasidan oldin replikalar yozuvga yetib olishini shuncha soniya kutish
+    DB_REPLICA_CATCHUP_TIMEOUT: float = 2.0
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # PgBouncer (transaction mode) orqasida 0 qilish kerak
+    DB_STATEMENT_CACHE_SIZE: int = 100
 
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
 
+    # "database" - har so'rovda User bazadan o'qiladi
+    # "claims"   - imzolangan token claimlariga ishoniladi (revocation list bilan)
+    AUTH_ADMIN_MODE: str = "claims"
+    # claims rejimida foydalanuvchi holati shuncha soniya keshlanadi; 0 - faqat claimlar
+    AUTH_USER_STATUS_TTL: float = 60.0
+    AUTH_REVOCATION_REFRESH_INTERVAL: float = 5.0
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0
+
+    LIST_TOTAL_STRATEGY: str = "cached"
+    LIST_TOTAL_CACHE_TTL: float = 30.0
+    LIST_TOTAL_ESTIMATE_THRESHOLD: int = 100000
+
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "mebel"
+    CACHE_MEMORY_MAXSIZE: int = 1024
+
+    CATALOG_CACHE_ENABLED: bool = True
+    CATALOG_CACHE_TTL: float = 60.0
+    # Ro'yxatlar tayyor JSON baytlari sifatida keshlanadi va response_model'siz qaytariladi
+    CATALOG_FAST_JSON: bool = True
+    # Kategoriya yozuvlarida darhol yangilanadi; mahsulot soni o'zgarishi shu muddatda ko'rinadi
+    CATEGORY_TREE_TTL: float = 60.0
+
+    # Katalog GET javoblari uchun Cache-Control (ETag/Last-Modified bilan birga)
+    CACHE_CONTROL_CATALOG_LIST: str = "public, max-age=30, stale-while-revalidate=30"
+    CACHE_CONTROL_CATALOG_DETAIL: str = "public, max-age=60, stale-while-revalidate=60"
+    CACHE_CONTROL_CATEGORY_TREE: str = "public, max-age=0, must-revalidate"
+
+    BULK_IMPORT_CHUNK_SIZE: int = 500
+
+    # Yuklangan rasmlar shu kengliklarga kichraytiriladi va har bir formatda saqlanadi
+    IMAGE_WIDTHS: str = "320,640,1024,1600"
+    IMAGE_FORMATS: str = "webp,avif"
+    IMAGE_WEBP_QUALITY: int = 80
+    IMAGE_AVIF_QUALITY: int = 55
+    IMAGE_JPEG_QUALITY: int = 82
+    IMAGE_MAX_PIXELS: int = 40_000_000
+    IMAGE_MAX_UPLOAD_BYTES: int = 20 * 1024 * 1024
+    IMAGE_WORKERS: int = 2
+    IMAGE_MAX_QUEUE: int = 16
+    IMAGE_QUEUE_TIMEOUT: float = 30.0
+
+    # Yuklashlar diskka shu hajmdagi bo'laklar bilan yoziladi
+    UPLOAD_WRITE_BUFFER: int = 256 * 1024
+    # Tugallanmagan davom ettiriladigan yuklashlar shu muddatdan keyin o'chiriladi
+    UPLOAD_SESSION_TTL: float = 24 * 3600.0
+
+    # /media: kontent xeshli nomlar immutable, qolganlari qisqa muddat keshlanadi
+    MEDIA_CACHE_CONTROL: str = "public, max-age=3600"
+    MEDIA_IMMUTABLE_CACHE_CONTROL: str = "public, max-age=31536000, immutable"
+    # Shu hajmgacha bo'lgan xeshli fayllar (thumbnaillar) xotirada saqlanadi
+    MEDIA_MEMORY_CACHE_BYTES: int = 32 * 1024 * 1024
+    MEDIA_MEMORY_CACHE_MAX_FILE: int = 64 * 1024
+    # nginx internal location (masalan "/protected-media/"): fayllarni nginx sendfile bilan beradi; bo'sh - o'chirilgan
+    MEDIA_ACCEL_REDIRECT: str = ""
+
+    # Shu hajmdan kichik va ro'yxatda bo'lmagan turdagi javoblar siqilmaydi
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: str = "application/json,application/x-ndjson,text/plain,text/html,text/css,text/csv,application/javascript,image/svg+xml"
+    COMPRESSION_GZIP_LEVEL: int = 6
+    # brotli o'rnatilgan bo'lsa ishlatiladi
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    # ETag bilan keshlanadigan siqilgan tanalar uchun xotira
+    COMPRESSION_CACHE_BYTES: int = 16 * 1024 * 1024
+
+    # Prometheus /metrics; "Authorization: Bearer <token>" talab qilinadi, token bo'sh bo'lsa ulanmaydi
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str = ""
+
+    # SQL statementlar vaqti va soni; DEBUG'da javobga Server-Timing qo'shiladi
+    QUERY_INSTRUMENTATION: bool = True
+    QUERY_SLOW_SECONDS: float = 0.2
+    # Bitta so'rovda bir xil statement shuncha marta bajarilsa N+1 deb loglanadi
+    QUERY_REPEAT_THRESHOLD: int = 5
+
+    # 0 - indeks faqat startupda va API orqali yangilanadi
+    AUTOCOMPLETE_REFRESH_INTERVAL: float = 600.0
+    AUTOCOMPLETE_RESULT_CACHE_SIZE: int = 4096
+    AUTOCOMPLETE_RESULT_CACHE_TTL: float = 10.0
 
 
     class Config:
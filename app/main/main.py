@@ -3,27 +3,61 @@ from contextlib import asynccontextmanager
 import os
 import logging
 from fastapi import APIRouter, FastAPI
-from fastapi.staticfiles import StaticFiles
 
+from app.core.cache import get_auth_cache, get_cache_backend, get_catalog_cache
+from app.core.compression import CompressionMiddleware
+from app.core.datebases.queries import QueryStatsMiddleware
+from app.core.datebases.replicas import get_replica_router
 from app.core.settings import get_settings, Settings
 from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp
 
 from app.api.routers.auth import router as auth_router
 from app.api.routers.category import router as category_router
+from app.api.routers.metrics import router as metrics_router
+from app.api.routers.product import router as product_router
 from app.api.routers.subcategory import router as subcategory_router
+from app.api.routers.upload import router as upload_router
+from app.api.utils.autocomplete import get_autocomplete_index
+from app.api.utils.images import get_image_processor
+from app.api.utils.media import get_media_files
+from app.api.utils.password import get_password_hasher
+from app.api.utils.route_metrics import RequestMetricsMiddleware
+from app.api.utils.revocation import get_revocation_list
+from app.api.utils.uploads import get_upload_store
+from app.api.utils.token import get_token_verifier
+from app.api.utils.total_count import get_total_counter
 
 settings: Settings = get_settings()
 
 
-
-
-
-def create_app() -> CORSMiddleware:
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_token_verifier()
+    # Strategiya sozlamalari mos kelmasa ogohlantirish startupda chiqadi
+    get_total_counter()
+    await get_catalog_cache().start()
+    await get_auth_cache().start()
+    await get_revocation_list().start()
+    await get_replica_router().start()
+    await get_autocomplete_index().start()
+    await get_upload_store().start()
+    yield
+    await get_autocomplete_index().stop()
+    await get_upload_store().stop()
+    get_password_hasher().shutdown()
+    get_image_processor().shutdown()
+    await get_cache_backend().close()
+    await get_replica_router().stop()
+
+
+def create_app() -> ASGIApp:
     logging.basicConfig(level=logging.INFO)
     app = FastAPI(
         title=settings.PROJECT_NAME + " API",
         description=settings.PROJECT_DESCRIPTION,
         version=settings.PROJECT_VERSION,
+        lifespan=lifespan,
     )
 
 
@@ -31,7 +65,7 @@ def create_app() -> CORSMiddleware:
     os.makedirs("media/profile_picture", exist_ok=True)
     os.makedirs("media/product_image", exist_ok=True)
     os.makedirs("media/rating", exist_ok=True)
-    app.mount("/media", StaticFiles(directory="media"), name="media")
+    app.mount("/media", get_media_files(), name="media")
 
     v1_router = APIRouter(prefix=settings.API_V1_STR)
 
@@ -52,10 +86,40 @@ def create_app() -> CORSMiddleware:
         tags=["subcategory"],
     )
 
+    v1_router.include_router(
+        product_router,
+        prefix="/product",
+        tags=["product"],
+    )
+
+    v1_router.include_router(
+        upload_router,
+        prefix="/upload",
+        tags=["upload"],
+    )
+
 
     app.include_router(v1_router)
 
-    return CORSMiddleware(
+    metrics_enabled = settings.METRICS_ENABLED and bool(settings.METRICS_TOKEN)
+    if settings.METRICS_ENABLED:
+        if metrics_enabled:
+            app.include_router(metrics_router, prefix="/metrics")
+        else:
+            # Tokensiz /metrics ichki route va pool ma'lumotlarini hammaga ochib qo'yadi
+            logging.getLogger(__name__).warning("METRICS_TOKEN is empty, /metrics is not mounted")
+
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        content_types=[value.strip().lower() for value in settings.COMPRESSION_CONTENT_TYPES.split(",") if value.strip()],
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+    if settings.QUERY_INSTRUMENTATION:
+        app.add_middleware(QueryStatsMiddleware, server_timing=settings.DEBUG)
+
+    asgi_app = CORSMiddleware(
         app,
         allow_origins=["*"],
         allow_credentials=True,
@@ -63,5 +127,9 @@ def create_app() -> CORSMiddleware:
         allow_headers=["*"],
         expose_headers=["*"],
     )
+    if metrics_enabled:
+        # Eng tashqarida: CORS rad etgan va hech bir route'ga tushmagan so'rovlar ham yoziladi
+        asgi_app = RequestMetricsMiddleware(asgi_app)
+    return asgi_app
 
 
@@ -0,0 +1,119 @@
+"""Katalog ro'yxatlarini JSON'ga aylantirish narxi: oddiy (Pydantic) yo'l va tayyor baytlar.
+
+Ishga tushirish: python -m benchmarks.json_response [--items 100] [--rounds 2000]
+
+Har bir bosqich alohida o'lchanadi:
+  build     - kesh bo'sh bo'lganda qatorlardan javob tayyorlash
+  serialize - har bir so'rovda (kesh to'la bo'lsa ham) javobni baytlarga aylantirish
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from starlette.requests import Request
+
+from app.api.schemas.product import CategoryListResponse, CategoryResponse
+from app.api.utils.fast_json import json_page, orjson, page_payload
+from app.api.utils.http_cache import json_bytes_response
+from app.api.utils.pagination import next_cursor
+
+
+def make_rows(count: int):
+    Row = namedtuple("Row", list(CategoryResponse.model_fields))
+    started = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    rows = []
+    for index in range(1, count + 2):
+        rows.append(Row(
+            name=f"Kategoriya {index}",
+            description="Yumshoq mebel, divanlar va kreslolar" if index % 2 else None,
+            is_active=True,
+            id=index,
+            slug=f"kategoriya-{index}",
+            image=f"media/category/{index}.webp",
+            image_variants=None,
+            created_at=started + timedelta(minutes=index),
+            updated_at=started + timedelta(hours=index),
+        ))
+    return rows
+
+
+def legacy_build(rows, size: int) -> CategoryListResponse:
+    # Oldingi repository kodi: har bir qator uchun qo'lda CategoryResponse
+    objects = [SimpleNamespace(**row._asdict()) for row in rows]
+    items = [
+        CategoryResponse(
+            id=cat.id,
+            name=cat.name,
+            description=cat.description,
+            is_active=cat.is_active,
+            slug=cat.slug,
+            image=cat.image,
+            created_at=cat.created_at,
+            updated_at=cat.updated_at,
+        )
+        for cat in objects[:size]
+    ]
+    pages = (1000 + size - 1) // size
+    return CategoryListResponse(items=items, total=1000, page=1, size=size, pages=pages, next_cursor=next_cursor(objects, size))
+
+
+def measure(function, rounds: int) -> float:
+    function()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        function()
+    return (time.perf_counter() - started) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    size = args.items
+    rows = make_rows(size)
+    field = create_model_field(name="Response_get_categories", type_=CategoryListResponse, mode="serialization")
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    loop = asyncio.new_event_loop()
+
+    model = legacy_build(rows, size)
+    page = json_page(page_payload(rows, CategoryResponse, 1000, 1, size, None))
+
+    def fastapi_stdlib():
+        # FastAPI < 0.130: response_model tekshiruvi, dict va json.dumps
+        content = loop.run_until_complete(serialize_response(field=field, response_content=model))
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    def fastapi_dump_json():
+        # Yangi FastAPI: response_model tekshiruvi va Pydantic dump_json
+        return loop.run_until_complete(serialize_response(field=field, response_content=model, dump_json=True))
+
+    assert json.loads(fastapi_stdlib()) == json.loads(page.body)
+
+    results = {
+        "build: hand-built models": measure(lambda: legacy_build(rows, size), args.rounds),
+        "build: row dicts + single dump": measure(
+            lambda: json_page(page_payload(rows, CategoryResponse, 1000, 1, size, None)), args.rounds
+        ),
+        "serialize: response_model + json.dumps": measure(fastapi_stdlib, args.rounds),
+        "serialize: response_model + dump_json": measure(fastapi_dump_json, args.rounds),
+        "serialize: cached bytes": measure(
+            lambda: json_bytes_response(request, page.body, page.validators, "public"), args.rounds
+        ),
+    }
+    loop.close()
+
+    print(f"{size} items per page, {args.rounds} rounds, encoder: {'orjson' if orjson else 'pydantic_core'}")
+    for name, seconds in results.items():
+        print(f"  {name:<42} {seconds * 1e6:9.1f} us/page {seconds * 1e6 / size:7.2f} us/item")
+
+
+if __name__ == "__main__":
+    main()
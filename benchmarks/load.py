@@ -0,0 +1,292 @@
+"""Haqiqiy ilova (create_app) ustida parallel klientlar bilan yuklama testi.
+
+Ishga tushirish: python -m benchmarks.load [--requests 2000] [--concurrency 32]
+                 [--endpoints product,search] [--output results.json] [--baseline baseline.json]
+
+Avval katalog to'ldiriladi: python -m benchmarks.seed --reset (bench bazasida)
+
+Standart holatda ilova jarayon ichida (httpx.ASGITransport, lifespan bilan) ishga
+tushiriladi: barcha middleware, kesh va DB pool'lari ishlaydi, faqat tarmoq va
+uvicorn yo'q. Klient va ilova bitta event loopda, shuning uchun kechikishga
+klient xarajati ham kiradi. --url berilsa alohida ishlayotgan server o'lchanadi.
+Yo'llardagi id'lar ikkala holatda ham o'lchanayotgan ilovaning ro'yxat
+endpointlaridan olinadi, shuning uchun ular server ishlatayotgan bazaga mos.
+
+Har bir endpoint alohida o'lchanadi: --warmup so'rovdan keyin --requests so'rov
+--concurrency ta klient orasida bo'linadi. Natija: p50/p95/p99, o'rtacha va
+maksimal kechikish (ms) hamda throughput (so'rov/s). --baseline'dagi oldingi
+natija bilan solishtirilganda p95 --threshold foizdan ko'p o'ssa yoki throughput
+shuncha tushsa endpoint "REGRESSION" deb belgilanadi.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import httpx
+
+from app.core.settings import get_settings
+from app.main.main import create_app
+from benchmarks.seed import NOUNS
+
+settings = get_settings()
+
+# Endpoint yo'llari uchun namuna id'lar shuncha yozuvdan olinadi
+SAMPLE_SIZE = 1000
+# Ro'yxat endpointlarining eng katta sahifasi (size <= 100)
+SAMPLE_PAGE_SIZE = 100
+
+
+class Catalog(NamedTuple):
+    category_ids: List[int]
+    subcategory_ids: List[int]
+    product_ids: List[int]
+
+
+class Endpoint(NamedTuple):
+    name: str
+    path: Callable[[random.Random, Catalog], str]
+
+
+def _search_term(rng: random.Random) -> str:
+    return rng.choice(NOUNS)
+
+
+ENDPOINTS = (
+    Endpoint("categories", lambda rng, c: "/category/?size=20"),
+    Endpoint("category_tree", lambda rng, c: "/category/tree"),
+    Endpoint("category", lambda rng, c: f"/category/{rng.choice(c.category_ids)}"),
+    Endpoint("subcategories", lambda rng, c: "/subcategory/?size=20&view=summary"),
+    Endpoint("products", lambda rng, c: f"/product/?size=20&page={rng.randint(1, 50)}"),
+    Endpoint("products_by_subcategory", lambda rng, c: f"/product/?size=20&subcategory_id={rng.choice(c.subcategory_ids)}"),
+    Endpoint("product", lambda rng, c: f"/product/{rng.choice(c.product_ids)}"),
+    Endpoint("search", lambda rng, c: f"/product/search?size=20&q={_search_term(rng)}"),
+    Endpoint(
+        "search_filtered",
+        lambda rng, c: (
+            f"/product/search?size=20&subcategory_id={rng.choice(c.subcategory_ids)}"
+            f"&min_price=1000000&max_price=10000000&sort=price_asc"
+        ),
+    ),
+    Endpoint("autocomplete", lambda rng, c: f"/product/autocomplete?q={_search_term(rng)[:3]}"),
+)
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Saralangan qiymatlar uchun chiziqli interpolyatsiyali persentil."""
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 1) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+async def sample_ids(client: httpx.AsyncClient, path: str, **params) -> List[int]:
+    """Ro'yxat endpointidan cursor bilan SAMPLE_SIZE tagacha id yig'adi."""
+    ids: List[int] = []
+    cursor = None
+    while len(ids) < SAMPLE_SIZE:
+        query = {**params, "size": SAMPLE_PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(settings.API_V1_STR + path, params=query)
+        response.raise_for_status()
+        page = response.json()
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page.get("next_cursor")
+        if not cursor:
+            break
+    return ids[:SAMPLE_SIZE]
+
+
+async def load_catalog(client: httpx.AsyncClient) -> Catalog:
+    catalog = Catalog(
+        category_ids=await sample_ids(client, "/category/", view="summary"),
+        subcategory_ids=await sample_ids(client, "/subcategory/", view="summary"),
+        product_ids=await sample_ids(client, "/product/"),
+    )
+    if not all(catalog):
+        raise SystemExit("Katalog bo'sh: avval python -m benchmarks.seed --reset ishga tushiring")
+    return catalog
+
+
+async def run_endpoint(
+        client: httpx.AsyncClient,
+        endpoint: Endpoint,
+        catalog: Catalog,
+        requests: int,
+        concurrency: int,
+        seed: int,
+    ) -> dict:
+    rng = random.Random(f"{seed}:{endpoint.name}")
+    paths = [settings.API_V1_STR + endpoint.path(rng, catalog) for _ in range(requests)]
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker(offset: int) -> None:
+        nonlocal errors
+        for path in paths[offset::concurrency]:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            if failed:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(offset) for offset in range(min(concurrency, requests))))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_all(client: httpx.AsyncClient, endpoints: Sequence[Endpoint], args: argparse.Namespace) -> Dict[str, dict]:
+    catalog = await load_catalog(client)
+    results = {}
+    for endpoint in endpoints:
+        if args.warmup:
+            await run_endpoint(client, endpoint, catalog, args.warmup, args.concurrency, args.seed + 1)
+        results[endpoint.name] = await run_endpoint(client, endpoint, catalog, args.requests, args.concurrency, args.seed)
+        print_result(endpoint.name, results[endpoint.name])
+    return results
+
+
+async def benchmark(endpoints: Sequence[Endpoint], args: argparse.Namespace) -> Dict[str, dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+            return await run_all(client, endpoints, args)
+
+    app = create_app()
+    # create_app middleware'lar bilan o'ralgan ilovani qaytaradi; lifespan ichki FastAPI ilovasida
+    inner = app
+    while not hasattr(inner, "router"):
+        inner = inner.app
+    # Ilova xatolari 500 sifatida hisoblanadi, benchmarkni to'xtatmaydi
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with inner.router.lifespan_context(inner):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=args.timeout) as client:
+            return await run_all(client, endpoints, args)
+
+
+def print_result(name: str, result: dict) -> None:
+    print(
+        f"  {name:<24} {result['rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}"
+        f"  p99 {result['p99_ms']:>8.2f}  max {result['max_ms']:>8.2f} ms  errors {result['errors']}"
+    )
+
+
+def change(current: float, previous: float) -> Optional[float]:
+    if not previous:
+        return None
+    return (current - previous) / previous * 100
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Baseline bilan farqni chiqaradi va regressiya bo'lgan endpointlar ro'yxatini qaytaradi."""
+    regressions = []
+    print(f"Baseline bilan farq (regressiya chegarasi {threshold:g}%):")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"  {name:<24} baseline'da yo'q")
+            continue
+        deltas = {key: change(result[key], previous[key]) for key in ("p50_ms", "p95_ms", "p99_ms", "rps")}
+        regressed = (
+            (deltas["p95_ms"] is not None and deltas["p95_ms"] > threshold)
+            or (deltas["rps"] is not None and deltas["rps"] < -threshold)
+        )
+        if regressed:
+            regressions.append(name)
+        formatted = "  ".join(
+            f"{key.replace('_ms', '')} {'n/a' if delta is None else f'{delta:+.1f}%':>7}" for key, delta in deltas.items()
+        )
+        print(f"  {name:<24} {formatted}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000, help="har bir endpoint uchun")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=200, help="o'lchanmaydigan so'rovlar (keshlar va pool)")
+    parser.add_argument("--endpoints", default="", help="vergul bilan: " + ",".join(e.name for e in ENDPOINTS))
+    parser.add_argument("--url", default="", help="masalan http://127.0.0.1:8000; bo'lmasa jarayon ichida")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="", help="natijalarni JSON faylga yozish")
+    parser.add_argument("--baseline", default="", help="solishtirish uchun oldingi --output fayli")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regressiya chegarasi, foiz")
+    parser.add_argument("--fail-on-regression", action="store_true", help="regressiya bo'lsa 1 kod bilan chiqish")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = set(names) - {endpoint.name for endpoint in ENDPOINTS}
+    if unknown:
+        parser.error(f"noma'lum endpoint: {', '.join(sorted(unknown))}")
+    endpoints = [endpoint for endpoint in ENDPOINTS if not names or endpoint.name in names]
+
+    target = args.url or "in-process"
+    print(f"{args.requests} requests per endpoint, concurrency {args.concurrency}, target {target}")
+    results = asyncio.run(benchmark(endpoints, args))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "target": target,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "endpoints": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Natijalar {args.output} fayliga yozildi")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["meta"].get("concurrency") != args.concurrency:
+            print(f"Diqqat: baseline concurrency {baseline['meta'].get('concurrency')}, joriy {args.concurrency}")
+        regressions = compare(results, baseline["endpoints"], args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
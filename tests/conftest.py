@@ -0,0 +1,55 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+# Settings majburiy maydonlari: testlar .env va Postgres'siz ishlaydi
+for name, value in {
+    "API_V1_STR": "/api/v1",
+    "BASE_URL": "http://testserver",
+    "PROJECT_NAME": "Mebel",
+    "PROJECT_DESCRIPTION": "Mebel API",
+    "PROJECT_VERSION": "1.0.0",
+    "POSTGRES_USER": "mebel",
+    "POSTGRES_PASSWORD": "mebel",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DATABASE": "mebel_test",
+    "SECRET_KEY": "test-secret-key-with-enough-length-for-hs256",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "CACHE_BACKEND": "memory",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@compiles(TSVECTOR, "sqlite")
+def _tsvector_on_sqlite(type_, compiler, **kw):
+    # search_vector trigger bilan to'ldiriladi; sqlite'da oddiy matn ustuni yetarli
+    return "TEXT"
+
+
+CATALOG_TABLES = ("categories", "subcategories", "subcategory_product_counts", "products", "product_images", "product_variations")
+
+
+@pytest.fixture
+def catalog_db_url(tmp_path) -> str:
+    """Katalog jadvallari yaratilgan sqlite bazasi (har bir test uchun alohida fayl)."""
+    from app.core.models.base import Base
+    import app.api.models.product.product  # noqa: F401 - jadvallar metadata'ga qo'shiladi
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}"
+
+    async def create():
+        engine = create_async_engine(url)
+        async with engine.begin() as connection:
+            tables = [Base.metadata.tables[name] for name in CATALOG_TABLES]
+            await connection.run_sync(Base.metadata.create_all, tables=tables)
+        await engine.dispose()
+
+    asyncio.run(create())
+    return url
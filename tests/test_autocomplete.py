@@ -0,0 +1,144 @@
+import asyncio
+import json
+import random
+
+from app.api.utils import autocomplete
+from app.api.utils.autocomplete import AutocompleteIndex, Suggestion, index_terms, query_term
+from app.core.cache import MemoryCacheBackend
+
+
+def make_index(backend=None) -> AutocompleteIndex:
+    return AutocompleteIndex(
+        backend=backend or MemoryCacheBackend(100),
+        channel="test:autocomplete",
+        refresh_interval=0,
+        result_cache_size=16,
+        result_cache_ttl=60,
+    )
+
+
+def names(result):
+    return [entry.name for entry in result]
+
+
+def assert_consistent(index: AutocompleteIndex) -> None:
+    assert index._terms == sorted(index._terms)
+    assert index._ranked == sorted(index._ranked, key=index._rank_key)
+    assert len(index._ranked) == len(index._entries)
+    expected = sorted((term, entry.kind, entry.id) for entry in index._entries.values() for term in entry.terms)
+    assert [(term, entry.kind, entry.id) for term, entry in zip(index._terms, index._refs)] == expected
+
+
+def test_terms_start_at_every_word_in_latin():
+    assert index_terms("Yumshoq divan") == ("yumshoq divan", "divan")
+    # Apostrof so'zni bo'ladi: so'rov ham xuddi shunday bo'linadi
+    assert index_terms("Ўриндиқ") == ("o rindiq", "rindiq")
+    assert query_term("O‘rin") == "o rin"
+    assert query_term("  ДИВ ") == "div"
+
+
+def test_search_by_prefix_ranks_popular_then_short_names():
+    index = make_index()
+    index.load([
+        Suggestion("product", 1, "Yumshoq divan", "yumshoq-divan", 0),
+        Suggestion("product", 2, "Divan", "divan", 0),
+        Suggestion("product", 3, "Burchak divan", "burchak-divan", 10),
+        Suggestion("category", 1, "Divanlar", "divanlar", 5),
+        Suggestion("product", 4, "Stol", "stol", 0),
+    ])
+
+    assert names(index.search("div")) == ["Burchak divan", "Divanlar", "Divan", "Yumshoq divan"]
+    assert names(index.search("дива", kinds=["category"])) == ["Divanlar"]
+    assert names(index.search("yumshoq d")) == ["Yumshoq divan"]
+    assert index.search("!!") == []
+
+
+def test_upsert_rename_and_remove_keep_lists_sorted():
+    index = make_index()
+    index.load([Suggestion("product", id, f"Stol {id}", None, id % 3) for id in range(1, 50)])
+
+    index.upsert("product", 7, "Kreslo", None)
+    assert names(index.search("kres")) == ["Kreslo"]
+    assert 7 not in [entry.id for entry in index.search("stol", limit=100)]
+
+    index.remove("product", 8)
+    index.remove("product", 999)
+    assert 8 not in [entry.id for entry in index.search("stol", limit=100)]
+    assert len(index.search("stol", limit=100)) == 47
+    assert_consistent(index)
+
+
+def test_random_updates_match_a_fresh_build():
+    rng = random.Random(3)
+    words = ["stol", "stul", "divan", "shkaf", "kreslo", "oq", "katta"]
+    index = make_index()
+    index.load([])
+    for _ in range(500):
+        id = rng.randrange(60)
+        if rng.random() < 0.2:
+            index.remove("product", id)
+        else:
+            name = " ".join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+            index.upsert("product", id, name, None, popularity=rng.randrange(3))
+    assert_consistent(index)
+
+    fresh = make_index()
+    fresh.load([Suggestion(entry.kind, entry.id, entry.name, entry.slug, entry.popularity) for entry in index._entries.values()])
+    for prefix in words + ["s", "k", "oq s"]:
+        assert index.search(prefix, limit=100) == fresh.search(prefix, limit=100)
+
+
+def test_dense_prefix_uses_ranked_order(monkeypatch):
+    monkeypatch.setattr(autocomplete, "DENSE_RANGE", 3)
+    index = make_index()
+    index.load([Suggestion("product", id, f"Divan {id}", None, id) for id in range(1, 11)])
+
+    assert [entry.id for entry in index.search("d", limit=3)] == [10, 9, 8]
+
+
+def test_record_hit_counts_after_rebuild():
+    index = make_index()
+    index.load([Suggestion("product", 1, "Stol", None, 0), Suggestion("product", 2, "Stul", None, 0)])
+    for _ in range(3):
+        index.record_hit("product", 2)
+
+    assert [entry.id for entry in index.search("st")] == [1, 2]
+    index.load([Suggestion("product", 1, "Stol", None, 0), Suggestion("product", 2, "Stul", None, 0)])
+    assert [entry.id for entry in index.search("st")] == [2, 1]
+
+
+def test_publish_reaches_other_workers():
+    async def scenario():
+        backend = MemoryCacheBackend(100)
+        first, second = make_index(backend), make_index(backend)
+        for index in (first, second):
+            await index.backend.subscribe(index.channel, index._on_message)
+            index.load([])
+
+        await first.publish("category", [(1, "Divanlar", "divanlar", True), (2, "Stollar", "stollar", True)])
+        assert names(second.search("div")) == ["Divanlar"]
+
+        await first.publish("category", [(1, "Divanlar", "divanlar", False)])
+        assert second.search("div") == []
+        assert names(first.search("sto")) == ["Stollar"]
+
+    asyncio.run(scenario())
+
+
+def test_large_message_is_applied_with_one_rebuild(monkeypatch):
+    monkeypatch.setattr(autocomplete, "BULK_REBUILD_ROWS", 2)
+    index = make_index()
+    index.load([Suggestion("product", 1, "Stol", None, 10), Suggestion("product", 2, "Stul", None, 0)])
+    built_at = index.built_at
+    upserts = []
+    monkeypatch.setattr(index, "upsert", lambda *args, **kwargs: upserts.append(args))
+
+    rows = [[1, "Stol yangi", None, True], [2, "Stul", None, False], [3, "Divan", None, True]]
+    index._on_message(json.dumps({"kind": "product", "rows": rows}))
+
+    assert upserts == []
+    assert index.built_at == built_at
+    assert names(index.search("st")) == ["Stol yangi"]
+    assert index._entries[("product", 1)].popularity == 10
+    assert names(index.search("div")) == ["Divan"]
+    assert_consistent(index)
@@ -0,0 +1,119 @@
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+from starlette.requests import Request
+
+from app.api.schemas.product import CategoryCreate
+from app.api.utils.bulk_import import chunk_results, iter_import_rows, run_import
+
+
+def make_request(content_type: str, chunks: List[bytes]) -> Request:
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": [(b"content-type", content_type.encode())]}
+    return Request(scope, receive)
+
+
+async def collect(request: Request):
+    return [row async for row in iter_import_rows(request)]
+
+
+def test_ndjson_lines_split_across_chunks():
+    request = make_request("application/x-ndjson", [b'{"name": "A"}\n{"na', b'me": "B"}\n\nnot json\n[1]'])
+    rows = asyncio.run(collect(request))
+
+    assert rows == [
+        ({"name": "A"}, None),
+        ({"name": "B"}, None),
+        (None, "JSON qatori noto'g'ri"),
+        (None, "Qator obyekt bo'lishi kerak"),
+    ]
+
+
+def test_csv_with_quoted_newline_and_bad_row():
+    request = make_request("text/csv", [b'name,description\nA,"bir\nikki"\nB,\n', b"C,x,extra\n"])
+    rows = asyncio.run(collect(request))
+
+    assert rows == [
+        ({"name": "A", "description": "bir\nikki"}, None),
+        ({"name": "B", "description": None}, None),
+        (None, "Ustunlar soni sarlavhaga mos emas"),
+    ]
+
+
+def test_json_array_and_unsupported_type():
+    rows = asyncio.run(collect(make_request("application/json", [b'[{"name": "A"}, 5]'])))
+    assert rows == [({"name": "A"}, None), (None, "Qator obyekt bo'lishi kerak")]
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(collect(make_request("application/json", [b'{"name": "A"}'])))
+    assert error.value.status_code == 400
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(collect(make_request("text/plain", [b"A"])))
+    assert error.value.status_code == 415
+
+
+async def rows_of(*rows):
+    for row in rows:
+        yield row, None
+
+
+def test_run_import_chunks_validates_and_deduplicates():
+    chunks = []
+
+    async def write_chunk(chunk):
+        chunks.append([slug for _, _, slug in chunk])
+        returned = [SimpleNamespace(id=index, slug=slug, inserted=True) for index, _, slug in chunk]
+        return chunk_results(chunk, returned)
+
+    response = asyncio.run(run_import(
+        rows_of(
+            {"name": "Kitoblar"},
+            {"name": "kitoblar"},
+            {"name": "x" * 256},
+            {"name": "!!!"},
+            {"name": "Telefonlar", "slug": "phones"},
+            {"name": "Oyoq kiyim"},
+        ),
+        CategoryCreate,
+        write_chunk,
+        chunk_size=2,
+    ))
+
+    assert chunks == [["kitoblar", "phones"], ["oyoq-kiyim"]]
+    assert [result.status for result in response.results] == ["created", "skipped", "error", "error", "created", "created"]
+    assert response.results[2].detail.startswith("name:")
+    assert (response.total, response.created, response.skipped, response.failed) == (6, 3, 1, 2)
+
+
+def test_failed_chunk_only_fails_its_rows():
+    async def write_chunk(chunk):
+        if any(slug == "b" for _, _, slug in chunk):
+            raise OperationalError("INSERT", {}, Exception("connection lost"))
+        return chunk_results(chunk, [SimpleNamespace(id=1, slug=slug, inserted=False) for _, _, slug in chunk])
+
+    response = asyncio.run(run_import(
+        rows_of({"name": "a"}, {"name": "b"}, {"name": "c"}),
+        CategoryCreate,
+        write_chunk,
+        chunk_size=1,
+    ))
+
+    assert [result.status for result in response.results] == ["updated", "error", "updated"]
+    assert response.results[1].detail == "Bazaga yozishda xato"
+
+
+def test_chunk_results_marks_existing_slugs_as_skipped():
+    chunk = [(0, None, "a"), (1, None, "b")]
+    results = chunk_results(chunk, [SimpleNamespace(id=7, slug="a", inserted=True)])
+
+    assert [(result.status, result.id) for result in results] == [("created", 7), ("skipped", None)]
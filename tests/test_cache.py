@@ -0,0 +1,143 @@
+import asyncio
+from datetime import date, datetime
+from typing import NamedTuple
+
+import fakeredis
+import pytest
+from pydantic import BaseModel
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend, VersionedCache, register_cache_types
+from app.core.cache import codec
+
+
+class Row(NamedTuple):
+    id: int
+    name: str
+
+
+class Item(BaseModel):
+    id: int
+    tags: list
+
+
+class Unregistered(NamedTuple):
+    id: int
+
+
+register_cache_types(Row, Item)
+
+
+def test_codec_round_trip():
+    value = {
+        "rows": [Row(1, "a"), Row(2, "b")],
+        "item": Item(id=1, tags=["x"]),
+        "pair": (1, "two"),
+        "raw": b"\x00\xff",
+        "at": datetime(2024, 1, 2, 3, 4, 5),
+        "day": date(2024, 1, 2),
+        "none": None,
+    }
+    decoded = codec.loads(codec.dumps(value))
+
+    assert decoded == value
+    assert isinstance(decoded["rows"][0], Row)
+    assert isinstance(decoded["pair"], tuple)
+
+
+def test_codec_rejects_unregistered_and_unknown_types():
+    with pytest.raises(TypeError):
+        codec.dumps(Unregistered(1))
+    with pytest.raises(TypeError):
+        codec.dumps({1, 2})
+    with pytest.raises(ValueError):
+        codec.loads(b'{"__t": "namedtuple", "n": "Unregistered", "v": [1]}')
+    with pytest.raises(ValueError):
+        codec.loads(b'{"__t": "pickle", "v": ""}')
+
+
+def test_redis_backend_stores_tagged_json():
+    async def scenario():
+        backend = RedisCacheBackend("redis://localhost")
+        backend._client = fakeredis.aioredis.FakeRedis()
+        try:
+            await backend.set("key", [Row(1, "a")], ttl=60)
+            assert b"namedtuple" in await backend._client.get("key")
+            assert await backend.get("key") == [Row(1, "a")]
+        finally:
+            await backend.close()
+
+    asyncio.run(scenario())
+
+
+def test_get_or_load_until_invalidated():
+    async def scenario():
+        cache = VersionedCache(MemoryCacheBackend(100), ttl=60, prefix="test")
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return len(calls)
+
+        assert await cache.get_or_load("category", "page:1", loader) == 1
+        assert await cache.get_or_load("category", "page:1", loader) == 1
+        await cache.invalidate("category")
+        assert await cache.get_or_load("category", "page:1", loader) == 2
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+        assert cache.stats()["versions"]["category"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_disabled_cache_always_loads():
+    async def scenario():
+        cache = VersionedCache(MemoryCacheBackend(100), ttl=60, prefix="test", enabled=False)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return len(calls)
+
+        await cache.set("category", "page:1", 10)
+        assert await cache.get_or_load("category", "page:1", loader) == 1
+        assert await cache.get_or_load("category", "page:1", loader) == 2
+
+    asyncio.run(scenario())
+
+
+def test_invalidation_reaches_other_workers():
+    async def scenario():
+        backend = MemoryCacheBackend(100)
+        first = VersionedCache(backend, ttl=60, prefix="test")
+        second = VersionedCache(backend, ttl=60, prefix="test")
+        await first.start()
+        await second.start()
+
+        await second.set("category", "page:1", "old")
+        await first.invalidate("category")
+
+        assert second.stats()["versions"]["category"] == 1
+
+        async def loader():
+            return "new"
+
+        assert await second.get_or_load("category", "page:1", loader) == "new"
+
+    asyncio.run(scenario())
+
+
+def test_backend_failure_falls_back_to_loader():
+    class BrokenBackend(MemoryCacheBackend):
+        async def get_counter(self, key):
+            raise ConnectionError("down")
+
+    async def scenario():
+        cache = VersionedCache(BrokenBackend(100), ttl=60, prefix="test")
+
+        async def loader():
+            return "db"
+
+        assert await cache.get_or_load("category", "page:1", loader) == "db"
+        assert cache.stats()["errors"] == 1
+
+    asyncio.run(scenario())
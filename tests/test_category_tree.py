@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.models.product.product import Category, Subcategory, SubcategoryProductCount
+from app.api.repositories.category import CategoryRepository
+from app.core.cache import get_catalog_cache
+
+
+async def seed(connection):
+    await connection.execute(insert(Category), [
+        {"id": 1, "name": "Mebel", "slug": "mebel", "is_active": True},
+        {"id": 2, "name": "Arxiv", "slug": "arxiv", "is_active": False},
+        {"id": 3, "name": "Yoritish", "slug": "yoritish", "is_active": True},
+    ])
+    await connection.execute(insert(Subcategory), [
+        {"id": 1, "name": "Stollar", "slug": "stollar", "category_id": 1, "is_active": True},
+        {"id": 2, "name": "Stullar", "slug": "stullar", "category_id": 1, "is_active": True},
+        {"id": 3, "name": "Eski", "slug": "eski", "category_id": 1, "is_active": False},
+        {"id": 4, "name": "Arxiv stollar", "slug": "arxiv-stollar", "category_id": 2, "is_active": True},
+    ])
+    # 2-subkategoriyada hali mahsulot yo'q: sanoq qatori ham yo'q
+    await connection.execute(insert(SubcategoryProductCount), [
+        {"subcategory_id": 1, "product_count": 4},
+        {"subcategory_id": 3, "product_count": 7},
+        {"subcategory_id": 4, "product_count": 2},
+    ])
+
+
+def run(catalog_db_url, scenario):
+    async def main():
+        engine = create_async_engine(catalog_db_url)
+        async with engine.begin() as connection:
+            await seed(connection)
+        # Kesh singleton: oldingi testlar daraxti ko'rinmasligi uchun
+        await get_catalog_cache().invalidate("category-tree")
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                return await scenario(CategoryRepository(session=session, read_session=session), session)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_tree_has_active_nodes_with_product_counts(catalog_db_url):
+    async def scenario(repository, session):
+        return await repository.get_category_tree()
+
+    etag, body = run(catalog_db_url, scenario)
+    tree = json.loads(body)
+
+    assert [category["id"] for category in tree] == [1, 3]
+    assert [(child["id"], child["product_count"]) for child in tree[0]["subcategories"]] == [(1, 4), (2, 0)]
+    assert tree[0]["product_count"] == 4
+    assert (tree[1]["subcategories"], tree[1]["product_count"]) == ([], 0)
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_tree_is_served_from_cache_until_invalidated(catalog_db_url):
+    async def scenario(repository, session):
+        first = await repository.get_category_tree()
+        await session.execute(update(SubcategoryProductCount).where(SubcategoryProductCount.subcategory_id == 1).values(product_count=5))
+        await session.commit()
+        cached = await repository.get_category_tree()
+        await get_catalog_cache().invalidate("category-tree")
+        rebuilt = await repository.get_category_tree()
+        return first, cached, rebuilt
+
+    first, cached, rebuilt = run(catalog_db_url, scenario)
+
+    assert cached == first
+    assert rebuilt[0] != first[0]
+    assert json.loads(rebuilt[1])[0]["product_count"] == 5
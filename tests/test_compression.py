@@ -0,0 +1,123 @@
+import asyncio
+import gzip
+import zlib
+from typing import List
+
+from starlette.datastructures import Headers
+
+from app.core.compression import CompressionMiddleware, choose_encoding, get_compressed_body_cache, parse_accept_encoding
+
+BODY = b'{"items": [' + b'{"name": "Yumshoq divan"},' * 200 + b"{}]}"
+
+
+def json_app(body: bytes = BODY, status: int = 200, content_type: bytes = b"application/json", headers=()):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode()), *headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+def call(app, accept_encoding: str = "gzip", path: str = "/") -> List[dict]:
+    middleware = CompressionMiddleware(
+        app,
+        minimum_size=500,
+        content_types=["application/json"],
+        gzip_level=6,
+        brotli_quality=4,
+    )
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "path": path, "query_string": b"", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(middleware(scope, None, send))
+    return messages
+
+
+def test_choose_encoding():
+    assert parse_accept_encoding("gzip;q=0.5, br") == {"gzip": 0.5, "br": 1.0}
+    assert choose_encoding("gzip") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("*") in ("br", "gzip")
+
+
+def test_whole_body_is_gzipped():
+    start, body = call(json_app(), path="/whole")
+    headers = Headers(raw=start["headers"])
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(body["body"])
+    assert gzip.decompress(body["body"]) == BODY
+
+
+def test_small_and_non_json_bodies_are_untouched():
+    start, body = call(json_app(b'{"ok": true}'), path="/small")
+    assert "content-encoding" not in Headers(raw=start["headers"])
+    assert body["body"] == b'{"ok": true}'
+
+    start, body = call(json_app(content_type=b"image/webp"), path="/image")
+    assert "content-encoding" not in Headers(raw=start["headers"])
+    assert body["body"] == BODY
+
+    start, body = call(json_app(status=404), path="/missing")
+    assert "content-encoding" not in Headers(raw=start["headers"])
+
+
+def test_client_without_gzip_gets_identity_with_vary():
+    start, body = call(json_app(), accept_encoding="identity", path="/identity")
+    headers = Headers(raw=start["headers"])
+
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert body["body"] == BODY
+
+
+def test_strong_etag_becomes_weak_and_body_is_cached():
+    app = json_app(headers=[(b"etag", b'"v1"'), (b"cache-control", b"public, max-age=30")])
+    first_start, first_body = call(app, path="/etag")
+    hits = get_compressed_body_cache().hits
+    second_start, second_body = call(app, path="/etag")
+
+    assert get_compressed_body_cache().hits == hits + 1
+    assert Headers(raw=first_start["headers"])["etag"] == 'W/"v1"'
+    assert first_body["body"] == second_body["body"]
+    assert gzip.decompress(second_body["body"]) == BODY
+
+
+def test_streaming_response_is_compressed_in_chunks():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        for index in range(3):
+            await send({"type": "http.response.body", "body": BODY, "more_body": index < 2})
+
+    messages = call(app, path="/stream")
+    headers = Headers(raw=messages[0]["headers"])
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+
+    decompressor = zlib.decompressobj(31)
+    data = b"".join(decompressor.decompress(message["body"]) for message in messages[1:])
+    assert data == BODY * 3
+    assert messages[-1]["more_body"] is False
+
+
+def test_pathsend_gets_the_held_start():
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", b"5000")],
+        })
+        await send({"type": "http.response.pathsend", "path": "/tmp/catalog.json"})
+
+    start, pathsend = call(app, path="/file")
+    assert start["type"] == "http.response.start"
+    assert "content-encoding" not in Headers(raw=start["headers"])
+    assert pathsend == {"type": "http.response.pathsend", "path": "/tmp/catalog.json"}
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+from fastapi import Request, Response
+
+from app.api.utils.http_cache import (
+    conditional_response,
+    etag_matches,
+    http_date,
+    is_not_modified,
+    make_validators,
+)
+
+UPDATED_AT = datetime(2024, 5, 1, 12, 30, 15, 250000)
+
+
+def make_request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_etag_matches_weak_and_lists():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('"abd"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+
+
+def test_validators_depend_on_versions_and_extra():
+    base = make_validators([(1, UPDATED_AT), (2, None)], 10, 1)
+
+    assert base == make_validators([(1, UPDATED_AT), (2, None)], 10, 1)
+    assert base.etag != make_validators([(1, UPDATED_AT + timedelta(seconds=1)), (2, None)], 10, 1).etag
+    assert base.etag != make_validators([(1, UPDATED_AT)], 10, 1).etag
+    # O'chirilgan yozuv updated_at'ni o'zgartirmaydi, total esa o'zgaradi
+    assert base.etag != make_validators([(1, UPDATED_AT), (2, None)], 9, 1).etag
+    assert base.etag.startswith('W/"')
+    assert make_validators([(1, UPDATED_AT), (2, None)]).last_modified == UPDATED_AT
+
+
+def test_collections_rely_on_etag_only():
+    # Ro'yxatdan yozuv o'chirilsa eng so'nggi updated_at o'zgarmaydi
+    before = make_validators([(1, UPDATED_AT), (2, UPDATED_AT - timedelta(days=1))], 2, 1)
+    after = make_validators([(1, UPDATED_AT)], 1, 1)
+
+    assert before.last_modified is None
+    assert not is_not_modified(make_request(if_modified_since=http_date(UPDATED_AT)), after)
+    assert not is_not_modified(make_request(if_none_match=before.etag), after)
+
+    response = Response()
+    assert conditional_response(make_request(), response, after, "public, max-age=30") is None
+    assert "last-modified" not in response.headers
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    validators = make_validators([(1, UPDATED_AT)])
+    fresh = http_date(UPDATED_AT)
+
+    assert is_not_modified(make_request(if_none_match=validators.etag), validators)
+    assert not is_not_modified(make_request(if_none_match='"other"', if_modified_since=fresh), validators)
+
+
+def test_if_modified_since_uses_second_precision():
+    validators = make_validators([(1, UPDATED_AT)])
+
+    assert is_not_modified(make_request(if_modified_since=http_date(UPDATED_AT)), validators)
+    assert not is_not_modified(make_request(if_modified_since=http_date(UPDATED_AT - timedelta(seconds=1))), validators)
+    assert not is_not_modified(make_request(if_modified_since="not a date"), validators)
+    assert not is_not_modified(make_request(), validators)
+
+
+def test_conditional_response_returns_304_with_headers():
+    validators = make_validators([(1, UPDATED_AT)])
+
+    response = Response()
+    assert conditional_response(make_request(), response, validators, "public, max-age=30") is None
+    assert response.headers["etag"] == validators.etag
+    assert response.headers["cache-control"] == "public, max-age=30"
+    assert response.headers["last-modified"] == "Wed, 01 May 2024 12:30:15 GMT"
+
+    not_modified = conditional_response(
+        make_request(if_none_match=validators.etag), Response(), validators, "public, max-age=30"
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == validators.etag
+    assert not_modified.body == b""
@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+
+from app.api.utils import images
+from app.api.utils.image_worker import manifest_path, process_image
+from app.api.utils.images import ImageProcessor, supported_formats
+
+QUALITIES = {"jpeg": 80, "webp": 80}
+
+
+def save_image(path, mode="RGB", size=(800, 400), color=(200, 30, 30), **kwargs) -> tuple:
+    Image.new(mode, size, color).save(path, **kwargs)
+    with open(path, "rb") as file:
+        return str(path), hashlib.sha256(file.read()).hexdigest()
+
+
+def test_variants_for_each_width_and_format_without_upscaling(tmp_path):
+    source, digest = save_image(tmp_path / "source.png")
+    result = process_image(source, digest, str(tmp_path / "out"), [320, 640, 1024], ["jpeg", "webp"], QUALITIES, 10_000_000)
+
+    assert (result["width"], result["height"]) == (800, 400)
+    assert [(variant["width"], variant["height"], variant["format"]) for variant in result["variants"]] == [
+        (320, 160, "jpeg"), (320, 160, "webp"),
+        (640, 320, "jpeg"), (640, 320, "webp"),
+        (800, 400, "jpeg"), (800, 400, "webp"),
+    ]
+    for variant in result["variants"]:
+        assert os.path.basename(variant["path"]).startswith(digest[:24])
+        assert variant["size"] == os.path.getsize(variant["path"])
+    with open(manifest_path(str(tmp_path / "out"), digest)) as file:
+        assert json.load(file) == result
+
+
+def test_transparent_image_is_flattened_on_white_for_jpeg(tmp_path):
+    source, digest = save_image(tmp_path / "source.png", mode="RGBA", size=(100, 100), color=(0, 0, 0, 0))
+    result = process_image(source, digest, str(tmp_path / "out"), [100], ["jpeg", "webp"], QUALITIES, 10_000_000)
+
+    jpeg, webp = result["variants"]
+    with Image.open(jpeg["path"]) as image:
+        assert image.mode == "RGB"
+        assert all(channel > 250 for channel in image.getpixel((50, 50)))
+    with Image.open(webp["path"]) as image:
+        assert image.mode == "RGBA"
+        assert image.getpixel((50, 50))[3] == 0
+
+
+def test_exif_orientation_is_applied(tmp_path):
+    exif = Image.Exif()
+    exif[0x0112] = 6  # 90 daraja burilgan
+    source, digest = save_image(tmp_path / "source.jpg", size=(200, 100), format="JPEG", exif=exif)
+    result = process_image(source, digest, str(tmp_path / "out"), [1000], ["jpeg"], QUALITIES, 10_000_000)
+
+    assert (result["width"], result["height"]) == (100, 200)
+    with Image.open(result["variants"][0]["path"]) as image:
+        assert not image.getexif()
+
+
+def test_invalid_and_oversized_images_raise_value_error(tmp_path):
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+    with pytest.raises(ValueError):
+        process_image(str(broken), "0" * 64, str(tmp_path / "out"), [320], ["jpeg"], QUALITIES, 10_000_000)
+
+    source, digest = save_image(tmp_path / "big.png", size=(400, 400))
+    with pytest.raises(ValueError):
+        process_image(source, digest, str(tmp_path / "out"), [320], ["jpeg"], QUALITIES, 50_000)
+
+
+def test_supported_formats_rejects_unknown():
+    assert supported_formats(["jpeg"]) == ["jpeg"]
+    with pytest.raises(ValueError):
+        supported_formats(["gif"])
+
+
+def make_processor(monkeypatch, tmp_path, **kwargs) -> ImageProcessor:
+    monkeypatch.setattr(images, "MEDIA_ROOT", str(tmp_path / "media"))
+    options = dict(max_workers=1, max_queue=4, queue_timeout=5, widths=[320], formats=["jpeg"], qualities=QUALITIES, max_pixels=10_000_000)
+    options.update(kwargs)
+    processor = ImageProcessor(**options)
+    # Process pool o'rniga standart thread pool: testda spawn qilish shart emas
+    monkeypatch.setattr(processor, "_get_executor", lambda: None)
+    return processor
+
+
+def test_processor_reuses_manifest_and_maps_errors_to_400(monkeypatch, tmp_path):
+    processor = make_processor(monkeypatch, tmp_path)
+    source, digest = save_image(tmp_path / "source.png")
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+
+    async def scenario():
+        first = await processor.process(source, digest, "product_image")
+        second = await processor.process(source, digest, "product_image")
+        assert first == second
+        assert processor.primary_variant(first)["width"] == 320
+
+        with pytest.raises(HTTPException) as error:
+            await processor.process(str(broken), "1" * 64, "product_image")
+        assert error.value.status_code == 400
+
+    asyncio.run(scenario())
+    stats = processor.stats()
+    assert (stats["completed"], stats["deduplicated"], stats["failed"]) == (1, 1, 1)
+
+
+def test_processor_rejects_when_queue_is_full(monkeypatch, tmp_path):
+    processor = make_processor(monkeypatch, tmp_path, max_queue=1)
+    release = threading.Event()
+    monkeypatch.setattr(images, "process_image", lambda *args: release.wait() and {"source_size": 0, "variants": []})
+
+    async def scenario():
+        running = asyncio.create_task(processor.process("a", "a" * 64, "x"))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(processor.process("b", "b" * 64, "x"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as error:
+            await processor.process("c", "c" * 64, "x")
+        assert error.value.status_code == 503
+        release.set()
+        await asyncio.gather(running, waiting)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+    assert processor.stats()["rejected"] == 1
+
+
+def test_primary_variant_requires_variants():
+    with pytest.raises(HTTPException):
+        ImageProcessor.primary_variant({"variants": []})
@@ -0,0 +1,101 @@
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.api.utils.media import MediaFiles, is_immutable
+
+DIGEST = "0123456789abcdef01234567"
+
+
+def make_client(directory, **kwargs):
+    options = dict(
+        cache_control="public, max-age=60",
+        immutable_cache_control="public, max-age=31536000, immutable",
+        memory_cache_bytes=1024,
+        memory_cache_max_file=512,
+    )
+    options.update(kwargs)
+    media = MediaFiles(directory=str(directory), **options)
+    return media, TestClient(Starlette(routes=[Mount("/media", media)]))
+
+
+def write(path, body: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(body)
+
+
+def test_is_immutable_only_for_hashed_variants():
+    assert is_immutable(f"product_image/{DIGEST}-320.webp")
+    assert not is_immutable(f"product_image/{DIGEST}.json")
+    assert not is_immutable("product_image/photo.jpg")
+    assert not is_immutable(f"product_image/{DIGEST[:-1]}-320.webp")
+
+
+def test_hashed_files_are_immutable_with_name_etag(tmp_path):
+    write(tmp_path / "product_image" / f"{DIGEST}-320.webp", b"webp")
+    write(tmp_path / "product_image" / "photo.jpg", b"jpeg")
+    _, client = make_client(tmp_path)
+
+    hashed = client.get(f"/media/product_image/{DIGEST}-320.webp")
+    assert hashed.status_code == 200
+    assert hashed.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert hashed.headers["etag"] == f'"{DIGEST}-320.webp"'
+
+    plain = client.get("/media/product_image/photo.jpg")
+    assert plain.headers["cache-control"] == "public, max-age=60"
+
+    revalidated = client.get(f"/media/product_image/{DIGEST}-320.webp", headers={"if-none-match": hashed.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_small_files_are_served_from_memory(tmp_path):
+    path = tmp_path / "product_image" / f"{DIGEST}-320.webp"
+    write(path, b"webp")
+    media, client = make_client(tmp_path)
+
+    assert client.get(f"/media/product_image/{DIGEST}-320.webp").content == b"webp"
+    path.unlink()
+    cached = client.get(f"/media/product_image/{DIGEST}-320.webp")
+    assert (cached.status_code, cached.content) == (200, b"webp")
+    assert cached.headers["etag"] == f'"{DIGEST}-320.webp"'
+    assert client.get(f"/media/product_image/{DIGEST}-320.webp", headers={"if-none-match": f'"{DIGEST}-320.webp"'}).status_code == 304
+    assert (media.stats()["memory_misses"], media.stats()["memory_hits"]) == (1, 2)
+
+
+def test_large_files_and_ranges_skip_memory(tmp_path):
+    write(tmp_path / f"{DIGEST}-1600.webp", b"x" * 600)
+    write(tmp_path / f"{DIGEST}-320.webp", b"0123456789")
+    media, client = make_client(tmp_path)
+
+    assert len(client.get(f"/media/{DIGEST}-1600.webp").content) == 600
+    partial = client.get(f"/media/{DIGEST}-320.webp", headers={"range": "bytes=2-4"})
+    assert (partial.status_code, partial.content) == (206, b"234")
+    assert media.stats()["memory_entries"] == 0
+
+
+def test_memory_cache_is_bounded(tmp_path):
+    for width in (100, 200, 300):
+        write(tmp_path / f"{DIGEST}-{width}.webp", b"x" * 400)
+    media, client = make_client(tmp_path)
+
+    for width in (100, 200, 300):
+        client.get(f"/media/{DIGEST}-{width}.webp")
+    assert media.stats()["memory_entries"] == 2
+    assert media.stats()["memory_bytes"] == 800
+
+
+def test_unfinished_uploads_are_hidden(tmp_path):
+    write(tmp_path / "uploads" / "session.part", b"secret")
+    _, client = make_client(tmp_path)
+
+    assert client.get("/media/uploads/session.part").status_code == 404
+
+
+def test_accel_redirect_hands_the_body_to_nginx(tmp_path):
+    write(tmp_path / "product_image" / f"{DIGEST}-320.webp", b"webp")
+    _, client = make_client(tmp_path, memory_cache_bytes=0, accel_redirect="/protected-media")
+
+    response = client.get(f"/media/product_image/{DIGEST}-320.webp")
+    assert response.headers["x-accel-redirect"] == f"/protected-media/product_image/{DIGEST}-320.webp"
+    assert response.headers["etag"] == f'"{DIGEST}-320.webp"'
+    assert response.content == b""
@@ -0,0 +1,43 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.utils.pagination import decode_cursor, encode_cursor, next_cursor
+
+
+def test_cursor_round_trip():
+    for last_id in (1, 42, 2**40):
+        assert decode_cursor(encode_cursor(last_id)) == last_id
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(123456)
+    assert "=" not in cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not a cursor",
+    "%%%",
+    base64.urlsafe_b64encode(b"plain text").decode(),
+    base64.urlsafe_b64encode(b'{"page": 2}').decode(),
+    base64.urlsafe_b64encode(b'{"id": "abc"}').decode(),
+    base64.urlsafe_b64encode(b'{"id": null}').decode(),
+    base64.urlsafe_b64encode(b"[1, 2]").decode(),
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_next_cursor_only_when_extra_row():
+    class Row:
+        def __init__(self, id):
+            self.id = id
+
+    rows = [Row(id) for id in (3, 5, 8)]
+    assert next_cursor(rows, 3) is None
+    assert decode_cursor(next_cursor(rows, 2)) == 5
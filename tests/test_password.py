@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.utils.password import PasswordHasher
+
+
+def test_hash_and_verify():
+    async def scenario():
+        hasher = PasswordHasher(max_workers=2, max_concurrency=2, max_queue=8, queue_timeout=5)
+        try:
+            hashed = await hasher.hash("maxfiy-parol")
+            assert await hasher.verify("maxfiy-parol", hashed)
+            assert not await hasher.verify("boshqa-parol", hashed)
+            assert hasher.stats()["completed"] == 3
+        finally:
+            hasher.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_is_rejected_with_503():
+    async def scenario():
+        hasher = PasswordHasher(max_workers=1, max_concurrency=1, max_queue=1, queue_timeout=5)
+        release = threading.Event()
+        try:
+            running = asyncio.create_task(hasher._run(release.wait))
+            await asyncio.sleep(0.05)
+            waiting = asyncio.create_task(hasher._run(release.wait))
+            await asyncio.sleep(0.05)
+            assert hasher.stats()["in_flight"] == 1
+            assert hasher.stats()["waiting"] == 1
+
+            with pytest.raises(HTTPException) as error:
+                await hasher._run(release.wait)
+            assert error.value.status_code == 503
+            assert error.value.headers["Retry-After"] == "1"
+
+            release.set()
+            await asyncio.gather(running, waiting)
+            assert hasher.stats()["rejected"] == 1
+            assert hasher.stats()["completed"] == 2
+        finally:
+            release.set()
+            hasher.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_queue_timeout_is_rejected_with_503():
+    async def scenario():
+        hasher = PasswordHasher(max_workers=1, max_concurrency=1, max_queue=4, queue_timeout=0.05)
+        release = threading.Event()
+        try:
+            running = asyncio.create_task(hasher._run(release.wait))
+            await asyncio.sleep(0.02)
+            with pytest.raises(HTTPException) as error:
+                await hasher._run(release.wait)
+            assert error.value.status_code == 503
+            release.set()
+            await running
+        finally:
+            release.set()
+            hasher.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_request_keeps_its_slot_until_the_thread_finishes():
+    async def scenario():
+        hasher = PasswordHasher(max_workers=2, max_concurrency=1, max_queue=4, queue_timeout=0.1)
+        release = threading.Event()
+        try:
+            running = asyncio.create_task(hasher._run(release.wait))
+            await asyncio.sleep(0.05)
+            running.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await running
+
+            # Thread hali ishlayapti: slot band, yangi so'rov navbatda kutib 503 oladi
+            assert hasher.stats()["in_flight"] == 1
+            with pytest.raises(HTTPException):
+                await hasher._run(lambda: None)
+
+            release.set()
+            await asyncio.sleep(0.05)
+            assert hasher.stats()["in_flight"] == 0
+            assert await hasher._run(lambda: "ok") == "ok"
+        finally:
+            release.set()
+            hasher.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_pool_is_recreated_after_shutdown():
+    hasher = PasswordHasher(max_workers=1, max_concurrency=1, max_queue=4, queue_timeout=5)
+
+    async def scenario():
+        return await hasher._run(lambda: "ok")
+
+    # Har bir asyncio.run alohida create_app/lifespan kabi
+    for _ in range(2):
+        assert asyncio.run(scenario()) == "ok"
+        hasher.shutdown()
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.models.product.product import Category, Product, ProductImage, ProductVariation, Subcategory
+from app.api.repositories.product import ProductRepository
+
+NOW = datetime(2024, 1, 1)
+
+
+async def seed(connection):
+    await connection.execute(insert(Category), [{"id": 1, "name": "Mebel", "slug": "mebel", "is_active": True}])
+    await connection.execute(insert(Subcategory), [
+        {"id": 1, "name": "Stollar", "slug": "stollar", "category_id": 1, "is_active": True},
+        {"id": 2, "name": "Stullar", "slug": "stullar", "category_id": 1, "is_active": True},
+    ])
+    await connection.execute(insert(Product), [
+        {
+            "id": index,
+            "name": f"Mahsulot {index}",
+            "slug": f"mahsulot-{index}",
+            "price": 100.0 * index,
+            "is_active": index != 2,
+            "subcategory_id": 1 if index <= 3 else 2,
+            "created_at": NOW,
+            "updated_at": NOW,
+        }
+        for index in range(1, 6)
+    ])
+    await connection.execute(insert(ProductImage), [
+        {"id": index, "image_path": f"/media/{index}.jpg", "product_id": index, "created_at": NOW, "updated_at": NOW}
+        for index in range(1, 6)
+    ])
+    await connection.execute(insert(ProductVariation), [
+        {"id": 1, "name": "Katta", "sku": "SKU-1", "price": 120.0, "product_id": 1, "created_at": NOW, "updated_at": NOW},
+    ])
+
+
+def run(catalog_db_url, scenario):
+    async def main():
+        engine = create_async_engine(catalog_db_url)
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        async with engine.begin() as connection:
+            await seed(connection)
+        statements.clear()
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                return await scenario(ProductRepository(session=session, read_session=session), statements)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_product_list_hides_inactive_and_loads_relations_in_three_queries(catalog_db_url):
+    async def scenario(repository, statements):
+        page = await repository.get_products(page=1, size=10)
+        page_statements = [statement for statement in statements if "count(" not in statement.lower()]
+        return page, page_statements
+
+    page, statements = run(catalog_db_url, scenario)
+
+    assert [item.id for item in page.items] == [1, 3, 4, 5]
+    assert page.total == 4
+    assert [len(item.images) for item in page.items] == [1, 1, 1, 1]
+    assert [len(item.variations) for item in page.items] == [1, 0, 0, 0]
+    # mahsulotlar + images IN (...) + variations IN (...)
+    assert len(statements) == 3
+
+
+def test_subcategory_list_counts_only_active_products(catalog_db_url):
+    async def scenario(repository, statements):
+        return await repository.get_products(page=1, size=1, subcategory_id=1)
+
+    page = run(catalog_db_url, scenario)
+
+    assert [item.id for item in page.items] == [1]
+    assert (page.total, page.pages) == (2, 2)
+    assert page.next_cursor is not None
+
+
+def test_cursor_pages_skip_inactive_products(catalog_db_url):
+    async def scenario(repository, statements):
+        first = await repository.get_products(size=2)
+        second = await repository.get_products(size=2, cursor=first.next_cursor)
+        return first, second
+
+    first, second = run(catalog_db_url, scenario)
+
+    assert [item.id for item in first.items] == [1, 3]
+    assert [item.id for item in second.items] == [4, 5]
+    assert second.page is None
+    assert second.next_cursor is None
+
+
+def test_inactive_product_detail_and_version_are_not_found(catalog_db_url):
+    async def scenario(repository, statements):
+        with pytest.raises(HTTPException) as error:
+            await repository.get_product_by_id(2)
+        assert error.value.status_code == 404
+        return await repository.get_product_version(2), await repository.get_product_version(1)
+
+    hidden, visible = run(catalog_db_url, scenario)
+
+    assert hidden is None
+    assert (visible.images, visible.variations) == (1, 1)
@@ -0,0 +1,25 @@
+from app.core.datebases.queries import normalize_sql
+
+
+def test_parameters_and_literals_are_replaced():
+    assert normalize_sql("SELECT * FROM products WHERE id = $1") == "SELECT * FROM products WHERE id = ?"
+    assert normalize_sql("SELECT * FROM products WHERE id = %(id_1)s") == "SELECT * FROM products WHERE id = ?"
+    assert normalize_sql("SELECT * FROM products WHERE slug = :slug") == "SELECT * FROM products WHERE slug = ?"
+    assert normalize_sql("SELECT * FROM products WHERE name = 'it''s' AND price > 10.5") == (
+        "SELECT * FROM products WHERE name = ? AND price > ?"
+    )
+
+
+def test_whitespace_is_collapsed():
+    assert normalize_sql("SELECT id\n  FROM   categories\n\tLIMIT 20") == "SELECT id FROM categories LIMIT ?"
+
+
+def test_in_lists_of_any_length_share_one_shape():
+    two = normalize_sql("SELECT * FROM product_images WHERE product_id IN ($1, $2)")
+    five = normalize_sql("SELECT * FROM product_images WHERE product_id IN ($1, $2, $3, $4, $5)")
+    assert two == five == "SELECT * FROM product_images WHERE product_id IN (?)"
+
+
+def test_identifiers_and_casts_are_kept():
+    assert normalize_sql("SELECT products_1.id FROM products AS products_1") == "SELECT products_1.id FROM products AS products_1"
+    assert normalize_sql("SELECT CAST(:lsn AS pg_lsn)::text") == "SELECT CAST(? AS pg_lsn)::text"
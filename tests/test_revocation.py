@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import fakeredis
+
+from app.api.utils.revocation import RevocationList
+from app.core.cache.backends import MemoryCacheBackend, RedisCacheBackend
+
+
+def redis_backend(server: fakeredis.FakeServer) -> RedisCacheBackend:
+    backend = RedisCacheBackend("redis://localhost:6379/0")
+    backend._client = fakeredis.FakeAsyncRedis(server=server)
+    return backend
+
+
+async def eventually(condition, timeout: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if await condition():
+            return True
+        await asyncio.sleep(0.02)
+    return False
+
+
+def test_revoke_and_restore_on_one_worker():
+    async def scenario():
+        revocations = RevocationList(MemoryCacheBackend(100), "test", ttl=60, refresh_interval=60)
+        await revocations.start()
+
+        await revocations.revoke(5)
+        assert await revocations.is_revoked(5)
+        assert not await revocations.is_revoked(6)
+
+        await revocations.restore(5)
+        assert not await revocations.is_revoked(5)
+
+    asyncio.run(scenario())
+
+
+def test_revocation_propagates_between_workers():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        first_backend, second_backend = redis_backend(server), redis_backend(server)
+        first = RevocationList(first_backend, "test", ttl=60, refresh_interval=3600)
+        second = RevocationList(second_backend, "test", ttl=60, refresh_interval=3600)
+        try:
+            await first.start()
+            await second.start()
+
+            await first.revoke(11)
+            assert await eventually(lambda: second.is_revoked(11))
+
+            await first.restore(11)
+            assert await eventually(lambda: _not(second.is_revoked(11)))
+        finally:
+            await first_backend.close()
+            await second_backend.close()
+
+    asyncio.run(scenario())
+
+
+def test_late_worker_loads_revocations_from_backend():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        first_backend, late_backend = redis_backend(server), redis_backend(server)
+        first = RevocationList(first_backend, "test", ttl=60, refresh_interval=3600)
+        try:
+            await first.start()
+            await first.revoke(3)
+            await first.revoke(4)
+            await first.restore(4)
+
+            late = RevocationList(late_backend, "test", ttl=60, refresh_interval=3600)
+            await late.start()
+            assert await late.is_revoked(3)
+            assert not await late.is_revoked(4)
+        finally:
+            await first_backend.close()
+            await late_backend.close()
+
+    asyncio.run(scenario())
+
+
+def test_expired_revocations_are_dropped(monkeypatch):
+    async def scenario():
+        revocations = RevocationList(MemoryCacheBackend(100), "test", ttl=60, refresh_interval=0)
+        await revocations.start()
+        await revocations.revoke(9)
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 120)
+        assert not await revocations.is_revoked(9)
+        assert revocations.stats()["revoked"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_backend_errors_keep_the_local_copy():
+    class FailingBackend(MemoryCacheBackend):
+        fail = False
+
+        async def zrangebyscore(self, key, min_score):
+            if self.fail:
+                raise ConnectionError("backend down")
+            return await super().zrangebyscore(key, min_score)
+
+    async def scenario():
+        backend = FailingBackend(100)
+        revocations = RevocationList(backend, "test", ttl=60, refresh_interval=0)
+        await revocations.start()
+        await revocations.revoke(2)
+
+        backend.fail = True
+        assert await revocations.is_revoked(2)
+        assert revocations.stats()["errors"] == 1
+
+    asyncio.run(scenario())
+
+
+async def _not(awaitable) -> bool:
+    return not await awaitable
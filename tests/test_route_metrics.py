@@ -0,0 +1,108 @@
+from fastapi import APIRouter, FastAPI, HTTPException
+from starlette.middleware.cors import CORSMiddleware
+from starlette.staticfiles import StaticFiles
+from starlette.testclient import TestClient
+
+from app.api.utils.route_metrics import RequestMetricsMiddleware, route_template
+from app.core.metrics import PrometheusWriter, RequestMetrics, write_request_metrics
+
+
+def test_route_template_restores_router_prefix():
+    assert route_template("/{product_id}", "/api/v1/product/15", {"product_id": 15}) == "/api/v1/product/{product_id}"
+
+
+def test_route_template_with_several_params():
+    template = route_template(
+        "/{product_id}/images/uploads/{upload_id}",
+        "/api/v1/product/3/images/uploads/abc",
+        {"product_id": 3, "upload_id": "abc"},
+    )
+    assert template == "/api/v1/product/{product_id}/images/uploads/{upload_id}"
+
+
+def test_route_template_without_params():
+    assert route_template("/tree", "/api/v1/category/tree", {}) == "/api/v1/category/tree"
+
+
+def make_client(tmp_path):
+    product = APIRouter()
+
+    @product.get("/{product_id}")
+    async def get_product(product_id: int):
+        if product_id == 0:
+            raise HTTPException(status_code=404, detail="Product not found")
+        if product_id == 500:
+            raise RuntimeError("boom")
+        return {"id": product_id}
+
+    v1 = APIRouter(prefix="/api/v1")
+    v1.include_router(product, prefix="/product")
+    app = FastAPI()
+    (tmp_path / "logo.txt").write_text("logo")
+    app.mount("/media", StaticFiles(directory=str(tmp_path)))
+    app.include_router(v1)
+
+    middleware = RequestMetricsMiddleware(CORSMiddleware(app, allow_origins=["https://shop.example"], allow_methods=["GET"]))
+    middleware.registry = RequestMetrics()
+    return middleware.registry, TestClient(middleware, raise_server_exceptions=False)
+
+
+def statuses(registry: RequestMetrics) -> dict:
+    return {key: dict(metrics.statuses) for key, metrics in registry.routes.items()}
+
+
+def test_matched_routes_use_full_template(tmp_path):
+    registry, client = make_client(tmp_path)
+    client.get("/api/v1/product/1")
+    client.get("/api/v1/product/2")
+    client.get("/api/v1/product/0")
+    client.get("/api/v1/product/x")
+    client.post("/api/v1/product/1")
+
+    assert statuses(registry) == {
+        ("GET", "/api/v1/product/{product_id}"): {200: 2, 404: 1, 422: 1},
+        ("POST", "/api/v1/product/{product_id}"): {405: 1},
+    }
+    assert registry.in_flight == 0
+
+
+def test_unmatched_paths_share_one_label(tmp_path):
+    registry, client = make_client(tmp_path)
+    client.get("/wp-login.php")
+    client.get("/api/v1/nothing/here")
+    client.request("PROPFIND", "/x")
+
+    assert statuses(registry) == {("GET", "unmatched"): {404: 2}, ("OTHER", "unmatched"): {404: 1}}
+
+
+def test_mounted_media_is_recorded(tmp_path):
+    registry, client = make_client(tmp_path)
+    client.get("/media/logo.txt")
+    client.get("/media/missing.txt")
+
+    assert statuses(registry) == {("GET", "/media/{path}"): {200: 1, 404: 1}}
+
+
+def test_app_errors_and_cors_rejections_are_recorded(tmp_path):
+    registry, client = make_client(tmp_path)
+    client.get("/api/v1/product/500")
+    client.options(
+        "/api/v1/product/1",
+        headers={"origin": "https://evil.example", "access-control-request-method": "GET"},
+    )
+
+    assert statuses(registry)[("GET", "/api/v1/product/{product_id}")] == {500: 1}
+    assert statuses(registry)[("OPTIONS", "unmatched")] == {400: 1}
+    assert registry.in_flight == 0
+
+
+def test_prometheus_output():
+    registry = RequestMetrics()
+    registry.route("GET", "unmatched").finish(404, 0.002)
+    writer = PrometheusWriter()
+    write_request_metrics(writer, registry)
+    text = writer.render()
+
+    assert "http_requests_in_flight 0.0" in text
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1.0' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched"} 1' in text
@@ -0,0 +1,144 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.models.product.product import Category, Product, ProductVariation, Subcategory
+from app.api.repositories.product import ProductRepository
+from app.api.schemas.product import ProductSearchFilters
+
+NOW = datetime(2024, 1, 1)
+
+# id, subcategory, price, color, width, is_featured, is_active
+PRODUCTS = [
+    (1, 1, 100.0, "oq", 50.0, True, True),
+    (2, 1, 200.0, "qora", 80.0, False, True),
+    (3, 2, 300.0, "oq", 120.0, False, True),
+    (4, 2, 400.0, "jigarrang", 150.0, True, True),
+    (5, 1, 500.0, "oq", 60.0, True, False),
+]
+
+# product_id, material, size, is_active
+VARIATIONS = [
+    (1, "yog'och", "S", True),
+    (1, "metall", "M", True),
+    (2, "yog'och", "M", True),
+    (3, "metall", "L", True),
+    (4, "yog'och", "L", False),
+]
+
+
+async def seed(connection):
+    await connection.execute(insert(Category), [{"id": 1, "name": "Mebel", "slug": "mebel"}])
+    await connection.execute(insert(Subcategory), [
+        {"id": 1, "name": "Stollar", "slug": "stollar", "category_id": 1},
+        {"id": 2, "name": "Shkaflar", "slug": "shkaflar", "category_id": 1},
+    ])
+    await connection.execute(insert(Product), [
+        {
+            "id": id_, "name": f"Mahsulot {id_}", "slug": f"mahsulot-{id_}", "subcategory_id": subcategory_id,
+            "price": price, "color": color, "width": width, "is_featured": featured, "is_active": active,
+            "created_at": NOW, "updated_at": NOW,
+        }
+        for id_, subcategory_id, price, color, width, featured, active in PRODUCTS
+    ])
+    await connection.execute(insert(ProductVariation), [
+        {
+            "id": index, "name": f"{material} {size}", "sku": f"SKU-{index}", "price": 1.0, "product_id": product_id,
+            "material": material, "size": size, "is_active": active, "created_at": NOW, "updated_at": NOW,
+        }
+        for index, (product_id, material, size, active) in enumerate(VARIATIONS, start=1)
+    ])
+
+
+@pytest.fixture
+def catalog(catalog_db_url) -> str:
+    async def main():
+        engine = create_async_engine(catalog_db_url)
+        async with engine.begin() as connection:
+            await seed(connection)
+        await engine.dispose()
+
+    asyncio.run(main())
+    return catalog_db_url
+
+
+def search(catalog, page=1, size=20, **filters):
+    async def main():
+        engine = create_async_engine(catalog)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                repository = ProductRepository(session=session, read_session=session)
+                return await repository.search_products(ProductSearchFilters(**filters), page, size)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def facet(response, name):
+    return {item.value: item.count for item in getattr(response.facets, name)}
+
+
+def test_no_filters_counts_active_products_only(catalog):
+    response = search(catalog)
+
+    assert [item.id for item in response.items] == [4, 3, 2, 1]
+    assert response.total == 4
+    assert facet(response, "color") == {"oq": 2, "qora": 1, "jigarrang": 1}
+    assert facet(response, "subcategory_id") == {"1": 2, "2": 2}
+    # bool qiymat matni dialektga bog'liq (sqlite: 1/0, Postgres: true/false)
+    assert sorted(facet(response, "is_featured").values()) == [2, 2]
+    assert (response.facets.price.min, response.facets.price.max, response.facets.price.count) == (100.0, 400.0, 4)
+    # Nofaol variatsiya (4-mahsulot) material/o'lcham facetiga kirmaydi
+    assert facet(response, "material") == {"yog'och": 2, "metall": 2}
+    assert facet(response, "variation_size") == {"S": 1, "M": 2, "L": 1}
+
+
+def test_facet_ignores_its_own_filter_but_applies_the_others(catalog):
+    response = search(catalog, color=["oq"], subcategory_id=[1])
+
+    assert [item.id for item in response.items] == [1]
+    assert response.total == 1
+    # color faceti color filtrisiz, lekin subcategory filtri bilan
+    assert facet(response, "color") == {"oq": 1, "qora": 1}
+    # subcategory faceti subcategory filtrisiz, lekin color filtri bilan
+    assert facet(response, "subcategory_id") == {"1": 1, "2": 1}
+
+
+def test_price_and_dimension_ranges(catalog):
+    response = search(catalog, min_price=150, max_price=450, min_width=100)
+
+    assert [item.id for item in response.items] == [4, 3]
+    # price faceti narx filtrisiz: kenglik sharti qoladi
+    assert (response.facets.price.min, response.facets.price.max) == (300.0, 400.0)
+
+
+def test_variation_filters_match_within_one_active_variation(catalog):
+    # 1-mahsulotda yog'och S va metall M bor, lekin "yog'och M" yo'q
+    response = search(catalog, material=["yog'och"], variation_size=["M"])
+    assert [item.id for item in response.items] == [2]
+
+    # 4-mahsulotning yagona variatsiyasi nofaol
+    response = search(catalog, material=["yog'och"], variation_size=["L"])
+    assert response.total == 0
+
+
+def test_price_sort_and_paging(catalog):
+    response = search(catalog, page=2, size=3, sort="price_asc")
+
+    assert [item.id for item in response.items] == [4]
+    assert (response.total, response.pages) == (4, 2)
+
+
+def test_unknown_sort_is_rejected(catalog):
+    with pytest.raises(HTTPException) as error:
+        search(catalog, sort="name")
+    assert error.value.status_code == 400
+
+    # relevance faqat matnli qidiruv bilan
+    with pytest.raises(HTTPException):
+        search(catalog, sort="relevance", q="   ")
@@ -0,0 +1,59 @@
+from sqlalchemy.dialects import postgresql
+
+from app.api.repositories.product import ProductRepository
+from app.api.utils.text_search import normalize, prefix_tsquery, search_variants, to_cyrillic, to_latin
+
+
+def compile_pg(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+def test_transliteration_both_ways():
+    assert to_latin("шкаф") == "shkaf"
+    assert to_latin("ўриндиқ") == "o'rindiq"
+    assert to_cyrillic("shkaf") == "шкаф"
+    assert to_cyrillic("o'rindiq") == "ўриндиқ"
+
+
+def test_normalize_unifies_apostrophes_and_case():
+    assert normalize("  O‘rindiq ") == "o'rindiq"
+    assert normalize("Gʻildirak") == "g'ildirak"
+
+
+def test_search_variants_are_unique():
+    assert search_variants("Stol") == ["stol", "стол"]
+    assert search_variants("стол") == ["стол", "stol"]
+    assert search_variants("123") == ["123"]
+    assert search_variants("   ") == []
+
+
+def test_prefix_tsquery_keeps_only_words():
+    assert prefix_tsquery("oq stol") == "oq:* & stol:*"
+    # tsquery operatorlari so'rovga tushmaydi
+    assert prefix_tsquery("stol & !(shkaf | ':*'") == "stol:* & shkaf:*"
+    assert prefix_tsquery("!&|") is None
+
+
+def test_text_condition_uses_tsvector_and_trigram_with_bound_values():
+    condition = ProductRepository._ProductRepository__text_condition("oq stol")
+    sql = compile_pg(condition)
+    params = condition.compile(dialect=postgresql.dialect()).params
+
+    assert "products.search_vector @@ to_tsquery" in sql
+    assert "<%% products.name" in sql
+    assert "oq:* & stol:*" in params.values()
+    assert "оқ стол" in params.values()
+    # Foydalanuvchi matni SQL ichiga qo'shilmaydi
+    assert "stol" not in sql
+
+
+def test_text_condition_without_words_matches_nothing():
+    assert compile_pg(ProductRepository._ProductRepository__text_condition("")) == "false"
+
+
+def test_relevance_rank_combines_variants():
+    sql = compile_pg(ProductRepository._ProductRepository__text_rank("stol"))
+
+    assert sql.startswith("greatest(")
+    assert sql.count("ts_rank_cd(") == 2
+    assert sql.count("word_similarity(") == 2
@@ -0,0 +1,82 @@
+import time
+
+import jwt
+import pytest
+
+from app.api.utils.token import TokenVerifier
+
+SECRET = "test-secret-key-with-enough-length-for-hs256"
+
+
+def make_token(expires_in: float, secret: str = SECRET, **claims) -> str:
+    return jwt.encode({"sub": "7", "exp": int(time.time() + expires_in), **claims}, secret, algorithm="HS256")
+
+
+def test_valid_token_is_cached():
+    verifier = TokenVerifier(SECRET, "HS256", maxsize=10)
+    token = make_token(60)
+
+    assert verifier.verify(token)["sub"] == "7"
+    assert verifier.verify(token)["sub"] == "7"
+    assert verifier.stats()["misses"] == 1
+    assert verifier.stats()["hits"] == 1
+
+
+def test_cached_payload_is_a_copy():
+    verifier = TokenVerifier(SECRET, "HS256", maxsize=10)
+    token = make_token(60)
+
+    verifier.verify(token)["sub"] = "changed"
+    assert verifier.verify(token)["sub"] == "7"
+
+
+def test_expired_token_is_rejected():
+    verifier = TokenVerifier(SECRET, "HS256", maxsize=10)
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(make_token(-10))
+    assert verifier.stats()["failures"] == 1
+    assert verifier.stats()["size"] == 0
+
+
+def test_cached_token_is_not_served_after_exp(monkeypatch):
+    verifier = TokenVerifier(SECRET, "HS256", maxsize=10)
+    token = make_token(30)
+    verifier.verify(token)
+
+    # Kesh exp'dan keyin yozuvni tashlab, tokenni qayta dekodlashi kerak
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    decoded = []
+    monkeypatch.setattr(verifier._jwt, "decode", lambda *args, **kwargs: decoded.append(args) or {"sub": "7"})
+    verifier.verify(token)
+
+    assert len(decoded) == 1
+    assert verifier.stats()["hits"] == 0
+    assert verifier.stats()["misses"] == 2
+
+
+def test_token_expiring_during_use_is_rejected():
+    verifier = TokenVerifier(SECRET, "HS256", maxsize=10)
+    token = jwt.encode({"sub": "7", "exp": int(time.time()) + 1}, SECRET, algorithm="HS256")
+    verifier.verify(token)
+
+    time.sleep(max(0.0, jwt.decode(token, options={"verify_signature": False})["exp"] - time.time()) + 0.05)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(token)
+
+
+def test_wrong_signature_is_rejected():
+    verifier = TokenVerifier(SECRET, "HS256", maxsize=10)
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        verifier.verify(make_token(60, secret="another-secret-key-with-enough-length"))
+
+
+def test_cache_is_bounded():
+    verifier = TokenVerifier(SECRET, "HS256", maxsize=2)
+    for user_id in range(5):
+        verifier.verify(make_token(60, user=user_id))
+
+    assert verifier.stats()["size"] == 2
+    assert verifier.stats()["evictions"] == 3
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+
+import pytest
+
+from sqlalchemy import Integer, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.api.utils.total_count import TotalCounter
+from app.core.cache import MemoryCacheBackend, VersionedCache
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+def make_counter(strategy: str, enabled: bool = True) -> TotalCounter:
+    cache = VersionedCache(MemoryCacheBackend(100), ttl=60, prefix="test", enabled=enabled)
+    return TotalCounter(strategy, ttl=60, estimate_threshold=1000, cache=cache)
+
+
+async def counts_after_insert(counter: TotalCounter):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(insert(Item), [{"id": 1}, {"id": 2}])
+    try:
+        async with async_sessionmaker(engine)() as session:
+            first = await counter.count(session, Item)
+            await session.execute(insert(Item).values(id=3))
+            await session.commit()
+            second = await counter.count(session, Item)
+            await counter.invalidate(Item)
+            third = await counter.count(session, Item)
+        return first, second, third
+    finally:
+        await engine.dispose()
+
+
+def test_exact_counts_every_time():
+    assert asyncio.run(counts_after_insert(make_counter("exact"))) == (2, 3, 3)
+
+
+def test_cached_total_until_invalidated():
+    assert asyncio.run(counts_after_insert(make_counter("cached"))) == (2, 2, 3)
+
+
+def test_cached_without_catalog_cache_falls_back_to_exact_and_says_so(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.api.utils.total_count"):
+        counter = make_counter("cached", enabled=False)
+
+    assert "CATALOG_CACHE_ENABLED" in caplog.text
+    assert counter.stats() == {"strategy": "cached", "effective_strategy": "exact", "fallback_to_exact": True}
+    assert asyncio.run(counts_after_insert(counter)) == (2, 3, 3)
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        make_counter("approximate")
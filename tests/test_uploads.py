@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.utils.uploads import UploadStore
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def make_store(tmp_path, max_bytes: int = 1024) -> UploadStore:
+    return UploadStore(root=str(tmp_path), max_bytes=max_bytes, write_buffer=16, session_ttl=0)
+
+
+def test_receive_hashes_and_stores(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path)
+        upload = await store.receive(chunks(b"a" * 10, b"b" * 30))
+
+        assert upload.size == 40
+        assert upload.sha256 == hashlib.sha256(b"a" * 10 + b"b" * 30).hexdigest()
+        with open(upload.path, "rb") as file:
+            assert file.read() == b"a" * 10 + b"b" * 30
+
+        await store.discard(upload)
+        assert not os.path.exists(upload.path)
+
+    asyncio.run(scenario())
+
+
+def test_receive_over_limit_removes_partial_file(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path, max_bytes=50)
+        with pytest.raises(HTTPException) as error:
+            await store.receive(chunks(b"x" * 40, b"x" * 40))
+        assert error.value.status_code == 413
+        assert os.listdir(tmp_path) == []
+
+        with pytest.raises(HTTPException) as error:
+            await store.receive(chunks())
+        assert error.value.status_code == 400
+
+    asyncio.run(scenario())
+
+
+def test_session_offsets(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path)
+        session = await store.create_session(30)
+        upload_id = session["upload_id"]
+        assert session["offset"] == 0
+
+        assert (await store.append(upload_id, 0, chunks(b"a" * 10)))["offset"] == 10
+
+        # Klient eski offset bilan qayta yuborsa joriy offset qaytariladi
+        with pytest.raises(HTTPException) as error:
+            await store.append(upload_id, 0, chunks(b"a" * 10))
+        assert error.value.status_code == 409
+        assert error.value.headers["Upload-Offset"] == "10"
+
+        assert (await store.get_session(upload_id))["offset"] == 10
+        assert (await store.append(upload_id, 10, chunks(b"b" * 20)))["offset"] == 30
+
+    asyncio.run(scenario())
+
+
+def test_session_limits(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path, max_bytes=100)
+        with pytest.raises(HTTPException) as error:
+            await store.create_session(101)
+        assert error.value.status_code == 413
+
+        upload_id = (await store.create_session(20))["upload_id"]
+        with pytest.raises(HTTPException) as error:
+            await store.append(upload_id, 0, chunks(b"x" * 15, b"x" * 15))
+        assert error.value.status_code == 413
+
+        with pytest.raises(HTTPException) as error:
+            await store.get_session("../../etc/passwd")
+        assert error.value.status_code == 404
+
+    asyncio.run(scenario())
+
+
+def test_complete_requires_all_bytes(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path)
+        upload_id = (await store.create_session(20))["upload_id"]
+        await store.append(upload_id, 0, chunks(b"x" * 5))
+
+        with pytest.raises(HTTPException) as error:
+            async with store.complete(upload_id):
+                pass
+        assert error.value.status_code == 409
+        assert error.value.headers["Upload-Offset"] == "5"
+
+    asyncio.run(scenario())
+
+
+def test_complete_keeps_session_until_processing_succeeds(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path)
+        upload_id = (await store.create_session(20))["upload_id"]
+        await store.append(upload_id, 0, chunks(b"x" * 20))
+
+        with pytest.raises(RuntimeError):
+            async with store.complete(upload_id) as upload:
+                assert upload.sha256 == hashlib.sha256(b"x" * 20).hexdigest()
+                raise RuntimeError("processing failed")
+        assert (await store.get_session(upload_id))["offset"] == 20
+
+        async with store.complete(upload_id) as upload:
+            # Blok davomida sessiya qulflangan
+            with pytest.raises(HTTPException) as error:
+                await store.append(upload_id, 20, chunks(b"y"))
+            assert error.value.status_code == 409
+        assert not os.path.exists(upload.path)
+
+        with pytest.raises(HTTPException) as error:
+            await store.get_session(upload_id)
+        assert error.value.status_code == 404
+
+    asyncio.run(scenario())
+
+
+def test_abort_removes_session(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path)
+        upload_id = (await store.create_session(20))["upload_id"]
+        await store.abort(upload_id)
+
+        assert os.listdir(tmp_path) == []
+        with pytest.raises(HTTPException) as error:
+            await store.append(upload_id, 0, chunks(b"x"))
+        assert error.value.status_code == 404
+
+    asyncio.run(scenario())